@@ -0,0 +1,34 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with email + password.
+
+    The email lookup is case-insensitive (backed by the UPPER(email) index on
+    auth_user) and loads the profile in the same query, so a login costs one
+    SELECT plus the password hash. authenticate() returns inactive users so
+    the login serializer can report a disabled account; get_user() keeps
+    ModelBackend's is_active check, so a deactivated user's sessions end.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+
+        candidates = list(
+            User.objects.select_related('profile').filter(email__iexact=email).order_by('id')
+        )
+        if not candidates:
+            # Run the default hasher once to reduce the timing difference
+            # between an existing and a nonexistent user.
+            User().set_password(password)
+            return None
+
+        # Prefer an exact-case match when legacy rows differ only by case
+        candidates.sort(key=lambda user: user.email != email)
+        for user in candidates:
+            if user.check_password(password):
+                return user
+        return None
@@ -0,0 +1,31 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+The active policy is chosen with the PASSWORD_HASHER_POLICY setting (see
+settings.py). Hashes made under another policy or with older cost parameters
+are still accepted and are transparently re-hashed on the next successful
+login, because User.check_password() upgrades any hash whose hasher is not the
+preferred one or whose must_update() returns True.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher, Argon2PasswordHasher, ScryptPasswordHasher
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with a configurable iteration count"""
+    iterations = getattr(settings, 'PASSWORD_HASHER_PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with configurable time/memory cost (requires argon2-cffi)"""
+    time_cost = getattr(settings, 'PASSWORD_HASHER_ARGON2_TIME_COST', None) or Argon2PasswordHasher.time_cost
+    memory_cost = getattr(settings, 'PASSWORD_HASHER_ARGON2_MEMORY_COST', None) or Argon2PasswordHasher.memory_cost
+    parallelism = getattr(settings, 'PASSWORD_HASHER_ARGON2_PARALLELISM', None) or Argon2PasswordHasher.parallelism
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with a configurable work factor (N) and parallelism (p)"""
+    work_factor = getattr(settings, 'PASSWORD_HASHER_SCRYPT_WORK_FACTOR', None) or ScryptPasswordHasher.work_factor
+    parallelism = getattr(settings, 'PASSWORD_HASHER_SCRYPT_PARALLELISM', None) or ScryptPasswordHasher.parallelism
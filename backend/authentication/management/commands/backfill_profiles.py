@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+from authentication.models import Profile
+
+class Command(BaseCommand):
+    help = 'Create missing Profile rows for users that do not have one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Profiles inserted per query')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many profiles are missing')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        user_ids = list(
+            User.objects.filter(profile__isnull=True).order_by('id').values_list('id', flat=True)
+        )
+
+        if not user_ids:
+            self.stdout.write(self.style.SUCCESS('All users already have a profile.'))
+            return
+
+        self.stdout.write(f'Found {len(user_ids)} users without a profile.')
+        if options['dry_run']:
+            return
+
+        created = 0
+        for start in range(0, len(user_ids), batch_size):
+            chunk = user_ids[start:start + batch_size]
+            profiles = [Profile(user_id=user_id) for user_id in chunk]
+            # ignore_conflicts covers profiles created concurrently by the post_save signal
+            Profile.objects.bulk_create(profiles, ignore_conflicts=True)
+            created += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {created} profiles.'))
@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework.test import APIRequestFactory
+
+from authentication.models import Profile
+from authentication.views import login_view
+
+BENCH_PREFIX = 'benchlogin_'
+BENCH_PASSWORD = 'bench-login-password'
+
+
+def _login_worker(args):
+    """Run logins for `duration` seconds in a child process and return the count"""
+    emails, duration = args
+    factory = APIRequestFactory()
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        email = emails[done % len(emails)]
+        request = factory.post('/api/auth/login/', {'email': email, 'password': BENCH_PASSWORD}, format='json')
+        response = login_view(request)
+        if response.status_code != 200:
+            raise RuntimeError(f'Login failed for {email}: {response.data}')
+        done += 1
+    connections.close_all()
+    return done
+
+
+class Command(BaseCommand):
+    help = 'Measure login throughput (logins/sec per core) for the configured password hasher policy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Concurrent login processes')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds each process keeps logging in')
+        parser.add_argument('--users', type=int, default=50, help='Number of benchmark users to create')
+        parser.add_argument('--keep-users', action='store_true', help='Do not delete the benchmark users afterwards')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        hasher = get_hasher()
+        self.stdout.write(f'Hasher policy: {settings.PASSWORD_HASHER_POLICY} ({hasher.algorithm})')
+
+        emails = self.create_users(options['users'])
+        try:
+            # Warm up once so every user is hashed with the current policy
+            _login_worker((emails, 0.01))
+
+            connections.close_all()
+            started = time.perf_counter()
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                counts = pool.map(_login_worker, [(emails, options['duration'])] * processes)
+            elapsed = time.perf_counter() - started
+        finally:
+            if not options['keep_users']:
+                User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+
+        total = sum(counts)
+        per_second = total / elapsed
+        self.stdout.write(f'{total} logins in {elapsed:.1f}s across {processes} processes')
+        self.stdout.write(self.style.SUCCESS(
+            f'{per_second:.1f} logins/sec total, {per_second / processes:.1f} logins/sec per core'
+        ))
+
+    def create_users(self, count):
+        """Create benchmark users sharing one precomputed password hash"""
+        User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+        hasher = get_hasher()
+        password = hasher.encode(BENCH_PASSWORD, hasher.salt())
+        users = User.objects.bulk_create([
+            User(username=f'{BENCH_PREFIX}{i}', email=f'{BENCH_PREFIX}{i}@example.com', password=password)
+            for i in range(count)
+        ])
+        Profile.objects.bulk_create([Profile(user=user, full_name=user.username) for user in users])
+        return [user.email for user in users]
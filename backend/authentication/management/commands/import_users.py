@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from authentication.user_import import import_users, ImportFileError, DEFAULT_CHUNK_SIZE
+
+class Command(BaseCommand):
+    help = 'Bulk import users and profiles from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to a .csv or .xlsx file with a header row')
+        parser.add_argument('--default-password', help='Password for rows that leave the password column blank')
+        parser.add_argument('--skip-invalid', action='store_true', help='Import valid rows even if some rows fail validation')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not create any users')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per bulk INSERT')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes (default: CPU count)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as file_obj:
+                summary = import_users(
+                    file_obj,
+                    options['path'],
+                    default_password=options['default_password'],
+                    skip_invalid=options['skip_invalid'],
+                    dry_run=options['dry_run'],
+                    chunk_size=options['chunk_size'],
+                    workers=options['workers'],
+                )
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['path']}")
+        except ImportFileError as e:
+            raise CommandError(str(e))
+
+        for error in summary['errors']:
+            messages = '; '.join(
+                f"{field}: {' '.join(str(m) for m in field_errors)}"
+                for field, field_errors in error['errors'].items()
+            )
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {messages}"))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{summary['total_rows']} rows read, {summary['valid_rows']} valid, "
+            f"{len(summary['errors'])} with errors ({elapsed:.1f}s)."
+        )
+
+        if summary['created']:
+            self.stdout.write(self.style.SUCCESS(f"Created {summary['created']} users."))
+        elif options['dry_run']:
+            self.stdout.write('Dry run: no users created.')
+        elif summary['errors'] and not options['skip_invalid']:
+            raise CommandError('Import aborted because of invalid rows. Fix them or pass --skip-invalid.')
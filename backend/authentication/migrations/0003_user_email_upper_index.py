@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Index auth_user.email for the case-insensitive login lookup (email__iexact)"""
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0002_department_profile_address_profile_branch_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_upper_idx ON auth_user (UPPER(email::text));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_upper_idx;',
+        ),
+    ]
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from .models import Profile
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
+from .models import Profile, UserRole, RoleType
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -15,6 +17,62 @@ class ProfileSerializer(serializers.ModelSerializer):
         model = Profile
         fields = '__all__'
 
+class UserListSerializer(serializers.Serializer):
+    """Flat serializer for the admin users list, fed by a single values() query"""
+    id = serializers.UUIDField(source='profile__id', allow_null=True)
+    user_id = serializers.IntegerField(source='id')
+    full_name = serializers.SerializerMethodField()
+    email = serializers.EmailField()
+    username = serializers.CharField()
+    role = serializers.SerializerMethodField()
+    role_type = serializers.SerializerMethodField()
+    department = serializers.CharField(source='profile__department', allow_null=True)
+    designation = serializers.CharField(source='profile__designation', allow_null=True)
+    qualifications = serializers.CharField(source='profile__qualifications', allow_null=True)
+    research_areas = serializers.SerializerMethodField()
+    enrollment_year = serializers.IntegerField(source='profile__enrollment_year', allow_null=True)
+    semester = serializers.CharField(source='profile__semester', allow_null=True)
+    branch = serializers.CharField(source='profile__branch', allow_null=True)
+    graduation_year = serializers.IntegerField(source='profile__graduation_year', allow_null=True)
+    current_position = serializers.CharField(source='profile__current_position', allow_null=True)
+    company = serializers.CharField(source='profile__company', allow_null=True)
+    phone = serializers.CharField(source='profile__phone', allow_null=True)
+    address = serializers.CharField(source='profile__address', allow_null=True)
+    photo_url = serializers.CharField(source='profile__photo_url', allow_null=True)
+    is_active = serializers.BooleanField()
+    is_staff = serializers.BooleanField()
+    date_joined = serializers.DateTimeField()
+    created_at = serializers.DateTimeField(source='profile__created_at', allow_null=True)
+    updated_at = serializers.DateTimeField(source='profile__updated_at', allow_null=True)
+
+    # Columns fetched by the list query, in the shape this serializer reads them
+    VALUES_FIELDS = [
+        'id', 'username', 'email', 'first_name', 'last_name',
+        'is_active', 'is_staff', 'date_joined',
+        'profile__id', 'profile__full_name', 'profile__role', 'profile__role_type',
+        'profile__department', 'profile__designation', 'profile__qualifications',
+        'profile__research_areas', 'profile__enrollment_year', 'profile__semester',
+        'profile__branch', 'profile__graduation_year', 'profile__current_position',
+        'profile__company', 'profile__phone', 'profile__address', 'profile__photo_url',
+        'profile__created_at', 'profile__updated_at',
+    ]
+
+    def get_full_name(self, row):
+        return (
+            row['profile__full_name']
+            or f"{row['first_name']} {row['last_name']}".strip()
+            or row['username']
+        )
+
+    def get_role(self, row):
+        return row['profile__role'] or 'student'
+
+    def get_role_type(self, row):
+        return row['profile__role_type'] or 'student'
+
+    def get_research_areas(self, row):
+        return row['profile__research_areas'] or []
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
@@ -24,17 +82,14 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
 
         if email and password:
-            try:
-                user = User.objects.get(email=email)
-                user = authenticate(username=user.username, password=password)
-                if user:
-                    if user.is_active:
-                        data['user'] = user
-                    else:
-                        raise serializers.ValidationError('User account is disabled.')
+            # EmailBackend: one query for user + profile, then the password hash
+            user = authenticate(request=self.context.get('request'), email=email, password=password)
+            if user:
+                if user.is_active:
+                    data['user'] = user
                 else:
-                    raise serializers.ValidationError('Unable to log in with provided credentials.')
-            except User.DoesNotExist:
+                    raise serializers.ValidationError('User account is disabled.')
+            else:
                 raise serializers.ValidationError('Unable to log in with provided credentials.')
         else:
             raise serializers.ValidationError('Must include email and password.')
@@ -81,29 +136,47 @@ class RegisterSerializer(serializers.ModelSerializer):
             'address', 'photo_url'
         ]
         
-        # Extract profile data from validated_data
+        # Extract profile data, keeping only meaningful values so blanks fall back to model defaults
         profile_data = {}
         for field in profile_fields:
-            if field in validated_data:
-                profile_data[field] = validated_data.pop(field)
+            value = validated_data.pop(field, None)
+            if value is not None and value != '' and value != []:
+                profile_data[field] = value
         
         # Set default role if not provided
-        if 'role' not in profile_data:
-            profile_data['role'] = 'student'
+        profile_data.setdefault('role', 'student')
 
-        # Create user
-        user = User.objects.create_user(**validated_data)
-        
-        # Update the profile created by the signal with all data
-        profile = user.profile
-        for field, value in profile_data.items():
-            if hasattr(profile, field):
-                # Only set the field if it has a meaningful value
-                if value is not None and value != '' and value != []:
-                    setattr(profile, field, value)
-                # For integer fields, convert empty strings to None
-                elif field in ['enrollment_year', 'graduation_year'] and value == '':
-                    setattr(profile, field, None)
-        profile.save()
+        # Build User and Profile in memory and write them with exactly two INSERTs.
+        # _skip_profile_creation stops the post_save signal from inserting an empty profile first.
+        password = validated_data.pop('password')
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['email'] = User.objects.normalize_email(validated_data.get('email', ''))
+        with transaction.atomic():
+            user = User(**validated_data)
+            user.set_password(password)
+            user._skip_profile_creation = True
+            user.save()
+            # Creating the profile also caches it on user.profile for the response
+            Profile.objects.create(user=user, **profile_data)
         
         return user
+
+class UserImportRowSerializer(serializers.Serializer):
+    """Validates one row of a bulk user import file (CSV/XLSX)"""
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(max_length=254)
+    password = serializers.CharField(required=False, allow_blank=True, min_length=8)
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150)
+
+    full_name = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    role = serializers.ChoiceField(choices=UserRole.choices, required=False)
+    role_type = serializers.ChoiceField(choices=RoleType.choices, required=False)
+    department = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    designation = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    enrollment_year = serializers.IntegerField(required=False, allow_null=True)
+    semester = serializers.CharField(required=False, allow_blank=True, max_length=20)
+    branch = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    graduation_year = serializers.IntegerField(required=False, allow_null=True)
+    phone = serializers.CharField(required=False, allow_blank=True, max_length=20)
+    address = serializers.CharField(required=False, allow_blank=True)
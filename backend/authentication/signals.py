@@ -5,5 +5,7 @@ from .models import Profile
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
-    if created:
+    # Callers that create the profile themselves (e.g. RegisterSerializer) set
+    # _skip_profile_creation so the user does not get an empty profile INSERT first.
+    if created and not getattr(instance, '_skip_profile_creation', False):
         Profile.objects.create(user=instance)
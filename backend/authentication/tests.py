@@ -1,3 +1,207 @@
-from django.test import TestCase
+import io
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from . import user_import
+from .backends import EmailBackend
+from .models import Profile
 
 # Create your tests here.
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class RegisterQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.payload = {
+            'username': 'student1',
+            'email': 'student1@example.com',
+            'password': 'secret-pass-123',
+            'first_name': 'Asha',
+            'full_name': 'Asha Kumari',
+            'role': '',
+            'department': 'CSE',
+            'enrollment_year': 2024,
+            'research_areas': [],
+        }
+
+    def test_register_writes_user_and_profile_with_two_inserts(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/auth/register/', self.payload, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        statements = [q['sql'] for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        inserts = [sql for sql in statements if sql.startswith('INSERT')]
+        self.assertEqual(len(inserts), 2, inserts)
+        self.assertFalse([sql for sql in statements if sql.startswith('UPDATE')])
+        # Only the username uniqueness check reads from the database
+        self.assertEqual(len(statements), 3, statements)
+
+    def test_register_response_is_built_from_saved_data(self):
+        response = self.client.post('/api/auth/register/', self.payload, format='json')
+        profile = Profile.objects.get(user__username='student1')
+
+        self.assertEqual(response.data['profile']['id'], str(profile.id))
+        self.assertEqual(response.data['profile']['full_name'], 'Asha Kumari')
+        self.assertEqual(response.data['profile']['role'], 'student')
+        self.assertEqual(response.data['profile']['enrollment_year'], 2024)
+        self.assertEqual(response.data['profile']['user']['email'], 'student1@example.com')
+        self.assertTrue(User.objects.get(username='student1').check_password('secret-pass-123'))
+
+    def test_other_user_creation_paths_still_get_a_profile(self):
+        user = User.objects.create_user('plain', 'plain@example.com', 'pw')
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UsersListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('list_admin', 'list_admin@example.com', 'pw', is_staff=True)
+        for number in range(24):
+            User.objects.create_user(f'user{number}', f'user{number}@example.com', 'pw')
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(self.admin)
+
+    def test_list_is_paginated(self):
+        response = self.client.get('/api/auth/users/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'count', 'next', 'previous', 'results'})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNone(response.data['previous'])
+
+        second = self.client.get(response.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+        emails = {row['email'] for row in response.data['results'] + second.data['results']}
+        self.assertEqual(len(emails), 25)
+
+        everything = self.client.get('/api/auth/users/', {'page_size': 1000})
+        self.assertEqual(len(everything.data['results']), 25)
+        self.assertIsNone(everything.data['next'])
+        row = everything.data['results'][0]
+        self.assertLessEqual({'id', 'user_id', 'email', 'username', 'role', 'full_name'}, set(row))
+
+    def test_list_is_admin_only(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(User.objects.get(username='user0'))
+        self.assertEqual(client.get('/api/auth/users/').status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmailBackendTests(TestCase):
+    def test_inactive_users_can_log_in_to_be_told_but_lose_their_sessions(self):
+        user = User.objects.create_user('inactive', 'inactive@example.com', 'secret123', is_active=False)
+        backend = EmailBackend()
+        self.assertEqual(backend.authenticate(None, email='INACTIVE@example.com', password='secret123'), user)
+        self.assertIsNone(backend.get_user(user.pk))
+
+        response = APIClient().post('/api/auth/login/', {'email': 'inactive@example.com', 'password': 'secret123'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('User account is disabled.', str(response.data))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportConflictTests(TestCase):
+    CSV = b'username,email,password\nasha,asha@example.com,password123\nravi,ravi@example.com,password123\n'
+
+    def import_while_registering(self, check_in_transaction=True, **options):
+        """Import CSV while 'asha' registers during the password hashing"""
+        hash_passwords = user_import.hash_passwords
+        existing_account_errors = user_import.existing_account_errors
+        calls = []
+
+        def register_then_hash(passwords, workers=None):
+            User.objects.create_user('asha', 'someone@example.com', 'pw')
+            return hash_passwords(passwords, workers=1)
+
+        def check(rows):
+            calls.append(rows)
+            # The second call is the check inside the transaction
+            if len(calls) == 2 and not check_in_transaction:
+                return []
+            return existing_account_errors(rows)
+
+        with mock.patch.object(user_import, 'hash_passwords', side_effect=register_then_hash), \
+                mock.patch.object(user_import, 'existing_account_errors', side_effect=check):
+            return user_import.import_users(io.BytesIO(self.CSV), 'users.csv', **options)
+
+    def assertAshaClashes(self, summary):
+        self.assertEqual(summary['errors'], [
+            {'row': 2, 'errors': {'username': ['A user with that username already exists.']}},
+        ])
+
+    def test_registration_during_import_is_reported_per_row(self):
+        summary = self.import_while_registering()
+        self.assertAshaClashes(summary)
+        self.assertEqual(summary['created'], 0)
+        self.assertFalse(User.objects.filter(username='ravi').exists())
+
+    def test_skip_invalid_imports_the_other_rows(self):
+        summary = self.import_while_registering(skip_invalid=True)
+        self.assertAshaClashes(summary)
+        self.assertEqual((summary['created'], summary['valid_rows']), (1, 1))
+        self.assertTrue(User.objects.get(username='ravi').check_password('password123'))
+
+    def test_unique_violation_on_insert_is_reported_per_row(self):
+        summary = self.import_while_registering(check_in_transaction=False, skip_invalid=True)
+        self.assertAshaClashes(summary)
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(User.objects.get(username='asha').email, 'someone@example.com')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportViewTests(TestCase):
+    CSV = (
+        b'username,email,password,first_name,last_name,full_name,enrollment_year,branch\n'
+        b'asha,asha@example.com,password123,Asha,Kumari,,2024,CSE\n'
+        b'ravi,Ravi@Example.com,,Ravi,Verma,Ravi K. Verma,2023,ECE\n'
+    )
+
+    def setUp(self):
+        self.admin = User.objects.create_user('import_admin', 'import_admin@example.com', 'pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, content, **data):
+        return self.client.post('/api/auth/users/import/', {
+            'file': SimpleUploadedFile('cohort.csv', content, content_type='text/csv'), **data,
+        }, format='multipart')
+
+    def test_import_creates_users_and_profiles(self):
+        response = self.upload(self.CSV, default_password='welcome-2024')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {'total_rows': 2, 'valid_rows': 2, 'created': 2, 'errors': []})
+
+        asha = User.objects.get(username='asha')
+        self.assertEqual((asha.email, asha.first_name, asha.last_name), ('asha@example.com', 'Asha', 'Kumari'))
+        self.assertTrue(asha.password.startswith('md5$'))
+        self.assertTrue(asha.check_password('password123'))
+        self.assertEqual(
+            (asha.profile.full_name, asha.profile.role, asha.profile.role_type,
+             asha.profile.enrollment_year, asha.profile.branch),
+            ('Asha Kumari', 'student', 'student', 2024, 'CSE'),
+        )
+        ravi = User.objects.get(username='ravi')
+        self.assertTrue(ravi.check_password('welcome-2024'))
+        self.assertEqual(ravi.profile.full_name, 'Ravi K. Verma')
+        self.assertEqual(Profile.objects.filter(user__username__in=['asha', 'ravi']).count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        response = self.upload(self.CSV, default_password='welcome-2024', dry_run='true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 0)
+        self.assertFalse(User.objects.filter(username__in=['asha', 'ravi']).exists())
+
+    @override_settings(USER_IMPORT_MAX_ROWS=1)
+    def test_large_files_are_sent_to_the_command(self):
+        with mock.patch.object(user_import, 'hash_passwords') as hash_passwords:
+            response = self.upload(self.CSV, default_password='welcome-2024')
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('manage.py import_users', response.data['error'])
+        hash_passwords.assert_not_called()
+        self.assertFalse(User.objects.filter(username__in=['asha', 'ravi']).exists())
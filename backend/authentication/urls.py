@@ -2,7 +2,7 @@ from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     login_view, register_view, profile_view, update_profile_view, 
-    users_list_view, user_detail_view, superadmin_list_view,
+    users_list_view, users_import_view, user_detail_view, superadmin_list_view,
     update_user_credentials_view
 )
 
@@ -12,6 +12,7 @@ urlpatterns = [
     path('profile/', profile_view, name='profile'),
     path('profile/update/', update_profile_view, name='update_profile'),
     path('users/', users_list_view, name='users_list'),
+    path('users/import/', users_import_view, name='users_import'),
     path('users/<int:user_id>/', user_detail_view, name='user_detail'),
     path('users/<int:user_id>/credentials/', update_user_credentials_view, name='update_user_credentials'),
     path('superadmins/', superadmin_list_view, name='superadmin_list'),
@@ -0,0 +1,292 @@
+"""
+Bulk user import for student cohorts.
+
+Rows are read from a CSV or XLSX file, validated up front, passwords are hashed
+in a process pool and Users/Profiles are written with bulk_create inside a
+single transaction. bulk_create does not fire post_save, so the
+create_user_profile signal is bypassed and each user costs one INSERT row for
+the User and one for the Profile.
+
+The admin upload (users_import_view) runs all of this inside the request, so it
+takes at most USER_IMPORT_MAX_ROWS rows; whole cohorts go through
+`manage.py import_users`.
+
+Accounts registered while the file is being hashed are caught in the
+transaction: clashing rows are reported like validation errors (and skipped
+with skip_invalid) instead of failing the whole request.
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .models import Profile, UserRole, RoleType
+from .serializers import UserImportRowSerializer
+
+USER_FIELDS = ['username', 'email', 'first_name', 'last_name']
+PROFILE_FIELDS = [
+    'full_name', 'role', 'role_type', 'department', 'designation', 'enrollment_year',
+    'semester', 'branch', 'graduation_year', 'phone', 'address',
+]
+
+# Below this many passwords the process pool start-up costs more than it saves
+PROCESS_POOL_THRESHOLD = 50
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ImportFileError(Exception):
+    """Raised when the uploaded file cannot be read at all"""
+
+
+class ImportTooLarge(ImportFileError):
+    """Raised when a file has more rows than the caller accepts"""
+
+
+class ImportConflict(Exception):
+    """Raised when rows clash with accounts created after they were validated"""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} rows clash with existing accounts')
+        self.errors = errors
+
+
+def read_rows(file_obj, filename):
+    """Return a list of dicts (header -> cell) from a CSV or XLSX file"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return _read_csv(file_obj)
+    if extension in ('.xlsx', '.xlsm'):
+        return _read_xlsx(file_obj)
+    raise ImportFileError('Unsupported file type. Upload a .csv or .xlsx file.')
+
+
+def _normalize_header(header):
+    return str(header or '').strip().lower().replace(' ', '_')
+
+
+def _read_csv(file_obj):
+    content = file_obj.read()
+    if isinstance(content, bytes):
+        try:
+            content = content.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ImportFileError('CSV file must be UTF-8 encoded.')
+    reader = csv.reader(io.StringIO(content))
+    try:
+        headers = [_normalize_header(h) for h in next(reader)]
+    except StopIteration:
+        return []
+    return [dict(zip(headers, values)) for values in reader if any(v.strip() for v in values)]
+
+
+def _read_xlsx(file_obj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX import requires the openpyxl package.')
+
+    try:
+        workbook = load_workbook(file_obj, read_only=True, data_only=True)
+    except Exception:
+        raise ImportFileError('Could not read XLSX file.')
+
+    rows = workbook.active.iter_rows(values_only=True)
+    try:
+        headers = [_normalize_header(h) for h in next(rows)]
+    except StopIteration:
+        return []
+
+    result = []
+    for values in rows:
+        if not any(v not in (None, '') for v in values):
+            continue
+        result.append({
+            header: '' if value is None else str(value).strip()
+            for header, value in zip(headers, values)
+        })
+    workbook.close()
+    return result
+
+
+def validate_rows(rows, default_password=None):
+    """
+    Validate every row and return (valid_rows, errors).
+
+    Row numbers in errors are 1-based spreadsheet rows, so the header is row 1
+    and the first data row is row 2.
+    """
+    valid_rows = []
+    errors = []
+    seen_usernames = {}
+    seen_emails = {}
+
+    for index, raw in enumerate(rows, start=2):
+        # Blank cells mean "not provided"
+        data = {key: value.strip() for key, value in raw.items() if key and isinstance(value, str) and value.strip()}
+        if default_password and not data.get('password'):
+            data['password'] = default_password
+
+        serializer = UserImportRowSerializer(data=data)
+        if not serializer.is_valid():
+            errors.append({'row': index, 'errors': serializer.errors})
+            continue
+
+        row = serializer.validated_data
+        if not row.get('password'):
+            errors.append({'row': index, 'errors': {'password': ['This field is required.']}})
+            continue
+
+        username_key = row['username']
+        email_key = row['email'].lower()
+        row_errors = {}
+        if username_key in seen_usernames:
+            row_errors['username'] = [f'Duplicate of row {seen_usernames[username_key]}.']
+        if email_key in seen_emails:
+            row_errors['email'] = [f'Duplicate of row {seen_emails[email_key]}.']
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+            continue
+
+        seen_usernames[username_key] = index
+        seen_emails[email_key] = index
+        valid_rows.append((index, row))
+
+    conflicts = existing_account_errors(valid_rows)
+    rejected = {error['row'] for error in conflicts}
+    errors.extend(conflicts)
+    errors.sort(key=lambda error: error['row'])
+    return [(index, row) for index, row in valid_rows if index not in rejected], errors
+
+
+def existing_account_errors(rows):
+    """Errors for rows whose username or email already belongs to an account (one query each)"""
+    existing_usernames = set(
+        User.objects.filter(username__in=[row['username'] for _, row in rows]).values_list('username', flat=True)
+    )
+    existing_emails = set(
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=[row['email'].lower() for _, row in rows])
+        .values_list('email_lower', flat=True)
+    )
+
+    errors = []
+    for index, row in rows:
+        row_errors = {}
+        if row['username'] in existing_usernames:
+            row_errors['username'] = ['A user with that username already exists.']
+        if row['email'].lower() in existing_emails:
+            row_errors['email'] = ['A user with that email already exists.']
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+    return errors
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash raw passwords, using a process pool for anything but tiny batches"""
+    if len(passwords) < PROCESS_POOL_THRESHOLD or workers == 1:
+        return [make_password(password) for password in passwords]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(passwords) // (workers * 4))
+    # Spawned, not forked: a fork of a gunicorn worker would inherit its sockets, threads and DB connection
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                             initializer=django.setup) as executor:
+        return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def create_users(rows, hashed, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Create Users and Profiles for already-validated rows (with their hashed
+    passwords) in one transaction; raises ImportConflict if accounts were
+    registered for any of them since validation.
+    """
+    try:
+        with transaction.atomic():
+            # Emails have no unique constraint, so only this check keeps a new duplicate out
+            conflicts = existing_account_errors(rows)
+            if conflicts:
+                raise ImportConflict(conflicts)
+            return _insert_users(rows, hashed, chunk_size)
+    except IntegrityError:
+        # A username registered between the check and the INSERT; it is committed by now
+        conflicts = existing_account_errors(rows)
+        if not conflicts:
+            raise
+        raise ImportConflict(conflicts)
+
+
+def _insert_users(rows, hashed, chunk_size):
+    created = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        users = [
+            User(
+                password=hashed[start + offset],
+                **{field: row.get(field, '') for field in USER_FIELDS},
+            )
+            for offset, (_, row) in enumerate(chunk)
+        ]
+        User.objects.bulk_create(users)
+
+        profiles = []
+        for user, (_, row) in zip(users, chunk):
+            profile_data = {field: row[field] for field in PROFILE_FIELDS if row.get(field) not in (None, '')}
+            profile_data.setdefault('role', UserRole.STUDENT)
+            profile_data.setdefault('role_type', RoleType.STUDENT)
+            if not profile_data.get('full_name'):
+                profile_data['full_name'] = f"{user.first_name} {user.last_name}".strip() or None
+            profiles.append(Profile(user=user, **profile_data))
+        Profile.objects.bulk_create(profiles)
+        created += len(users)
+
+    return created
+
+
+def import_users(file_obj, filename, default_password=None, skip_invalid=False, dry_run=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE, workers=None, max_rows=None):
+    """
+    Run the whole pipeline and return a summary dict.
+
+    Unless skip_invalid is set, any row error aborts the import before
+    anything is written. Files with more than max_rows rows raise
+    ImportTooLarge before any row is validated.
+    """
+    rows = read_rows(file_obj, filename)
+    if max_rows is not None and len(rows) > max_rows:
+        raise ImportTooLarge(
+            f'The file has {len(rows)} rows; uploads can import at most {max_rows}. '
+            f'Split it, or run `python manage.py import_users <file>` on the server.'
+        )
+    valid_rows, errors = validate_rows(rows, default_password=default_password)
+
+    summary = {
+        'total_rows': len(rows),
+        'valid_rows': len(valid_rows),
+        'created': 0,
+        'errors': errors,
+    }
+    if dry_run or not valid_rows or (errors and not skip_invalid):
+        return summary
+
+    hashed = hash_passwords([row['password'] for _, row in valid_rows], workers=workers)
+    while valid_rows:
+        try:
+            summary['created'] = create_users(valid_rows, hashed, chunk_size=chunk_size)
+            break
+        except ImportConflict as conflict:
+            summary['errors'] = sorted(summary['errors'] + conflict.errors, key=lambda error: error['row'])
+            if not skip_invalid:
+                break
+            rejected = {error['row'] for error in conflict.errors}
+            kept = [position for position, (index, _) in enumerate(valid_rows) if index not in rejected]
+            valid_rows = [valid_rows[position] for position in kept]
+            hashed = [hashed[position] for position in kept]
+            summary['valid_rows'] = len(valid_rows)
+    return summary
@@ -2,16 +2,29 @@ from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.db import models
-from .serializers import LoginSerializer, RegisterSerializer, ProfileSerializer
+from core.pagination import LargeResultsSetPagination
+from core.instrumentation import timed_data
+from .serializers import LoginSerializer, RegisterSerializer, ProfileSerializer, UserListSerializer
 from .models import Profile
+from .user_import import import_users, ImportFileError, ImportTooLarge
+
+# Query param value -> ORM field for ordering the users list
+USERS_LIST_ORDERING_FIELDS = {
+    'date_joined': 'date_joined',
+    'username': 'username',
+    'email': 'email',
+    'full_name': 'profile__full_name',
+    'role': 'profile__role',
+}
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def login_view(request):
-    serializer = LoginSerializer(data=request.data)
+    serializer = LoginSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
         user = serializer.validated_data['user']
         refresh = RefreshToken.for_user(user)
@@ -45,7 +58,7 @@ def register_view(request):
         user = serializer.save()
         refresh = RefreshToken.for_user(user)
         
-        # Get user profile
+        # Profile is cached on the user by RegisterSerializer.create, no query needed
         profile = user.profile
         profile_data = ProfileSerializer(profile).data
         
@@ -100,52 +113,54 @@ def update_profile_view(request):
 @api_view(['GET', 'POST'])
 @permission_classes([permissions.IsAuthenticated])
 def users_list_view(request):
-    """List all users with their profiles or create new user - Admin only"""
+    """List users with their profiles (paginated, filterable, searchable) or create new user - Admin only"""
     if not request.user.is_staff and (not hasattr(request.user, 'profile') or request.user.profile.role != 'admin'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     if request.method == 'GET':
-        users = User.objects.all().select_related('profile').order_by('-date_joined')
-        users_data = []
-        
-        for user in users:
-            try:
-                profile = user.profile
-                profile_data = ProfileSerializer(profile).data
-            except Profile.DoesNotExist:
-                # Create profile if it doesn't exist
-                profile = Profile.objects.create(user=user)
-                profile_data = ProfileSerializer(profile).data
-            
-            users_data.append({
-                'id': str(profile.id),
-                'user_id': user.id,
-                'full_name': profile_data.get('full_name') or f"{user.first_name} {user.last_name}".strip() or user.username,
-                'email': user.email,
-                'username': user.username,
-                'role': profile_data.get('role', 'student'),
-                'role_type': profile_data.get('role_type', 'student'),
-                'department': profile_data.get('department', ''),
-                'designation': profile_data.get('designation', ''),
-                'qualifications': profile_data.get('qualifications', ''),
-                'research_areas': profile_data.get('research_areas', []),
-                'enrollment_year': profile_data.get('enrollment_year'),
-                'semester': profile_data.get('semester', ''),
-                'branch': profile_data.get('branch', ''),
-                'graduation_year': profile_data.get('graduation_year'),
-                'current_position': profile_data.get('current_position', ''),
-                'company': profile_data.get('company', ''),
-                'phone': profile_data.get('phone', ''),
-                'address': profile_data.get('address', ''),
-                'photo_url': profile_data.get('photo_url', ''),
-                'is_active': user.is_active,
-                'is_staff': user.is_staff,
-                'date_joined': user.date_joined.isoformat(),
-                'created_at': profile_data.get('created_at'),
-                'updated_at': profile_data.get('updated_at')
-            })
-        
-        return Response(users_data)
+        users = User.objects.all()
+
+        # Filters
+        role = request.query_params.get('role')
+        if role:
+            users = users.filter(profile__role=role)
+        role_type = request.query_params.get('role_type')
+        if role_type:
+            users = users.filter(profile__role_type=role_type)
+        department = request.query_params.get('department')
+        if department:
+            users = users.filter(profile__department=department)
+        is_active = request.query_params.get('is_active')
+        if is_active in ('true', 'false'):
+            users = users.filter(is_active=(is_active == 'true'))
+
+        # Search
+        search = request.query_params.get('search', '').strip()
+        if search:
+            users = users.filter(
+                models.Q(username__icontains=search) |
+                models.Q(email__icontains=search) |
+                models.Q(first_name__icontains=search) |
+                models.Q(last_name__icontains=search) |
+                models.Q(profile__full_name__icontains=search)
+            )
+
+        # Ordering
+        ordering = request.query_params.get('ordering', '-date_joined')
+        if ordering.lstrip('-') not in USERS_LIST_ORDERING_FIELDS:
+            ordering = '-date_joined'
+        descending = ordering.startswith('-')
+        order_field = USERS_LIST_ORDERING_FIELDS[ordering.lstrip('-')]
+        users = users.order_by(f"{'-' if descending else ''}{order_field}", '-id')
+
+        # Single LEFT JOIN query; users without a profile come back with null profile columns.
+        # Run `manage.py backfill_profiles` to create any missing profiles.
+        users = users.values(*UserListSerializer.VALUES_FIELDS)
+
+        paginator = LargeResultsSetPagination()
+        page = paginator.paginate_queryset(users, request)
+        serializer = UserListSerializer(page, many=True)
+        return paginator.get_paginated_response(timed_data(serializer))
     
     elif request.method == 'POST':
         # Create new user
@@ -155,6 +170,38 @@ def users_list_view(request):
             return Response({'message': 'User created successfully', 'user_id': user.id}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def users_import_view(request):
+    """Bulk create users from an uploaded CSV/XLSX file - Admin only"""
+    if not request.user.is_staff and (not hasattr(request.user, 'profile') or request.user.profile.role != 'admin'):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        summary = import_users(
+            upload,
+            upload.name,
+            default_password=request.data.get('default_password') or None,
+            skip_invalid=request.data.get('skip_invalid') in ('true', '1', True),
+            dry_run=request.data.get('dry_run') in ('true', '1', True),
+            # Hashing runs in this request, on a worker with a 30 s timeout
+            workers=1,
+            max_rows=settings.USER_IMPORT_MAX_ROWS,
+        )
+    except ImportTooLarge as e:
+        return Response({'error': str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    except ImportFileError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if summary['errors'] and not summary['created']:
+        return Response(summary, status=status.HTTP_400_BAD_REQUEST)
+    response_status = status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK
+    return Response(summary, status=response_status)
+
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def user_detail_view(request, user_id):
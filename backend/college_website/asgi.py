@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'college_website.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup; serves the SSE change stream at /api/events/ (core.sse)
+from core.sse import EventStreamApp  # noqa: E402
+
+application = EventStreamApp(django_application)
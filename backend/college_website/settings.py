@@ -12,7 +12,9 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
+from corsheaders.defaults import default_headers
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,7 +54,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.PrometheusMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.instrumentation.QueryInstrumentationMiddleware',
+    'core.httpcache.HttpCachePolicyMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -61,6 +67,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.idempotency.IdempotencyMiddleware',
 ]
 
 ROOT_URLCONF = 'college_website.urls'
@@ -106,9 +113,30 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Seconds a connection is kept between requests (0 closes it after each one)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Cache shared by all gunicorn workers: Redis when REDIS_URL is set (needs the redis package),
+# otherwise files under CACHE_DIR (single host)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'nalanda-cache')),
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -128,6 +156,41 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Authentication backends: email login (single query for user + profile) first,
+# then the default username backend used by the Django admin.
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Password hashing policy: 'pbkdf2' (default), 'argon2' (needs argon2-cffi) or 'scrypt'.
+# Hashes from the other policies keep working and are upgraded on the next login.
+PASSWORD_HASHER_POLICY = config('PASSWORD_HASHER_POLICY', default='pbkdf2')
+_PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'authentication.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'authentication.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'authentication.hashers.TunedScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_POLICIES[PASSWORD_HASHER_POLICY]] + [
+    hasher for policy, hasher in _PASSWORD_HASHER_POLICIES.items() if policy != PASSWORD_HASHER_POLICY
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Cost parameters (leave unset to use Django's defaults)
+PASSWORD_HASHER_PBKDF2_ITERATIONS = config('PASSWORD_HASHER_PBKDF2_ITERATIONS', default=0, cast=int)
+PASSWORD_HASHER_ARGON2_TIME_COST = config('PASSWORD_HASHER_ARGON2_TIME_COST', default=0, cast=int)
+PASSWORD_HASHER_ARGON2_MEMORY_COST = config('PASSWORD_HASHER_ARGON2_MEMORY_COST', default=0, cast=int)  # KiB
+PASSWORD_HASHER_ARGON2_PARALLELISM = config('PASSWORD_HASHER_ARGON2_PARALLELISM', default=0, cast=int)
+PASSWORD_HASHER_SCRYPT_WORK_FACTOR = config('PASSWORD_HASHER_SCRYPT_WORK_FACTOR', default=0, cast=int)
+PASSWORD_HASHER_SCRYPT_PARALLELISM = config('PASSWORD_HASHER_SCRYPT_PARALLELISM', default=0, cast=int)
+
+# Rows the admin user import accepts per upload. It hashes in the request (a default pbkdf2
+# hash is ~0.5 s of CPU) and must finish inside the gunicorn timeout; larger files go
+# through `manage.py import_users`.
+USER_IMPORT_MAX_ROWS = config('USER_IMPORT_MAX_ROWS', default=25, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -149,11 +212,92 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Hashed names plus .gz/.br variants written by collectstatic, served by WhiteNoise
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Media files
 # MEDIA_URL = '/media/'
 # MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Origin that serves MEDIA_URL (e.g. https://cdn.thenalanda.com); API media URLs use it instead of the request host
+MEDIA_CDN_URL = config('MEDIA_CDN_URL', default='')
+# Seconds to reuse storage URLs across requests (0 = per request only; keep below signed URL expiry)
+MEDIA_URL_CACHE_SECONDS = config('MEDIA_URL_CACHE_SECONDS', default=0, cast=int)
+
+# Response compression (core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)  # bytes
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+COMPRESSION_CACHE_MAX_BYTES = config('COMPRESSION_CACHE_MAX_BYTES', default=8 * 1024 * 1024, cast=int)  # per worker
+# Responses that carry tokens are never compressed
+COMPRESSION_EXCLUDE_PATHS = ['/api/auth/login/', '/api/auth/register/', '/api/auth/token/']
+
+# Query instrumentation (core.instrumentation); aggregates at /api/_metrics/
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=True, cast=bool)
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+# Render list pages from .values() rows with plans compiled from the serializers (core.compiled)
+COMPILED_READ_PATH = config('COMPILED_READ_PATH', default=False, cast=bool)
+# Per-view limits ('NewsViewSet.list', 'NewsViewSet' or 'DEFAULT'); exceeding one logs a warning
+QUERY_BUDGETS = {
+    'DEFAULT': {'queries': 20, 'db_ms': 250, 'duplicates': 5},
+}
+
+# Publish windows (core.management.commands.publish_schedule)
+NEW_BADGE_DAYS = config('NEW_BADGE_DAYS', default=7, cast=int)  # is_new is cleared after this many days
+BREAKING_NEWS_HOURS = config('BREAKING_NEWS_HOURS', default=24, cast=int)  # is_breaking is cleared after this
+
+# Per-worker caches in front of the shared cache, evicted over LISTEN/NOTIFY (core.invalidation)
+L1_TTL = config('L1_TTL', default=300, cast=int)  # seconds; the bus evicts changed entries long before
+L1_MAX_ENTRIES = config('L1_MAX_ENTRIES', default=1000, cast=int)  # per cache and worker
+L1_VERSION_CHECK_SECONDS = config('L1_VERSION_CHECK_SECONDS', default=5, cast=int)  # staleness bound if a NOTIFY is missed
+L1_INVALIDATION_LISTENER = config('L1_INVALIDATION_LISTENER', default=True, cast=bool)
+
+# Content collections (core.content); served from the cache until an item changes
+CONTENT_CACHE_SECONDS = config('CONTENT_CACHE_SECONDS', default=3600, cast=int)
+
+# Stale-while-revalidate for hot endpoints (core.swr): hierarchy, upcoming events, content collections
+SWR_TTL = config('SWR_TTL', default=300, cast=int)  # seconds a value is fresh; writes invalidate it sooner
+SWR_GRACE_SECONDS = config('SWR_GRACE_SECONDS', default=600, cast=int)  # served stale this long while one worker rebuilds
+SWR_LOCK_WAIT = config('SWR_LOCK_WAIT', default=5, cast=int)  # seconds a miss waits for another worker's build
+
+# Static JSON snapshots of public endpoints for the web server to serve (core.snapshots); off when empty
+SNAPSHOT_ROOT = config('SNAPSHOT_ROOT', default='')
+SNAPSHOT_BASE_URL = config('SNAPSHOT_BASE_URL', default='http://localhost')  # scheme and host of absolute URLs in them
+SNAPSHOT_DEBOUNCE_SECONDS = config('SNAPSHOT_DEBOUNCE_SECONDS', default=5, cast=int)  # quiet time before publishing
+SNAPSHOT_MAX_DELAY = config('SNAPSHOT_MAX_DELAY', default=60, cast=int)  # publish at least this often while writes go on
+
+# Cache-Control/Vary for the core API (core.httpcache); PURGE requests go to the shared cache when the URL is set
+HTTP_CACHE_PURGE_URL = config('HTTP_CACHE_PURGE_URL', default='')
+HTTP_CACHE_TAG_HEADER = config('HTTP_CACHE_TAG_HEADER', default='Cache-Tag')  # Surrogate-Key for Varnish/Fastly
+
+# Idempotency-Key handling for core API writes (core.idempotency)
+IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=24 * 60 * 60, cast=int)  # seconds a response is replayed
+# Seconds a duplicate waits for the first request before the 409 + Retry-After; it holds a
+# sync worker meanwhile, so keep it well below the gunicorn timeout (30 s)
+IDEMPOTENCY_LOCK_WAIT = config('IDEMPOTENCY_LOCK_WAIT', default=3, cast=int)
+IDEMPOTENCY_MAX_RESPONSE_BYTES = 1024 * 1024  # larger responses are not stored
+
+# Delta sync (?updated_since= on core lists, core.sync); compact_tombstones drops older deletions
+TOMBSTONE_RETENTION_DAYS = config('TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# Server-Sent Events at /api/events/ on the ASGI app (core.sse)
+SSE_HEARTBEAT_SECONDS = config('SSE_HEARTBEAT_SECONDS', default=15, cast=int)
+SSE_QUEUE_SIZE = config('SSE_QUEUE_SIZE', default=100, cast=int)  # events buffered per client before it is reset
+SSE_MAX_CONNECTIONS = config('SSE_MAX_CONNECTIONS', default=10000, cast=int)  # per process
+SSE_RETRY_MS = 5000  # EventSource reconnect delay
+
+# In-process GET batches at /api/batch/ (core.batch)
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+# Threads per worker for running sub-requests side by side; 1 runs them in turn on the request's connection
+BATCH_CONCURRENCY = config('BATCH_CONCURRENCY', default=4, cast=int)
 
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
@@ -178,6 +322,15 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'core.pagination.LargeResultsSetPagination',
     'PAGE_SIZE': 20
 }
@@ -210,6 +363,8 @@ CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=False, cast=bo
 
 # CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_CREDENTIALS = config('CORS_ALLOW_CREDENTIALS', default=True, cast=bool)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 # Security Headers
 CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', default='').split(',')
@@ -246,5 +401,10 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        'core.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
@@ -2,7 +2,8 @@ from django.contrib import admin
 from .models import (
     Program, Trade, Department, DepartmentGalleryImage, HeroImage, Notice, Magazine, Club, CampusEvent,
     AcademicService, Topper, CreativeWork, StudentSubmission, CampusStats, News, ContactInfo, OfficeLocation, QuickContactInfo, Timetable,
-    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage
+    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage,
+    ContentCollection, ContentItem
 )
 
 @admin.register(Department)
@@ -285,3 +286,17 @@ class SportsFacilityImageAdmin(admin.ModelAdmin):
     list_display = ['facility', 'display_order', 'created_at']
     list_filter = ['facility', 'created_at']
     ordering = ['facility', 'display_order']
+
+@admin.register(ContentCollection)
+class ContentCollectionAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'slug']
+    ordering = ['name']
+
+@admin.register(ContentItem)
+class ContentItemAdmin(admin.ModelAdmin):
+    list_display = ['collection', 'display_order', 'is_active', 'updated_at']
+    list_filter = ['collection', 'is_active']
+    list_select_related = ['collection']
+    ordering = ['collection', 'display_order']
@@ -0,0 +1,162 @@
+"""
+In-process batch of GET sub-requests (POST /api/batch/).
+
+    {"requests": [
+        {"id": "users", "path": "/api/auth/users/?page_size=50"},
+        {"id": "pending", "path": "/api/student-submissions/?status=pending"}
+    ]}
+
+returns
+
+    {"responses": {
+        "users": {"status": 200, "body": {...}},
+        "pending": {"status": 403, "body": {"detail": "..."}}
+    }}
+
+Each path is resolved against the project URLconf and its view is called
+directly, so the middleware stack runs once for the whole batch. The caller is
+authenticated once: sub-requests carry the already authenticated user and
+token (DRF's forced authentication) instead of decoding the JWT again, while
+each view still applies its own permissions and filters. Sub-requests never
+change the "id" keys or order of the batch.
+
+Sub-requests run on the request's database connection one after another, or,
+with BATCH_CONCURRENCY > 1, on a small process-wide thread pool. Django keeps
+one connection per thread, so pool threads open their own and follow
+CONN_MAX_AGE like a request would; a pool is only used for two or more
+sub-requests and never inside a transaction, where other connections could
+not see uncommitted rows.
+"""
+import copy
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.http import Http404, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.datastructures import MultiValueDict
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+BATCH_VIEW_NAME = 'batch'
+# Request META that describes the batch body rather than a GET
+BODY_META = ('CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IDEMPOTENCY_KEY', 'HTTP_CONTENT_ENCODING')
+# Attributes the middleware/views cache on a request; a sub-request starts without them
+REQUEST_CACHE_ATTRS = (
+    'resolver_match', '_query_metrics', '_instrumentation_key', '_idempotency', '_body', '_post', '_files',
+    '_media_url_resolver',
+)
+
+_executor = None
+
+
+class BatchError(ValueError):
+    """The batch itself is malformed (answered with 400 as a whole)"""
+
+
+def parse_batch(data):
+    """[(id, path, query)] from a batch body, raising BatchError for an invalid one"""
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list):
+        raise BatchError('Expected {"requests": [{"id": ..., "path": ...}, ...]}.')
+    items = data['requests']
+    if not items:
+        raise BatchError('requests must not be empty.')
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f'At most {settings.BATCH_MAX_REQUESTS} requests per batch.')
+
+    parsed, seen = [], set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError(f'requests[{index}]: path is required.')
+        item_id = str(item.get('id', index))
+        if item_id in seen:
+            raise BatchError(f'requests[{index}]: duplicate id {item_id!r}.')
+        seen.add(item_id)
+        if str(item.get('method', 'GET')).upper() != 'GET':
+            raise BatchError(f'requests[{index}]: only GET sub-requests are supported.')
+        url = urlsplit(item['path'])
+        if url.scheme or url.netloc or not url.path.startswith(API_PREFIX):
+            raise BatchError(f'requests[{index}]: path must start with {API_PREFIX}.')
+        parsed.append((item_id, url.path, url.query))
+    return parsed
+
+
+def build_subrequest(request, user, auth, path, query):
+    """A GET for path?query that reuses the batch request's headers and authentication"""
+    sub = copy.copy(request)
+    for attr in REQUEST_CACHE_ATTRS:
+        sub.__dict__.pop(attr, None)
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key not in BODY_META}
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    sub._post, sub._files = QueryDict(), MultiValueDict()
+    # Read by rest_framework.request.Request instead of running the authenticators again
+    sub._force_auth_user, sub._force_auth_token = user, auth
+    return sub
+
+
+def error(status, message):
+    return {'status': status, 'body': {'error': message}}
+
+
+def response_body(response):
+    if isinstance(response, Response):
+        return response.data
+    if response.streaming or not response.get('Content-Type', '').startswith('application/json'):
+        return None
+    return json.loads(response.content) if response.content else None
+
+
+def run_subrequest(sub):
+    """{'status', 'body'} for one sub-request; never raises"""
+    try:
+        match = resolve(sub.path_info)
+    except Resolver404:
+        return error(404, 'Not found')
+    if match.view_name == BATCH_VIEW_NAME:
+        return error(400, 'Batch requests cannot be nested')
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Http404:
+        return error(404, 'Not found')
+    except Exception:
+        logger.exception('Batch sub-request %s failed', sub.get_full_path())
+        return error(500, 'Internal server error')
+    body = response_body(response)
+    if body is None and response.status_code != 204:
+        return error(406, 'Only JSON responses can be batched')
+    return {'status': response.status_code, 'body': body}
+
+
+def _run_in_pool(sub):
+    # Pool threads get the request lifecycle's connection handling
+    close_old_connections()
+    try:
+        return run_subrequest(sub)
+    finally:
+        close_old_connections()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.BATCH_CONCURRENCY, thread_name_prefix='batch')
+    return _executor
+
+
+def run_batch(request, user, auth, items):
+    """{id: result} for the parsed items, in batch order"""
+    subrequests = [(item_id, build_subrequest(request, user, auth, path, query)) for item_id, path, query in items]
+    concurrent = settings.BATCH_CONCURRENCY > 1 and len(subrequests) > 1 and not connection.in_atomic_block
+    if not concurrent:
+        return {item_id: run_subrequest(sub) for item_id, sub in subrequests}
+    futures = [(item_id, executor().submit(_run_in_pool, sub)) for item_id, sub in subrequests]
+    return {item_id: future.result() for item_id, future in futures}
@@ -0,0 +1,9 @@
+"""
+HTTP load benchmark for the public and admin API.
+
+endpoints.discover() lists every GET route of the core router and the auth
+app, loadgen.run() drives one of them over keep-alive connections from a pool
+of threads, and baseline holds the JSON baseline format and the comparison
+used to flag regressions between commits. The bench_api management command
+ties them together; populate_data --bench seeds the volumes it expects.
+"""
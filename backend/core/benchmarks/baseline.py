@@ -0,0 +1,68 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.utils import timezone
+
+FORMAT_VERSION = 1
+# Latency changes smaller than this are noise on a local run, whatever the percentage
+MIN_LATENCY_DELTA_MS = 2.0
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build(results, options):
+    """Baseline document for a run; results maps endpoint name -> summary dict"""
+    return {
+        'version': FORMAT_VERSION,
+        'commit': current_commit(),
+        'created_at': timezone.now().isoformat(),
+        'options': options,
+        'endpoints': results,
+    }
+
+
+def load(path):
+    with open(path) as fh:
+        baseline = json.load(fh)
+    if baseline.get('version') != FORMAT_VERSION:
+        raise ValueError(f'{path}: unsupported baseline version {baseline.get("version")!r}')
+    return baseline
+
+
+def save(baseline, path):
+    with open(path, 'w') as fh:
+        json.dump(baseline, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+def compare(old, new, tolerance=0.15):
+    """
+    Regressions of `new` against `old` as (endpoint, metric, old value, new value):
+    p95/p99 latency or throughput worse by more than `tolerance` (a fraction),
+    any increase in queries per request, and endpoints that started failing.
+    """
+    regressions = []
+    for name, current in sorted(new['endpoints'].items()):
+        previous = old['endpoints'].get(name)
+        if previous is None:
+            continue
+        for metric in ('p95_ms', 'p99_ms'):
+            before, after = previous[metric], current[metric]
+            if after - before > MIN_LATENCY_DELTA_MS and after > before * (1 + tolerance):
+                regressions.append((name, metric, before, after))
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append((name, 'throughput_rps', previous['throughput_rps'], current['throughput_rps']))
+        if None not in (previous['queries'], current['queries']) and current['queries'] > previous['queries']:
+            regressions.append((name, 'queries', previous['queries'], current['queries']))
+        if current['errors'] and not previous['errors']:
+            regressions.append((name, 'errors', previous['errors'], current['errors']))
+    return regressions
@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+from django.contrib.auth.models import User
+
+from authentication.models import Profile
+from core.models import AdminRole
+from core.urls import router
+
+Endpoint = namedtuple('Endpoint', ['name', 'path'])
+
+# GET routes of the auth app; {user_id} is filled with an existing user
+AUTH_ENDPOINTS = [
+    ('auth-profile', '/api/auth/profile/'),
+    ('auth-users', '/api/auth/users/'),
+    ('auth-user-detail', '/api/auth/users/{user_id}/'),
+    ('auth-superadmins', '/api/auth/superadmins/'),
+]
+
+
+def discover():
+    """Every GET list/detail/action route of the core router plus the auth app's GET views"""
+    endpoints = []
+    for prefix, viewset, basename in router.registry:
+        base = f'/api/{prefix}/'
+        pk = viewset.queryset.model.objects.values_list('pk', flat=True).order_by('pk').first()
+        endpoints.append(Endpoint(f'{basename}-list', base))
+        if pk is not None:
+            endpoints.append(Endpoint(f'{basename}-detail', f'{base}{pk}/'))
+        for action in viewset.get_extra_actions():
+            if 'get' not in action.mapping or '(?P<' in action.url_path:
+                continue
+            if action.detail:
+                if pk is None:
+                    continue
+                endpoints.append(Endpoint(f'{basename}-{action.url_name}', f'{base}{pk}/{action.url_path}/'))
+            else:
+                endpoints.append(Endpoint(f'{basename}-{action.url_name}', f'{base}{action.url_path}/'))
+
+    user_id = User.objects.filter(profile__isnull=False).values_list('id', flat=True).order_by('-id').first()
+    for name, path in AUTH_ENDPOINTS:
+        if '{user_id}' in path and user_id is None:
+            continue
+        endpoints.append(Endpoint(name, path.format(user_id=user_id)))
+    return endpoints
+
+
+def admin_user(username='bench_admin'):
+    """Staff user with an admin profile and super admin role that drives the admin-only endpoints"""
+    user, created = User.objects.get_or_create(
+        username=username, defaults={'email': f'{username}@example.com', 'is_staff': True}
+    )
+    if created:
+        user.set_unusable_password()
+        user.save()
+    Profile.objects.update_or_create(user=user, defaults={'role': 'admin', 'full_name': 'Benchmark Admin'})
+    AdminRole.objects.update_or_create(user=user, defaults={'role_level': 1, 'is_active': True})
+    return user
@@ -0,0 +1,98 @@
+import http.client
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+SERVER_TIMING_QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class Result:
+    """Latencies and counters for one endpoint run"""
+
+    def __init__(self):
+        self.latencies = []
+        self.queries = []
+        self.statuses = {}
+        self.bytes = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def summary(self):
+        count = len(self.latencies)
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'statuses': {str(status): n for status, n in sorted(self.statuses.items())},
+            'throughput_rps': round(count / self.elapsed, 1) if self.elapsed else 0.0,
+            'p50_ms': round(self.percentile(50), 2),
+            'p95_ms': round(self.percentile(95), 2),
+            'p99_ms': round(self.percentile(99), 2),
+            # From the Server-Timing header set by QueryInstrumentationMiddleware
+            'queries': max(self.queries) if self.queries else None,
+            'bytes': self.bytes // count if count else 0,
+        }
+
+
+def request(conn, path, headers):
+    """One GET on a keep-alive connection: (status, body size, query count or None)"""
+    conn.request('GET', path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    match = SERVER_TIMING_QUERIES_RE.search(response.getheader('Server-Timing') or '')
+    return response.status, len(body), int(match.group(1)) if match else None
+
+
+def run(base_url, path, headers=None, requests=200, concurrency=8, timeout=30):
+    """Send `requests` GETs to base_url + path from `concurrency` threads"""
+    url = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+    headers = {'Accept-Encoding': 'identity', **(headers or {})}
+    full_path = url.path.rstrip('/') + path
+    result = Result()
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker():
+        conn = connection_class(url.hostname, url.port, timeout=timeout)
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    status, size, queries = request(conn, full_path, headers)
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = connection_class(url.hostname, url.port, timeout=timeout)
+                    with lock:
+                        result.errors += 1
+                    continue
+                latency = (time.perf_counter() - started) * 1000
+                with lock:
+                    result.latencies.append(latency)
+                    result.statuses[status] = result.statuses.get(status, 0) + 1
+                    result.bytes += size
+                    if status >= 400:
+                        result.errors += 1
+                    if queries is not None:
+                        result.queries.append(queries)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,32 @@
+"""
+Content version for cached API data.
+
+Cached public content is keyed with content_version(); bumping it makes every
+worker miss and rebuild on the next request. Bump it whenever public content
+changes without a model write the cache would otherwise notice, e.g. when
+publish_schedule expires rows or clears their badges.
+"""
+from django.core.cache import cache
+
+from .invalidation import publish
+
+CONTENT_VERSION_KEY = 'core:content-version'
+# Invalidation label for per-worker caches of versioned content
+CONTENT_VERSION_LABEL = 'core:content-version'
+
+
+def content_version():
+    return cache.get_or_set(CONTENT_VERSION_KEY, 1, timeout=None)
+
+
+def bump_content_version():
+    """Invalidate everything keyed with the current version; returns the new one"""
+    try:
+        version = cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        # Evicted or never set: start above the default so stale keys still miss
+        cache.add(CONTENT_VERSION_KEY, 2, timeout=None)
+        version = content_version()
+    # Evicted after the bump, so a request refilling the L1 cache already reads the new version
+    publish(CONTENT_VERSION_LABEL)
+    return version
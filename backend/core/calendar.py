@@ -0,0 +1,126 @@
+"""
+Calendar views of CampusEvent: compact grouped-by-day payloads and a streamed
+iCalendar (RFC 5545) feed. Both read plain .values() rows from
+CampusEvent.objects.overlapping(), which is served by event_span_gist_idx.
+"""
+from datetime import date, timedelta, timezone
+
+# Fields sent once per event in the calendar payload (days only carry ids)
+CALENDAR_FIELDS = [
+    'id', 'title', 'event_type', 'start_date', 'end_date', 'venue', 'is_featured', 'registration_required',
+    'club_id',
+]
+ICS_FIELDS = ['id', 'title', 'description', 'event_type', 'start_date', 'end_date', 'venue', 'updated_at']
+# Longest range one calendar request may cover
+MAX_RANGE_DAYS = 366
+ICS_DEFAULT_PAST_DAYS = 30
+ICS_CHUNK_SIZE = 500
+
+
+class CalendarRangeError(ValueError):
+    """Raised for a missing, malformed or too long ?from=&to= range"""
+
+
+def parse_range(params, default=None):
+    """(from, to) dates from query params; `default` is used when both are missing"""
+    raw_from, raw_to = params.get('from'), params.get('to')
+    if not raw_from and not raw_to and default is not None:
+        return default
+    if not raw_from or not raw_to:
+        raise CalendarRangeError('Both from and to are required (YYYY-MM-DD).')
+    try:
+        start, end = date.fromisoformat(raw_from), date.fromisoformat(raw_to)
+    except ValueError:
+        raise CalendarRangeError('from and to must be dates in YYYY-MM-DD format.')
+    if end < start:
+        raise CalendarRangeError('to must not be before from.')
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise CalendarRangeError(f'The range may cover at most {MAX_RANGE_DAYS} days.')
+    return start, end
+
+
+def event_days(event, start, end):
+    """Days of [start, end] on which the event runs"""
+    first = max(event['start_date'], start)
+    last = min(max(event['end_date'] or event['start_date'], event['start_date']), end)
+    return (first + timedelta(days=n) for n in range((last - first).days + 1))
+
+
+def group_by_day(events, start, end):
+    """{'events': {id: event}, 'days': {'YYYY-MM-DD': [id, ...]}} with each event listed once"""
+    by_id = {}
+    days = {}
+    for event in events:
+        event_id = str(event['id'])
+        by_id[event_id] = event
+        for day in event_days(event, start, end):
+            days.setdefault(day.isoformat(), []).append(event_id)
+    return {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'days': dict(sorted(days.items())),
+        'events': by_id,
+    }
+
+
+def escape_text(value):
+    return (
+        (value or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74  # continuation lines start with a space
+        # Do not split a multi-byte character
+        while cut and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def ics_event(event, host):
+    last_day = max(event['end_date'] or event['start_date'], event['start_date'])
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:{event['id']}@{host}",
+        f"DTSTAMP:{event['updated_at'].astimezone(timezone.utc):%Y%m%dT%H%M%SZ}",
+        f"DTSTART;VALUE=DATE:{event['start_date']:%Y%m%d}",
+        # DTEND is exclusive for all-day events
+        f"DTEND;VALUE=DATE:{last_day + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{escape_text(event['title'])}",
+        f"CATEGORIES:{escape_text(event['event_type'])}",
+    ]
+    if event['venue']:
+        lines.append(f"LOCATION:{escape_text(event['venue'])}")
+    if event['description']:
+        lines.append(f"DESCRIPTION:{escape_text(event['description'])}")
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+def stream_ics(queryset, host, name='Campus Events'):
+    """Yield the feed piece by piece; rows are fetched in chunks, never all at once"""
+    yield ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:-//{host}//Campus Events//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ])
+    buffer = []
+    for event in queryset.values(*ICS_FIELDS).iterator(chunk_size=ICS_CHUNK_SIZE):
+        buffer.append(ics_event(event, host))
+        if len(buffer) >= 100:
+            yield ''.join(buffer)
+            buffer = []
+    buffer.append('END:VCALENDAR\r\n')
+    yield ''.join(buffer)
@@ -0,0 +1,473 @@
+"""
+Compiled read path for list endpoints.
+
+A DRF ModelSerializer rendering a list page walks get_attribute/to_representation
+for every field of every model instance. read_plan() instead introspects the
+serializer's field set once (plans are memoized per process by serializer
+class and field set) into a ReadPlan: the .values() columns the page needs
+and, per output field, a producer that turns the whole batch of rows into a
+list of values:
+    - model columns and forward foreign key paths ('program.name') are read
+      from .values() rows and converted the way the DRF field would
+      (ISO datetimes in the current timezone, str UUIDs, file URLs, ...)
+    - MediaURLFields on file columns go through MediaURLResolver
+    - SerializerMethodFields registered in BATCH_FIELDS run once per batch
+      (e.g. one GROUP BY for all trades_count values of the page)
+    - nested many=True serializers (gallery_images, images) are compiled too
+      and fetched with one query for the page
+    - remaining property/method fields are rendered by the DRF field itself
+      on a partial instance holding only the columns in field_dependencies
+The output is the same as serializer(page, many=True).data; fields the plan
+cannot reproduce (expanded nested serializers, method fields without
+field_dependencies, ...) make read_plan() return None and the view falls back
+to the serializer.
+
+COMPILED_READ_PATH turns the compiled path on for views with
+CompiledListViewMixin; it is independent of the instrumentation mixin, which
+only times whichever path renders the page.
+"""
+import threading
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.fields import SkipField, empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .instrumentation import timed_render
+from .media import MediaURLField, MediaURLResolver
+from .models import CampusEvent, Department, Trade
+from . import serializers as core_serializers
+
+# Marker for a field left out of the row, as DRF does when get_attribute raises SkipField
+SKIP = object()
+
+STRING_FIELDS = (
+    drf_fields.CharField, drf_fields.EmailField, drf_fields.URLField, drf_fields.SlugField,
+    drf_fields.RegexField, drf_fields.IPAddressField,
+)
+IDENTITY_FIELDS = (drf_fields.JSONField, drf_fields.ReadOnlyField, relations.PrimaryKeyRelatedField)
+
+
+class CompileError(Exception):
+    """The serializer has a field the compiled path cannot reproduce exactly"""
+
+
+class RenderState:
+    """Per-render values shared by the producers of one plan (request, media base, partial instances)"""
+
+    def __init__(self, context):
+        self.context = context
+        self.request = context.get('request')
+        self._media_resolver = None
+        self.instances = None
+
+    @property
+    def media_resolver(self):
+        if self._media_resolver is None:
+            self._media_resolver = MediaURLResolver.for_request(self.request)
+        return self._media_resolver
+
+
+# Converters: DRF field -> function(value) for non-null column values
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return None
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if tz is None:
+        return None
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return None
+    return lambda value: value if isinstance(value, str) else value.isoformat()
+
+
+def _choice_converter(field):
+    choices = field.choice_strings_to_values
+    return lambda value: value if value == '' else choices.get(str(value), value)
+
+
+def value_converter(field):
+    """Function reproducing field.to_representation for the column value, built per render"""
+    field_type = type(field)
+    if field_type in STRING_FIELDS:
+        return str
+    if field_type in IDENTITY_FIELDS:
+        return None
+    if field_type is drf_fields.IntegerField:
+        return int
+    if field_type is drf_fields.FloatField:
+        return float
+    if field_type is drf_fields.BooleanField:
+        return lambda value: value if value is True or value is False else field.to_representation(value)
+    if field_type is drf_fields.UUIDField and field.uuid_format == 'hex_verbose':
+        return str
+    if field_type is drf_fields.ChoiceField:
+        return _choice_converter(field)
+    if field_type is drf_fields.DateTimeField:
+        return _datetime_converter(field) or field.to_representation
+    if field_type is drf_fields.DateField:
+        return _date_converter(field) or field.to_representation
+    if isinstance(field, (drf_fields.ModelField, serializers.BaseSerializer, relations.RelatedField)):
+        raise CompileError(f'{field.field_name}: {field_type.__name__} is not supported')
+    return field.to_representation
+
+
+# Producers: function(rows, state) -> list of output values, one per row
+
+def column_producer(field, column, null_check=None, missing=None):
+    def produce(rows, state):
+        convert = value_converter(field)
+        values = []
+        append = values.append
+        for row in rows:
+            if null_check is not None and row[null_check] is None:
+                append(missing)
+                continue
+            value = row[column]
+            if value is None:
+                append(None)
+            elif convert is None:
+                append(value)
+            else:
+                append(convert(value))
+        return values
+    return produce
+
+
+def file_producer(field, column, storage):
+    """DRF FileField/ImageField: absolute storage URL against the request host"""
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    def produce(rows, state):
+        request = state.request
+        values = []
+        for row in rows:
+            name = row[column]
+            if not name:
+                values.append(None)
+            elif not use_url:
+                values.append(name)
+            elif request is not None:
+                values.append(request.build_absolute_uri(storage.url(name)))
+            else:
+                values.append(storage.url(name))
+        return values
+    return produce
+
+
+def media_producer(field, column, storage, link_column=None):
+    """MediaURLField on a file column, optionally preferring a link column"""
+    def produce(rows, state):
+        resolver = state.media_resolver
+        values = []
+        for row in rows:
+            if link_column is not None and row[link_column]:
+                values.append(row[link_column])
+                continue
+            name = row[column]
+            if not name or (not resolver.base and not field.allow_relative):
+                values.append(None)
+            else:
+                values.append(resolver.name_url(storage, name))
+        return values
+    return produce
+
+
+def instance_producer(field):
+    """Let the DRF field render from a partial instance (property and method sources)"""
+    def produce(rows, state):
+        values = []
+        for instance in state.instances:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                values.append(SKIP)
+                continue
+            values.append(None if attribute is None else field.to_representation(attribute))
+        return values
+    return produce
+
+
+def nested_producer(child_plan, fk_attname, pk_column):
+    """many=True nested serializer over a reverse foreign key: one query for the whole batch"""
+    def produce(rows, state):
+        ids = [row[pk_column] for row in rows]
+        related = child_plan.model._default_manager.filter(**{f'{fk_attname}__in': ids})
+        children = list(related.values(*child_plan.columns, fk_attname))
+        grouped = {}
+        for parent_id, item in zip((child[fk_attname] for child in children), child_plan.render(children, state.context)):
+            grouped.setdefault(parent_id, []).append(item)
+        return [grouped.get(pk, []) for pk in ids]
+    return produce
+
+
+class ReadPlan:
+    def __init__(self, model, columns, fields, instance_columns, skippable):
+        self.model = model
+        self.columns = columns
+        self.fields = fields  # [(name, producer)]
+        self.instance_columns = instance_columns  # attnames partial instances are built from, or None
+        self.skippable = skippable  # names of fields that may be left out of a row
+
+    def values(self, queryset):
+        """The view's queryset reduced to the plan's columns (filters and ordering are kept)"""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def render(self, rows, context):
+        rows = list(rows)
+        state = RenderState(context)
+        if self.instance_columns is not None:
+            state.instances = [
+                self.model.from_db(None, self.instance_columns, [row[column] for column in self.instance_columns])
+                for row in rows
+            ]
+        names = [name for name, _ in self.fields]
+        columns = [producer(rows, state) for _, producer in self.fields]
+        data = [dict(zip(names, values)) for values in zip(*columns)] if columns else [{} for _ in rows]
+        for name in self.skippable:
+            for item in data:
+                if item[name] is SKIP:
+                    del item[name]
+        return data
+
+
+# Batch functions for SerializerMethodFields: (serializer class, field name) -> (columns, function)
+BATCH_FIELDS = {}
+
+
+def batch_field(serializer_class, field_name, columns):
+    def register(function):
+        BATCH_FIELDS[(serializer_class, field_name)] = (columns, function)
+        return function
+    return register
+
+
+def _counts(model, fk, ids, **filters):
+    queryset = model._default_manager.filter(**{f'{fk}__in': ids}, **filters)
+    return dict(queryset.order_by().values_list(fk).annotate(n=Count('pk')))
+
+
+@batch_field(core_serializers.ProgramSerializer, 'trades_count', ['id'])
+def trades_count(rows, state):
+    counts = _counts(Trade, 'program_id', [row['id'] for row in rows])
+    return [counts.get(row['id'], 0) for row in rows]
+
+
+@batch_field(core_serializers.TradeSerializer, 'departments_count', ['id'])
+def departments_count(rows, state):
+    counts = _counts(Department, 'trade_id', [row['id'] for row in rows])
+    return [counts.get(row['id'], 0) for row in rows]
+
+
+@batch_field(core_serializers.ClubSerializer, 'events_count', ['id'])
+def events_count(rows, state):
+    counts = _counts(CampusEvent, 'club_id', [row['id'] for row in rows], is_active=True)
+    return [counts.get(row['id'], 0) for row in rows]
+
+
+@batch_field(core_serializers.StudentSubmissionSerializer, 'user_name',
+             ['user__first_name', 'user__last_name', 'user__username'])
+def submission_user_name(rows, state):
+    return [
+        f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__username']
+        for row in rows
+    ]
+
+
+@batch_field(core_serializers.StudentSubmissionSerializer, 'user_email', ['user__email'])
+def submission_user_email(rows, state):
+    return [row['user__email'] for row in rows]
+
+
+@batch_field(core_serializers.AdminRoleSerializer, 'user_full_name', ['user__profile__full_name', 'user__username'])
+def role_user_full_name(rows, state):
+    return [row['user__profile__full_name'] or row['user__username'] for row in rows]
+
+
+@batch_field(core_serializers.AdminRoleSerializer, 'granted_by_name',
+             ['granted_by_id', 'granted_by__profile__full_name', 'granted_by__username'])
+def role_granted_by_name(rows, state):
+    return [
+        (row['granted_by__profile__full_name'] or row['granted_by__username'])
+        if row['granted_by_id'] is not None else 'System'
+        for row in rows
+    ]
+
+
+@batch_field(core_serializers.AdminActivityLogSerializer, 'admin_name', ['admin__profile__full_name', 'admin__username'])
+def log_admin_name(rows, state):
+    return [row['admin__profile__full_name'] or row['admin__username'] for row in rows]
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except Exception:
+        return None
+
+
+def compile_serializer(serializer):
+    """ReadPlan for a bound ModelSerializer instance; raises CompileError"""
+    model = serializer.Meta.model
+    pk_column = model._meta.pk.attname
+    columns = {pk_column: None}
+    instance_columns = {}
+    fields = []
+    skippable = []
+    dependencies = getattr(serializer, 'field_dependencies', {})
+
+    for field in serializer._readable_fields:
+        name = field.field_name
+        batch = BATCH_FIELDS.get((type(serializer), name))
+        if batch is not None:
+            columns.update(dict.fromkeys(batch[0]))
+            fields.append((name, batch[1]))
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField):
+            attrs, model_field = [], None
+        elif field.source == '*':
+            raise CompileError(f'{name}: source="*" is not supported')
+        else:
+            attrs = field.source_attrs
+            model_field = _model_field(model, attrs[0])
+
+        if isinstance(field, serializers.ListSerializer):
+            if not isinstance(model_field, models.ManyToOneRel) or len(attrs) != 1:
+                raise CompileError(f'{name}: only reverse foreign keys can be nested')
+            child_plan = compile_serializer(field.child)
+            fields.append((name, nested_producer(child_plan, model_field.field.attname, pk_column)))
+            continue
+
+        if isinstance(field, MediaURLField) and len(attrs) == 1 and isinstance(model_field, models.FileField):
+            link_column = None
+            if field.link_source:
+                link_field = _model_field(model, field.link_source)
+                if link_field is None or not link_field.concrete:
+                    raise CompileError(f'{name}: link_source must be a column')
+                link_column = link_field.attname
+                columns[link_column] = None
+            columns[model_field.attname] = None
+            fields.append((name, media_producer(field, model_field.attname, model_field.storage, link_column)))
+            continue
+
+        if model_field is not None and model_field.concrete and not isinstance(field, MediaURLField):
+            if len(attrs) == 1:
+                column = model_field.attname
+                if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is not None:
+                    raise CompileError(f'{name}: pk_field is not supported')
+                columns[column] = None
+                if isinstance(model_field, models.FileField) and isinstance(field, drf_fields.FileField):
+                    fields.append((name, file_producer(field, column, model_field.storage)))
+                else:
+                    value_converter(field)  # raises CompileError for unsupported field types
+                    fields.append((name, column_producer(field, column)))
+                continue
+            if model_field.many_to_one or model_field.one_to_one:
+                fields.append((name, _related_column(field, model, attrs, columns)))
+                if not field.allow_null:
+                    skippable.append(name)
+                continue
+
+        # Property, method or SerializerMethodField: render from a partial instance
+        if name not in dependencies:
+            raise CompileError(f'{name}: needs field_dependencies or a batch function')
+        for dependency in dependencies[name]:
+            dependency_field = _model_field(model, dependency)
+            if dependency_field is None or not dependency_field.concrete or dependency_field.is_relation:
+                raise CompileError(f'{name}: dependency {dependency} is not a plain column')
+            instance_columns[dependency_field.attname] = None
+        fields.append((name, instance_producer(field)))
+        skippable.append(name)
+
+    if instance_columns:
+        instance_columns[pk_column] = None
+        # Model.from_db takes the values in model field order
+        instance_columns = {
+            field.attname: None for field in model._meta.concrete_fields if field.attname in instance_columns
+        }
+        columns.update(instance_columns)
+    return ReadPlan(model, list(columns), fields, list(instance_columns) if instance_columns else None, skippable)
+
+
+def _related_column(field, model, attrs, columns):
+    """Producer for a forward foreign key path such as program.name"""
+    if field.default is not empty:
+        raise CompileError(f'{field.field_name}: defaults are not supported')
+    current = model
+    path = []
+    for attr in attrs[:-1]:
+        relation = _model_field(current, attr)
+        if relation is None or not (relation.many_to_one or relation.one_to_one) or not relation.concrete:
+            raise CompileError(f'{field.field_name}: {attr} is not a forward foreign key')
+        path.append(attr)
+        current = relation.related_model
+    if len(path) > 1:
+        raise CompileError(f'{field.field_name}: only one foreign key hop is supported')
+    target = _model_field(current, attrs[-1])
+    if target is None or not target.concrete or target.is_relation:
+        raise CompileError(f'{field.field_name}: {attrs[-1]} is not a column')
+    value_converter(field)
+    null_check = _model_field(model, attrs[0]).attname
+    column = '__'.join(attrs)
+    columns[null_check] = None
+    columns[column] = None
+    # A null foreign key makes DRF's get_attribute fail: None with allow_null, otherwise the key is left out
+    return column_producer(field, column, null_check=null_check, missing=None if field.allow_null else SKIP)
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def read_plan(serializer):
+    """Memoized ReadPlan for the serializer's current field set, or None if it does not compile"""
+    if not isinstance(serializer, serializers.ModelSerializer):
+        return None
+    key = (type(serializer), tuple((name, type(field)) for name, field in serializer.fields.items()))
+    try:
+        return _plans[key]
+    except KeyError:
+        pass
+    try:
+        plan = compile_serializer(serializer)
+    except CompileError:
+        plan = None
+    with _plans_lock:
+        _plans[key] = plan
+    return plan
+
+
+class CompiledListViewMixin:
+    """
+    ViewSet mixin whose list renders through read_plan() when COMPILED_READ_PATH
+    is on; lists the plan cannot reproduce fall through to the next list().
+    Goes after DeltaSyncViewMixin and before InstrumentedViewMixin.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = read_plan(self.get_serializer()) if settings.COMPILED_READ_PATH else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        data = timed_render(plan, rows if page is None else page, self.get_serializer_context())
+        return self.get_paginated_response(data) if page is not None else Response(data)
@@ -0,0 +1,312 @@
+"""
+Generic content engine for the sections that have no model of their own
+(about pages, publications, leadership messages, ...).
+
+A ContentCollection holds a schema and its ContentItems keep their fields in a
+JSONB payload. A schema is a small, JSON-serializable field map:
+    {
+        "fields": {
+            "title": {"type": "string", "required": true, "max_length": 200},
+            "tags": {"type": "list", "items": "string"},
+        },
+        "additional": false,
+    }
+Types: string, text, integer, number, boolean, date (YYYY-MM-DD), url, email,
+list (of "items", default string) and object. "additional": true accepts keys
+the schema does not define. A collection without fields accepts any object.
+
+The public read path is collection_payload(): one query on
+content_item_access_idx, cached under the content version until an item or
+the collection changes (see core.signals), with a per-worker copy in front
+of the shared cache that the invalidation bus evicts (core.invalidation).
+Past CONTENT_CACHE_SECONDS the old payload is served while one worker
+rebuilds it (core.swr).
+"""
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.core.validators import EmailValidator, URLValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from .cache import CONTENT_VERSION_LABEL, content_version
+from . import swr
+from .invalidation import L1Cache
+from .models import ContentCollection, ContentItem
+
+FIELD_TYPES = {'string', 'text', 'integer', 'number', 'boolean', 'date', 'url', 'email', 'list', 'object'}
+SCALAR_TYPES = FIELD_TYPES - {'list', 'object'}
+# Item columns that are not part of the JSON payload
+ITEM_COLUMNS = {'id', 'display_order', 'is_active', 'created_at', 'updated_at'}
+ITEM_FIELDS = ['id', 'display_order', 'updated_at', 'data']
+DEFAULT_MAX_LENGTH = 255
+
+# Any item or collection change, or a content version bump, evicts every slug
+PAYLOAD_DEPENDENCIES = ['core.contentitem', 'core.contentcollection', CONTENT_VERSION_LABEL]
+
+_url_validator = URLValidator()
+_payloads = L1Cache('content')
+_email_validator = EmailValidator()
+_RELATIVE_URL_RE = re.compile(r'^/[^\s]*$')
+
+
+def _is_url(value):
+    if _RELATIVE_URL_RE.match(value):
+        return True
+    try:
+        _url_validator(value)
+    except DjangoValidationError:
+        return False
+    return True
+
+
+def _is_email(value):
+    try:
+        _email_validator(value)
+    except DjangoValidationError:
+        return False
+    return True
+
+
+def _is_date(value):
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def validate_schema(schema):
+    """Errors in a collection schema definition, as a list of messages"""
+    if not isinstance(schema, dict):
+        return ['Schema must be an object.']
+    errors = []
+    unknown = set(schema) - {'fields', 'additional'}
+    if unknown:
+        errors.append(f"Unknown schema keys: {', '.join(sorted(unknown))}.")
+    if not isinstance(schema.get('additional', False), bool):
+        errors.append('additional must be true or false.')
+    fields = schema.get('fields', {})
+    if not isinstance(fields, dict):
+        return errors + ['fields must be an object.']
+    for name, spec in fields.items():
+        if name in ITEM_COLUMNS:
+            errors.append(f'{name}: reserved for the item itself.')
+            continue
+        if not isinstance(spec, dict):
+            errors.append(f'{name}: field definition must be an object.')
+            continue
+        if spec.get('type') not in FIELD_TYPES:
+            errors.append(f"{name}: type must be one of {', '.join(sorted(FIELD_TYPES))}.")
+        if spec.get('type') == 'list' and spec.get('items', 'string') not in SCALAR_TYPES:
+            errors.append(f"{name}: items must be one of {', '.join(sorted(SCALAR_TYPES))}.")
+        if not isinstance(spec.get('required', False), bool):
+            errors.append(f'{name}: required must be true or false.')
+        max_length = spec.get('max_length')
+        if max_length is not None and (not isinstance(max_length, int) or isinstance(max_length, bool) or max_length < 1):
+            errors.append(f'{name}: max_length must be a positive integer.')
+    return errors
+
+
+def _check_value(field_type, value, spec):
+    """Error message for one value, or None"""
+    if field_type in ('string', 'text', 'url', 'email', 'date'):
+        if not isinstance(value, str):
+            return 'Must be a string.'
+        max_length = spec.get('max_length', DEFAULT_MAX_LENGTH if field_type == 'string' else None)
+        if max_length is not None and len(value) > max_length:
+            return f'Ensure this value has at most {max_length} characters.'
+        if field_type == 'url' and value and not _is_url(value):
+            return 'Enter a valid URL.'
+        if field_type == 'email' and value and not _is_email(value):
+            return 'Enter a valid email address.'
+        if field_type == 'date' and value and not _is_date(value):
+            return 'Enter a date in YYYY-MM-DD format.'
+    elif field_type == 'integer':
+        if not isinstance(value, int) or isinstance(value, bool):
+            return 'Must be an integer.'
+    elif field_type == 'number':
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return 'Must be a number.'
+    elif field_type == 'boolean':
+        if not isinstance(value, bool):
+            return 'Must be true or false.'
+    elif field_type == 'object':
+        if not isinstance(value, dict):
+            return 'Must be an object.'
+    elif field_type == 'list':
+        if not isinstance(value, list):
+            return 'Must be a list.'
+        item_type = spec.get('items', 'string')
+        for index, item in enumerate(value):
+            error = _check_value(item_type, item, {})
+            if error:
+                return f'Item {index}: {error}'
+    return None
+
+
+def validate_data(schema, data):
+    """Errors of an item payload against its collection schema, as {field: message}"""
+    if not isinstance(data, dict):
+        return {'non_field_errors': 'Data must be an object.'}
+    fields = (schema or {}).get('fields') or {}
+    if not fields:
+        return {}
+    errors = {}
+    for name, spec in fields.items():
+        value = data.get(name)
+        if value is None or value == '':
+            if spec.get('required'):
+                errors[name] = 'This field is required.'
+            continue
+        error = _check_value(spec['type'], value, spec)
+        if error:
+            errors[name] = error
+    if not (schema or {}).get('additional', False):
+        for name in data:
+            if name not in fields:
+                errors[name] = 'Not defined in the collection schema.'
+    return errors
+
+
+def cache_key(slug):
+    return f'{content_version()}:{slug}'
+
+
+def item_row(row):
+    """Flatten an item into the shape the sections read: payload fields plus the item columns"""
+    return {**row['data'], 'id': str(row['id']), 'display_order': row['display_order'],
+            'updated_at': row['updated_at'].isoformat()}
+
+
+def collection_payload(slug):
+    """Active items of an active collection in display order, or None if there is no such collection"""
+    return _payloads.get_or_set(slug, lambda: shared_payload(slug), PAYLOAD_DEPENDENCIES)
+
+
+def shared_payload(slug):
+    """The payload from the shared cache, served stale while it is rebuilt (core.swr)"""
+    return swr.get_or_refresh('content', cache_key(slug), lambda: build_payload(slug),
+                              ttl=settings.CONTENT_CACHE_SECONDS)
+
+
+def build_payload(slug):
+    rows = list(
+        ContentItem.objects
+        .filter(collection__slug=slug, collection__is_active=True, is_active=True)
+        .order_by('display_order', 'created_at')
+        .values(*ITEM_FIELDS, 'collection__name', 'collection__updated_at')
+    )
+    if rows:
+        payload = {
+            'slug': slug,
+            'name': rows[0]['collection__name'],
+            'updated_at': max(
+                [rows[0]['collection__updated_at']] + [row['updated_at'] for row in rows]
+            ).isoformat(),
+            'count': len(rows),
+            'items': [item_row(row) for row in rows],
+        }
+    else:
+        # An empty section needs the collection row to tell it apart from a 404
+        collection = ContentCollection.objects.filter(slug=slug, is_active=True).values('name', 'updated_at').first()
+        if collection is None:
+            return None
+        payload = {
+            'slug': slug, 'name': collection['name'], 'updated_at': collection['updated_at'].isoformat(),
+            'count': 0, 'items': [],
+        }
+    return payload
+
+
+def invalidate(slug):
+    """Drop the shared payload of slug once the current transaction commits"""
+    # Deleted any earlier, a concurrent request could rebuild it from the uncommitted state
+    transaction.on_commit(lambda: swr.delete('content', cache_key(slug)))
+
+
+def _schema(*specs, additional=False):
+    """Build a schema from 'name', 'name:type' and 'name!' (required) specs"""
+    fields = {}
+    for spec in specs:
+        name, _, field_type = spec.partition(':')
+        required = name.endswith('!') or field_type.endswith('!')
+        name, field_type = name.rstrip('!'), (field_type.rstrip('!') or 'string')
+        field = {'type': field_type}
+        if field_type.startswith('list'):
+            field = {'type': 'list', 'items': field_type[5:] or 'string'}
+        if required:
+            field['required'] = True
+        fields[name] = field
+    return {'fields': fields, 'additional': additional}
+
+
+# Built-in collections, one per Supabase table still read by the frontend;
+# sync_content_collections creates them and import_content loads table exports.
+COLLECTIONS = {
+    'about-pages': ('About Pages', _schema(
+        'page_type!', 'title!', 'content:text', 'image_url:url', 'meta_description:text',
+    )),
+    'publications': ('Publications', _schema(
+        'title!', 'publication_type!', 'description:text', 'author', 'department', 'issue_number',
+        'publication_date:date', 'cover_image_url:url', 'file_url:url', 'download_count:integer',
+        'is_featured:boolean',
+    )),
+    'wellness-programs': ('Wellness Programs', _schema(
+        'name!', 'program_type!', 'description:text', 'instructor', 'schedule', 'location',
+        'duration_minutes:integer', 'max_participants:integer', 'fee:number', 'registration_required:boolean',
+        'image_url:url',
+    )),
+    'student-governance': ('Student Governance', _schema(
+        'student_name!', 'position!', 'department', 'year:integer', 'bio:text', 'contact_email:email',
+        'photo_url:url', 'responsibilities:list', 'term_start:date', 'term_end:date',
+    )),
+    'women-forum-events': ('Women Forum Events', _schema(
+        'title!', 'event_type!', 'description:text', 'event_date:date', 'venue', 'speaker_name',
+        'speaker_designation', 'max_participants:integer', 'registration_link:url', 'image_url:url',
+        'gallery_images:list:url', 'achievements:list', 'is_featured:boolean',
+    )),
+    'social-initiatives': ('Social Initiatives', _schema(
+        'title!', 'category!', 'status!', 'description:text', 'organizer', 'start_date:date', 'end_date:date',
+        'participants_count:integer', 'impact_metrics:text', 'image_url:url', 'gallery_images:list:url',
+        'is_featured:boolean',
+    )),
+    'incubation-centers': ('Incubation Centers', _schema(
+        'name!', 'center_type!', 'description:text', 'establishment_date:date', 'current_startups:integer',
+        'grant_amount:number', 'grant_currency', 'total_funding_raised:number', 'features:list',
+        'success_stories:list', 'website_url:url', 'logo_url:url', 'image_url:url', 'gallery_images:list:url',
+    )),
+    'campus-pages': ('Campus Pages', _schema(
+        'slug!', 'title!', 'content:text', 'hero_image_url:url', 'meta_description:text',
+    )),
+    'photo-galleries': ('Photo Galleries', _schema(
+        'title!', 'category!', 'image_url:url!', 'subcategory', 'description:text', 'caption:text', 'alt_text',
+        'photographer', 'photo_date:date', 'is_featured:boolean',
+    )),
+    'awards-achievements': ('Awards & Achievements', _schema(
+        'title!', 'category!', 'description:text', 'award_date:date', 'image_url:url', 'certificate_url:url',
+    )),
+    'leadership-messages': ('Leadership Messages', _schema(
+        'name!', 'position!', 'message:text!', 'designation', 'qualifications:text', 'photo_url:url',
+    )),
+    'student-activities': ('Student Activities', _schema(
+        'name!', 'category!', 'description:text', 'coordinator_name', 'coordinator_email:email', 'location',
+        'meeting_schedule', 'member_count:integer', 'achievements:list', 'image_url:url',
+    )),
+    'campus-life': ('Campus Life', _schema(
+        'page_slug!', 'title!', 'content:text', 'meta_description:text', 'hero_image_url:url', 'features:list',
+        'highlights:list', 'gallery_images:list:url',
+    )),
+    'amenities': ('Amenities', _schema(
+        'name!', 'category!', 'description:text', 'location', 'operating_hours', 'contact_person',
+        'contact_email:email', 'contact_phone', 'booking_required:boolean', 'features:list', 'image_url:url',
+    )),
+    'accreditation': ('Accreditation', _schema(
+        'title!', 'accreditation_type!', 'description:text', 'grade_rating', 'validity_period', 'benefits:text',
+        'certificate_url:url',
+    )),
+    'academic-pages': ('Academic Pages', _schema(
+        'slug!', 'title!', 'content:text', 'meta_description:text',
+    )),
+}
@@ -0,0 +1,53 @@
+"""
+Change events for the SSE stream (core.sse).
+
+core.signals calls publish() when a notice, news item, campus event or student
+submission is saved or deleted. The event goes out with PostgreSQL
+pg_notify() on the write's own connection, so it is delivered when the
+transaction commits and never for a rolled back write; every process serving
+the stream LISTENs and fans it out to its clients.
+
+Events are small and carry ids, not rows (a NOTIFY payload is limited to
+8000 bytes and unpublished content must not leak to the public stream):
+
+    {"type": "submission.reviewed", "id": "<uuid>", "at": "<ISO time>", "status": "approved"}
+
+Types are <family>.created / .updated / .deleted, plus submission.reviewed
+when a submission leaves pending. Clients fetch the row, or run a delta sync
+with ?updated_since= (core.sync) from the last event's "at".
+Submission events are only sent to the submitting student and to admins.
+"""
+import json
+
+from django.db import connection
+from django.utils import timezone
+
+CHANNEL = 'core_events'
+# Event family per model, also what ?types= filters on
+FAMILIES = {
+    'core.notice': 'notice',
+    'core.news': 'news',
+    'core.campusevent': 'campus_event',
+    'core.studentsubmission': 'submission',
+}
+# Families whose events only go to the row's owner ("user") and admins
+PRIVATE_FAMILIES = {'submission'}
+
+
+def event_payload(instance, action):
+    family = FAMILIES[instance._meta.label_lower]
+    payload = {'type': f'{family}.{action}', 'id': str(instance.pk), 'at': timezone.now().isoformat()}
+    if family == 'submission':
+        payload['user'] = instance.user_id
+        payload['status'] = instance.status
+        # Set by StudentSubmission.save() on updates
+        previous = getattr(instance, '_previous_status', None)
+        if action == 'updated' and previous == 'pending' and instance.status != 'pending':
+            payload['type'] = 'submission.reviewed'
+    return payload
+
+
+def publish(instance, action):
+    """NOTIFY listeners of a change; delivered on commit of the current transaction"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, json.dumps(event_payload(instance, action))])
@@ -0,0 +1,148 @@
+"""
+Sparse fieldsets and field expansion for the core API.
+
+GET requests may pass:
+    ?fields=id,title,image_url   only return these fields
+    ?omit=content,gallery_images drop these fields
+    ?expand=club                 replace a foreign key id with the nested object
+
+DynamicFieldsMixin applies the selection to the top-level serializer (nested
+serializers are left alone) and SparseFieldsetViewMixin narrows the SQL to
+match: model columns that no remaining field needs are deferred, prefetches
+for dropped relations are skipped and expanded foreign keys are joined.
+"""
+import sys
+
+from django.db.models import ForeignKey
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_list(request, param):
+    """Return the set of names in a comma-separated query param"""
+    value = request.query_params.get(param, '')
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_field_selection(request):
+    """Return (fields, omit, expand) requested for a safe request, else empty sets"""
+    if request is None or request.method not in SAFE_METHODS or not hasattr(request, 'query_params'):
+        return set(), set(), set()
+    return (
+        parse_field_list(request, 'fields'),
+        parse_field_list(request, 'omit'),
+        parse_field_list(request, 'expand'),
+    )
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that honours ?fields=, ?omit= and ?expand=.
+
+    field_dependencies maps read-only fields that are not plain model fields
+    (SerializerMethodFields, properties) to the model columns they read, so the
+    view can defer everything else without triggering per-row queries.
+    expandable_fields maps a field name to the name of a serializer class in the
+    same module that replaces it when the field is listed in ?expand=.
+    """
+    field_dependencies = {}
+    expandable_fields = {}
+
+    def _is_top_level(self):
+        if self.parent is None:
+            return True
+        return isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_top_level():
+            return fields
+
+        selected, omitted, expanded = get_field_selection(self.context.get('request'))
+        for name in expanded:
+            if name in self.expandable_fields:
+                serializer_class = getattr(sys.modules[type(self).__module__], self.expandable_fields[name])
+                fields[name] = serializer_class(read_only=True)
+
+        if selected:
+            keep = selected | expanded
+            fields = {name: field for name, field in fields.items() if name in keep or field.write_only}
+        for name in omitted:
+            fields.pop(name, None)
+        return fields
+
+    def get_required_columns(self):
+        """
+        Names of model fields needed to render the current field set, or None
+        if that cannot be determined (then nothing is deferred).
+        """
+        model_fields = {field.name for field in self.Meta.model._meta.get_fields()}
+        required = set()
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in self.field_dependencies:
+                required.update(self.field_dependencies[name])
+                continue
+            root = field.source.split('.')[0]
+            if root not in model_fields:
+                # Method field or model property without declared dependencies
+                return None
+            required.add(root)
+        return required
+
+
+def narrow_queryset(queryset, serializer):
+    """Defer unused columns and skip unused prefetches for the serializer's field set"""
+    if not isinstance(serializer, DynamicFieldsMixin):
+        return queryset
+
+    request = serializer.context.get('request')
+    selected, omitted, expanded = get_field_selection(request)
+    if not (selected or omitted or expanded):
+        return queryset
+
+    model = queryset.model
+    kept = set(serializer.fields)
+
+    # Join expanded forward foreign keys instead of querying them per row
+    for name in expanded & kept:
+        if name in serializer.expandable_fields:
+            field = model._meta.get_field(name)
+            if isinstance(field, ForeignKey):
+                queryset = queryset.select_related(name)
+
+    # Drop prefetches of relations that are no longer rendered
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        kept_lookups = [
+            lookup for lookup in lookups
+            if not isinstance(lookup, str) or lookup.split('__')[0] in kept
+        ]
+        if len(kept_lookups) != len(lookups):
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept_lookups)
+
+    required = serializer.get_required_columns()
+    if required is None:
+        return queryset
+
+    select_related = queryset.query.select_related
+    joined = set(select_related) if isinstance(select_related, dict) else set()
+    deferred = [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key
+        and field.name not in required
+        and field.name not in joined
+        and not (select_related is True and field.is_relation)
+    ]
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
+
+
+class SparseFieldsetViewMixin:
+    """ViewSet mixin that narrows list/retrieve querysets to the requested fields"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return narrow_queryset(queryset, self.get_serializer())
@@ -0,0 +1,176 @@
+"""
+HTTP caching headers for the core API.
+
+Each core viewset declares how its responses may be cached:
+
+    class DepartmentViewSet(...):
+        cache_policy = REFERENCE
+
+and function views use @cache_policy(CONTENT). HttpCachePolicyMiddleware
+turns the policy into headers:
+    - an anonymous GET/HEAD answered with 200 by a public policy gets
+      "public, max-age=…, s-maxage=…, stale-while-revalidate=…"; browsers keep
+      it for max-age, shared caches (nginx, a CDN) for s-maxage
+    - everything else (authenticated requests, PRIVATE policies, writes,
+      errors, core viewsets without a policy) gets "private, no-store"
+    - every response of a view with a policy carries
+      Vary: Accept, Authorization, Origin (JSON vs the browsable API, a
+      token's own view of the data, CORS headers)
+A view that sets Cache-Control itself is left alone.
+
+Public responses are tagged with the model labels they are built from (the
+viewset's model plus the policy's tags, and the content version label) in
+HTTP_CACHE_TAG_HEADER. With HTTP_CACHE_PURGE_URL set, every change published
+on the invalidation bus (core.invalidation) also sends
+PURGE <HTTP_CACHE_PURGE_URL> with the changed labels in that header, so a
+shared cache drops the responses long before s-maxage; bump_content_version()
+purges every public response.
+"""
+import logging
+import queue
+import threading
+import urllib.request
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .cache import CONTENT_VERSION_LABEL
+from .idempotency import is_core_viewset
+
+logger = logging.getLogger(__name__)
+
+VARY_HEADERS = ('Accept', 'Authorization', 'Origin')
+SAFE_METHODS = ('GET', 'HEAD')
+PURGE_TIMEOUT_SECONDS = 5
+PURGE_BATCH_SECONDS = 0.5
+
+
+class CachePolicy:
+    """How long anonymous responses may be reused, or private=True for never"""
+
+    def __init__(self, max_age=0, s_maxage=None, stale_while_revalidate=0, private=False, tags=()):
+        self.max_age = max_age
+        self.s_maxage = max_age if s_maxage is None else s_maxage
+        self.stale_while_revalidate = stale_while_revalidate
+        self.private = private
+        self.tags = tuple(tags)
+
+    def with_tags(self, *tags):
+        return CachePolicy(self.max_age, self.s_maxage, self.stale_while_revalidate, self.private, self.tags + tags)
+
+    def directives(self):
+        if self.private:
+            return {'private': True, 'no_store': True}
+        directives = {'public': True, 'max_age': self.max_age, 's_maxage': self.s_maxage}
+        if self.stale_while_revalidate:
+            directives['stale_while_revalidate'] = self.stale_while_revalidate
+        return directives
+
+
+# Admin and per-user data
+PRIVATE = CachePolicy(private=True)
+# Catalogue data that changes a few times a week: departments, fees, contacts, ...
+REFERENCE = CachePolicy(max_age=300, s_maxage=3600, stale_while_revalidate=86400)
+# News, notices, events and homepage content
+CONTENT = CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=600)
+
+
+def cache_policy(policy):
+    """Declare the policy of a function view; apply it outside @api_view"""
+    def decorator(view):
+        view.cache_policy = policy
+        return view
+    return decorator
+
+
+def view_policy(view_func):
+    """(policy, tags) for a resolved view, or (None, ()) for views outside this layer"""
+    policy = getattr(view_func, 'cache_policy', None)
+    cls = getattr(view_func, 'cls', None)
+    if policy is None and cls is not None:
+        policy = getattr(cls, 'cache_policy', None)
+        if policy is None and is_core_viewset(view_func):
+            policy = PRIVATE
+    if policy is None:
+        return None, ()
+    tags = list(policy.tags)
+    queryset = getattr(cls, 'queryset', None)
+    if queryset is not None:
+        tags.insert(0, queryset.model._meta.label_lower)
+    return policy, tuple(dict.fromkeys([*tags, CONTENT_VERSION_LABEL]))
+
+
+def is_anonymous(request):
+    user = getattr(request, 'user', None)
+    return not request.META.get('HTTP_AUTHORIZATION') and not (user is not None and user.is_authenticated)
+
+
+class HttpCachePolicyMiddleware:
+    """Cache-Control, Vary and cache tags from the view's CachePolicy"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        policy, tags = getattr(request, '_cache_policy', (None, ()))
+        if policy is None:
+            return response
+        patch_vary_headers(response, VARY_HEADERS)
+        if response.has_header('Cache-Control'):
+            return response
+        public = (
+            not policy.private and request.method in SAFE_METHODS and response.status_code == 200
+            and is_anonymous(request)
+        )
+        patch_cache_control(response, **(policy if public else PRIVATE).directives())
+        if public:
+            response[settings.HTTP_CACHE_TAG_HEADER] = ' '.join(tags)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._cache_policy = view_policy(view_func)
+
+
+class Purger:
+    """Sends PURGE requests for changed labels from a background thread, a batch at a time"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def purge(self, label):
+        if not settings.HTTP_CACHE_PURGE_URL:
+            return
+        self._queue.put(label)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='http-cache-purge', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            labels = {self._queue.get()}
+            # Writes come in bursts; one request covers the burst
+            try:
+                while True:
+                    labels.add(self._queue.get(timeout=PURGE_BATCH_SECONDS))
+            except queue.Empty:
+                pass
+            self._send(sorted(labels))
+
+    def _send(self, labels):
+        request = urllib.request.Request(
+            settings.HTTP_CACHE_PURGE_URL, method='PURGE',
+            headers={settings.HTTP_CACHE_TAG_HEADER: ' '.join(labels)},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=PURGE_TIMEOUT_SECONDS):
+                pass
+        except OSError:
+            # Shared caches still drop the responses after s-maxage
+            logger.warning('Purging %s from the HTTP cache failed', ', '.join(labels), exc_info=True)
+
+
+purger = Purger()
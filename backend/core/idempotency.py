@@ -0,0 +1,167 @@
+"""
+Idempotency-Key support for writes to the core API.
+
+A POST/PUT/PATCH/DELETE to a core viewset that carries an Idempotency-Key
+header runs at most once per user and key within IDEMPOTENCY_TTL:
+    - the first request runs normally and a successful (2xx) response is
+      stored in the cache together with a fingerprint of the request
+    - a repeat with the same fingerprint gets the stored response back
+      (marked Idempotent-Replayed: true) before the body is parsed, so a
+      retried multi-megabyte upload is not processed again
+    - a repeat with a different fingerprint is rejected with 422
+    - a duplicate that arrives while the first is still running waits on a
+      PostgreSQL advisory lock (shared by all workers and hosts) for up to
+      IDEMPOTENCY_LOCK_WAIT seconds, then gets the stored response; if the
+      first is still running after that it gets 409 with Retry-After, so a
+      slow upload does not keep its retries parked on sync workers
+Error responses are not stored, so a retry after a 401 or a validation error
+runs again.
+
+The fingerprint covers method, path, query string, user and, except for
+multipart bodies, a hash of the body. Browsers pick a new multipart boundary
+each time a FormData body is sent, so uploads are matched on everything but
+their bytes.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+from rest_framework.viewsets import ViewSetMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .metrics import record_cache
+
+IDEMPOTENT_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+# Response headers replayed along with the body
+REPLAYED_HEADERS = ('Content-Type', 'Location')
+LOCK_POLL_SECONDS = 0.05
+
+
+def request_scope(request):
+    """User id from the bearer token, 'anon' without one, None for a token the view will reject"""
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    if result is None:
+        return 'anon'
+    return str(result[0].pk)
+
+
+def fingerprint(request, scope):
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.META.get('QUERY_STRING', ''), scope):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    content_type = request.META.get('CONTENT_TYPE', '')
+    if not content_type.startswith('multipart/'):
+        digest.update(request.body)
+    return digest.hexdigest()
+
+
+def lock_id(key):
+    """Signed 64-bit advisory lock id for a cache key"""
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big', signed=True)
+
+
+def acquire_lock(lock, wait):
+    deadline = time.monotonic() + wait
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [lock])
+            if cursor.fetchone()[0]:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+def release_lock(lock):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(%s)', [lock])
+
+
+def replay(stored):
+    response = HttpResponse(stored['content'], status=stored['status'])
+    for name, value in stored['headers'].items():
+        response[name] = value
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def is_core_viewset(view_func):
+    cls = getattr(view_func, 'cls', None)
+    return cls is not None and issubclass(cls, ViewSetMixin) and cls.__module__ == 'core.views'
+
+
+class IdempotencyMiddleware:
+    """Replay stored responses for repeated Idempotency-Keys on core viewset writes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+            pending = getattr(request, '_idempotency', None)
+            if pending is not None:
+                # Stored before the lock is released so a waiting duplicate finds it
+                self.store(pending, response)
+        finally:
+            pending = getattr(request, '_idempotency', None)
+            if pending is not None:
+                release_lock(pending['lock'])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        key = request.META.get(HEADER)
+        if not key or request.method not in IDEMPOTENT_METHODS or not is_core_viewset(view_func):
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse(
+                {'error': f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters'}, status=400,
+            )
+        scope = request_scope(request)
+        if scope is None:
+            return None
+
+        cache_key = f"idempotency:{scope}:{hashlib.sha256(key.encode()).hexdigest()}"
+        request_fingerprint = fingerprint(request, scope)
+        lock = lock_id(cache_key)
+        if not acquire_lock(lock, settings.IDEMPOTENCY_LOCK_WAIT):
+            response = JsonResponse(
+                {'error': 'A request with this Idempotency-Key is still being processed'}, status=409,
+            )
+            response['Retry-After'] = '1'
+            return response
+
+        stored = cache.get(cache_key)
+        record_cache('idempotency', stored is not None)
+        if stored is None:
+            # Held until the view has run and its response is stored
+            request._idempotency = {'key': cache_key, 'fingerprint': request_fingerprint, 'lock': lock}
+            return None
+        release_lock(lock)
+        if stored['fingerprint'] != request_fingerprint:
+            return JsonResponse(
+                {'error': 'This Idempotency-Key was already used for a different request'}, status=422,
+            )
+        return replay(stored)
+
+    def store(self, pending, response):
+        if not 200 <= response.status_code < 300 or response.streaming:
+            return
+        if len(response.content) > settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+            return
+        cache.set(pending['key'], {
+            'fingerprint': pending['fingerprint'],
+            'status': response.status_code,
+            'headers': {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)},
+            'content': response.content,
+        }, settings.IDEMPOTENCY_TTL)
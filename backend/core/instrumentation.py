@@ -0,0 +1,261 @@
+"""
+Per-request query instrumentation.
+
+QueryInstrumentationMiddleware wraps the database cursor with
+connection.execute_wrapper and records, for every request:
+    - query count and total SQL time
+    - query fingerprints (SQL with IN lists collapsed); a fingerprint that
+      repeats is the usual sign of an N+1
+    - serializer time (views that use timed_data / InstrumentedViewMixin, and
+      the compiled read path)
+    - render time
+and exposes them as a Server-Timing header. Each process also keeps a rolling
+aggregate per view/action that admins can read at /api/_metrics/.
+
+QUERY_BUDGETS sets limits per view ('NewsViewSet.list' or 'NewsViewSet') with
+'DEFAULT' as the fallback; a request that exceeds its budget is logged as a
+warning on the core.instrumentation logger:
+    QUERY_BUDGETS = {
+        'DEFAULT': {'queries': 20, 'db_ms': 200, 'duplicates': 5},
+        'DepartmentViewSet.list': {'queries': 5},
+    }
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+current_metrics = ContextVar('current_request_metrics', default=None)
+
+IN_LIST_RE = re.compile(r'%s(?:, %s)+')
+# Rolling window of requests kept per view for the percentiles
+WINDOW_SIZE = 500
+
+
+def fingerprint(sql):
+    """Normalize SQL so queries differing only in parameters/IN list length match"""
+    return IN_LIST_RE.sub('%s, ...', sql)
+
+
+class RequestMetrics:
+    """Counters for a single request, filled in by the execute wrapper"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """Highest number of times a single query fingerprint ran"""
+        return max(self.fingerprints.values(), default=0)
+
+    def server_timing(self, total):
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_time * 1000:.1f}',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        return ', '.join(parts)
+
+
+def timed_data(serializer):
+    """Return serializer.data, adding the time it took to the request's metrics"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return serializer.data
+    started = time.perf_counter()
+    data = serializer.data
+    metrics.serialize_time += time.perf_counter() - started
+    return data
+
+
+def timed_render(plan, rows, context):
+    """ReadPlan.render, adding the time it took to the request's serializer time"""
+    metrics = current_metrics.get()
+    started = time.perf_counter()
+    data = plan.render(rows, context)
+    if metrics is not None:
+        metrics.serialize_time += time.perf_counter() - started
+    return data
+
+
+class InstrumentedViewMixin:
+    """ViewSet mixin whose list/retrieve record serializer time"""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(timed_data(serializer))
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(timed_data(serializer))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(timed_data(serializer))
+
+
+class EndpointStats:
+    """Rolling aggregate for one view/action"""
+
+    def __init__(self):
+        self.requests = 0
+        self.over_budget = 0
+        self.samples = deque(maxlen=WINDOW_SIZE)  # (total_ms, db_ms, queries, serialize_ms)
+        self.repeated_queries = Counter()
+
+    def add(self, total, metrics, over_budget):
+        self.requests += 1
+        self.over_budget += over_budget
+        self.samples.append((total * 1000, metrics.db_time * 1000, metrics.queries, metrics.serialize_time * 1000))
+        for sql, count in metrics.fingerprints.items():
+            if count > 1:
+                self.repeated_queries[sql] = max(self.repeated_queries[sql], count)
+
+    def summary(self):
+        totals = sorted(sample[0] for sample in self.samples)
+        n = len(self.samples)
+
+        def average(index):
+            return round(sum(sample[index] for sample in self.samples) / n, 2) if n else 0
+
+        return {
+            'requests': self.requests,
+            'over_budget': self.over_budget,
+            'window': n,
+            'p50_ms': round(totals[n // 2], 2) if n else 0,
+            'p95_ms': round(totals[min(n - 1, int(n * 0.95))], 2) if n else 0,
+            'avg_db_ms': average(1),
+            'avg_queries': average(2),
+            'avg_serialize_ms': average(3),
+            'repeated_queries': [
+                {'sql': sql[:500], 'max_per_request': count}
+                for sql, count in self.repeated_queries.most_common(5)
+            ],
+        }
+
+
+class MetricsRegistry:
+    """Per-process aggregates keyed by view/action"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, total, metrics, over_budget):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.add(total, metrics, over_budget)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: stats.summary() for key, stats in sorted(self._stats.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+registry = MetricsRegistry()
+
+
+def view_key(request, view_func):
+    """'NewsViewSet.list' for viewsets, 'users_list_view.get' for function views"""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{cls.__name__}.{action}'
+
+
+def get_budget(key):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(key) or budgets.get(key.split('.')[0]) or budgets.get('DEFAULT') or {}
+
+
+def check_budget(key, metrics):
+    """Log a warning for every budget the request exceeded; return True if any"""
+    budget = get_budget(key)
+    exceeded = []
+    if 'queries' in budget and metrics.queries > budget['queries']:
+        exceeded.append(f"{metrics.queries} queries > {budget['queries']}")
+    if 'db_ms' in budget and metrics.db_time * 1000 > budget['db_ms']:
+        exceeded.append(f"{metrics.db_time * 1000:.1f} ms SQL > {budget['db_ms']} ms")
+    if 'duplicates' in budget and metrics.duplicates > budget['duplicates']:
+        sql = metrics.fingerprints.most_common(1)[0][0]
+        exceeded.append(f"query repeated {metrics.duplicates} times > {budget['duplicates']} (possible N+1): {sql[:200]}")
+    if exceeded:
+        logger.warning('%s over query budget: %s', key, '; '.join(exceeded))
+    return bool(exceeded)
+
+
+class QueryInstrumentationMiddleware:
+    """Record per-request query metrics, set Server-Timing and feed the aggregate"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        # Read by outer middleware (core.metrics) after the response is built
+        request._query_metrics = metrics
+        token = current_metrics.set(metrics)
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        total = time.perf_counter() - metrics.started
+        key = getattr(request, '_instrumentation_key', None)
+        if key is not None:
+            over_budget = check_budget(key, metrics)
+            registry.record(key, total, metrics, over_budget)
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = metrics.server_timing(total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation_key = view_key(request, view_func)
+
+    def process_template_response(self, request, response):
+        # Django renders DRF responses right after this hook returns
+        metrics = current_metrics.get()
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                metrics.render_time = time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,259 @@
+"""
+Per-worker (L1) caches kept coherent across workers and nodes.
+
+An L1Cache holds computed values in the worker's memory, in front of the
+shared cache. Each entry names what it was built from, as model labels
+('core.contentitem') or (label, pk) pairs, and is dropped when one of those
+changes anywhere:
+
+    payloads = L1Cache('content')
+    payloads.get_or_set(key, build, depends_on=['core.contentitem', 'core.contentcollection'])
+
+Invalidation bus:
+    - post_save/post_delete of every core, authentication and auth.User
+      model (core.signals) evicts matching entries in this process right
+      away and, after the transaction commits, bumps the model's version in
+      the shared cache and sends (model, pk, version) with NOTIFY on
+      CHANNEL
+    - each worker runs a daemon thread that LISTENs and evicts on every
+      notification, its own included
+    - version stamps cover missed notifications (listener down, NOTIFY lost
+      with a crash after commit): entries remember the versions of their
+      models when they were built, and at most every L1_VERSION_CHECK_SECONDS
+      one get_many of the current versions drops entries built from an older
+      one. When the listener reconnects every L1 is cleared.
+Writes that bypass model signals (QuerySet.update(), raw SQL) must call
+publish() themselves. Published labels are also purged from shared HTTP
+caches (core.httpcache).
+
+L1_MAX_ENTRIES bounds each cache (least recently used entries go first) and
+L1_TTL bounds the age of any entry.
+"""
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import psycopg2
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'cache_invalidation'
+VERSION_KEY = 'l1-version:{}'
+RECONNECT_SECONDS = 2
+POLL_SECONDS = 5
+_MISSING = object()
+
+_caches = []
+
+
+def version_keys(labels):
+    return {label: VERSION_KEY.format(label) for label in labels}
+
+
+def current_versions(labels):
+    """Shared version of each label (0 before its first change)"""
+    keys = version_keys(labels)
+    stored = cache.get_many(list(keys.values()))
+    return {label: stored.get(key, 0) for label, key in keys.items()}
+
+
+def bump_version(label):
+    key = VERSION_KEY.format(label)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        return cache.get(key, 1)
+
+
+def normalize(depends_on):
+    """Labels as given, (label, pk) pairs with the pk as a string"""
+    return tuple(dep if isinstance(dep, str) else (dep[0], str(dep[1])) for dep in depends_on)
+
+
+def labels_of(depends_on):
+    return {dep if isinstance(dep, str) else dep[0] for dep in depends_on}
+
+
+class L1Cache:
+    """A bounded in-process cache whose entries are evicted through the invalidation bus"""
+
+    def __init__(self, name):
+        self.name = name
+        self._entries = OrderedDict()  # key -> (value, depends_on, versions, stored_at)
+        self._dependents = defaultdict(set)  # label or (label, pk) -> keys
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        _caches.append(self)
+
+    def get(self, key, default=None):
+        listener.ensure_running()
+        self._check_versions()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[3] > settings.L1_TTL:
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_cache(f'l1:{self.name}', entry is not None)
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, depends_on, versions=None):
+        depends_on = normalize(depends_on)
+        versions = versions if versions is not None else current_versions(labels_of(depends_on))
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, tuple(depends_on), versions, time.monotonic())
+            for dep in depends_on:
+                self._dependents[dep].add(key)
+            while len(self._entries) > settings.L1_MAX_ENTRIES:
+                self._drop(next(iter(self._entries)))
+
+    def get_or_set(self, key, build, depends_on):
+        """Cached value, or build() stored under the versions read before building; None is not cached"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # Read first: a change that lands while building leaves the entry stale-stamped
+        versions = current_versions(labels_of(normalize(depends_on)))
+        value = build()
+        if value is not None:
+            self.set(key, value, depends_on, versions)
+        return value
+
+    def evict(self, label, pk=None):
+        with self._lock:
+            keys = set(self._dependents.get(label, ()))
+            if pk is not None:
+                keys |= self._dependents.get((label, str(pk)), set())
+            for key in keys:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dependents.clear()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for dep in entry[1]:
+            keys = self._dependents.get(dep)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dep]
+
+    def _check_versions(self):
+        """Version-stamp fallback: drop entries built from a version that has since moved on"""
+        now = time.monotonic()
+        if now - self._checked_at < settings.L1_VERSION_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        with self._lock:
+            stamps = {key: entry[2] for key, entry in self._entries.items()}
+        if not stamps:
+            return
+        latest = current_versions({label for versions in stamps.values() for label in versions})
+        with self._lock:
+            for key, versions in stamps.items():
+                entry = self._entries.get(key)
+                # Skip entries replaced since the snapshot
+                if entry is not None and entry[2] is versions and any(
+                    latest[label] != version for label, version in versions.items()
+                ):
+                    self._drop(key)
+
+
+def evict_local(label, pk=None):
+    for l1 in _caches:
+        l1.evict(label, pk)
+
+
+def publish(label, pk=None):
+    """Evict here now and everywhere once the current transaction commits"""
+    evict_local(label, pk)
+
+    def notify():
+        # Imported here: core.httpcache depends on core.cache, which publishes through this module
+        from .httpcache import purger
+
+        purger.purge(label)
+        version = bump_version(label)
+        payload = json.dumps({'model': label, 'pk': None if pk is None else str(pk), 'version': version})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+    transaction.on_commit(notify)
+
+
+class Listener:
+    """The worker's LISTEN thread; started on first use and again after a fork"""
+
+    def __init__(self):
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_running(self):
+        if self._pid == os.getpid() or not settings.L1_INVALIDATION_LISTENER:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            # Entries inherited from the parent missed everything since the fork
+            for l1 in _caches:
+                l1.clear()
+            threading.Thread(target=self._run, name='l1-invalidation', daemon=True).start()
+
+    def _open(self):
+        listen = psycopg2.connect(**connections['default'].get_connection_params())
+        listen.set_session(autocommit=True)
+        with listen.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        return listen
+
+    def _run(self):
+        while True:
+            try:
+                listen = self._open()
+            except psycopg2.Error:
+                logger.exception('Cannot LISTEN for cache invalidations, retrying in %ss', RECONNECT_SECONDS)
+                time.sleep(RECONNECT_SECONDS)
+                continue
+            # Whatever changed while there was no listener is unknown
+            for l1 in _caches:
+                l1.clear()
+            try:
+                self._listen(listen)
+            except psycopg2.Error:
+                logger.warning('Lost the cache invalidation listener, reconnecting')
+            finally:
+                listen.close()
+
+    def _listen(self, listen):
+        while True:
+            if select.select([listen], [], [], POLL_SECONDS) == ([], [], []):
+                continue
+            listen.poll()
+            while listen.notifies:
+                notify = listen.notifies.pop(0)
+                try:
+                    message = json.loads(notify.payload)
+                except ValueError:
+                    continue
+                evict_local(message['model'], message.get('pk'))
+
+
+listener = Listener()
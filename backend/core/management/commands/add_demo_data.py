@@ -58,6 +58,11 @@ class Command(BaseCommand):
         ]
         
         for i, color in enumerate(colors, 1):
+            filename = f'demo_hero_{i}.jpg'
+            # Re-running would otherwise store a renamed copy every time
+            if default_storage.exists(f'hero_images/{filename}'):
+                continue
+
             # Create a simple colored rectangle image
             img = Image.new('RGB', (800, 400), color)
             
@@ -67,7 +72,6 @@ class Command(BaseCommand):
             img_io.seek(0)
             
             # Save to media folder
-            filename = f'demo_hero_{i}.jpg'
             default_storage.save(f'hero_images/{filename}', ContentFile(img_io.read()))
             
             self.stdout.write(f'Created demo image: {filename}')
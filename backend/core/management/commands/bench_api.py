@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.benchmarks import baseline, endpoints, loadgen
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test every GET endpoint of the core router and the auth app against a running server, '
+        'record throughput, p50/p95/p99 and queries per request to a JSON baseline and compare runs. '
+        'Start the server first (e.g. gunicorn -c gunicorn.conf.py college_website.wsgi) with '
+        'QUERY_INSTRUMENTATION on so query counts can be read from Server-Timing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help='Base URL of the server under test')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent connections per endpoint')
+        parser.add_argument('--warmup', type=int, default=10, help='Unrecorded requests per endpoint first')
+        parser.add_argument('--only', default='', help='Comma-separated substrings; run only matching endpoints')
+        parser.add_argument('--seed', action='store_true', help='Run populate_data --bench before the run')
+        parser.add_argument('--output', help='Write the results to this JSON baseline file')
+        parser.add_argument('--compare', metavar='BASELINE', help='Flag regressions against this baseline file')
+        parser.add_argument('--results', metavar='RESULTS',
+                            help='With --compare: compare this results file instead of running the benchmark')
+        parser.add_argument('--tolerance', type=float, default=0.15,
+                            help='Allowed relative slowdown before a change counts as a regression')
+
+    def handle(self, *args, **options):
+        if options['results']:
+            if not options['compare']:
+                raise CommandError('--results only makes sense with --compare')
+            current = self.load(options['results'])
+        else:
+            if options['seed']:
+                call_command('populate_data', bench=True, stdout=self.stdout)
+            current = self.run(options)
+            if options['output']:
+                baseline.save(current, options['output'])
+                self.stdout.write(f"Baseline written to {options['output']}")
+
+        if options['compare']:
+            self.compare(self.load(options['compare']), current, options['tolerance'])
+
+    def load(self, path):
+        try:
+            return baseline.load(path)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+    def run(self, options):
+        selected = endpoints.discover()
+        if options['only']:
+            patterns = [p.strip() for p in options['only'].split(',') if p.strip()]
+            selected = [e for e in selected if any(p in e.name or p in e.path for p in patterns)]
+        token = str(RefreshToken.for_user(endpoints.admin_user()).access_token)
+        admin_headers = {'Authorization': f'Bearer {token}'}
+
+        self.stdout.write(
+            f"{'endpoint':<44} {'auth':<5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}"
+        )
+        results = {}
+        for endpoint in selected:
+            # Public where the anonymous request succeeds, otherwise as the benchmark admin
+            probe = loadgen.run(options['url'], endpoint.path, requests=1, concurrency=1)
+            if probe.errors and not probe.latencies:
+                raise CommandError(f'Cannot reach {options["url"]}; is the server running?')
+            auth = any(status in (401, 403) for status in probe.statuses)
+            headers = admin_headers if auth else {}
+            if auth:
+                probe = loadgen.run(options['url'], endpoint.path, headers, requests=1, concurrency=1)
+            if 400 in probe.statuses:
+                # Actions such as campus-events/by_club/ need query parameters
+                self.stdout.write(f'{endpoint.name:<44} skipped (400 without query parameters)')
+                continue
+
+            if options['warmup']:
+                loadgen.run(options['url'], endpoint.path, headers, options['warmup'], options['concurrency'])
+            summary = loadgen.run(
+                options['url'], endpoint.path, headers, options['requests'], options['concurrency']
+            ).summary()
+            summary.update(path=endpoint.path, auth=auth)
+            results[endpoint.name] = summary
+
+            queries = '-' if summary['queries'] is None else summary['queries']
+            line = (
+                f"{endpoint.name:<44} {'admin' if auth else 'anon':<5} {summary['throughput_rps']:>8.1f} "
+                f"{summary['p50_ms']:>8.1f} {summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f} "
+                f"{queries:>8} {summary['errors']:>7}"
+            )
+            self.stdout.write(self.style.ERROR(line) if summary['errors'] else line)
+
+        return baseline.build(results, {
+            'url': options['url'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'debug': settings.DEBUG,
+        })
+
+    def compare(self, old, new, tolerance):
+        regressions = baseline.compare(old, new, tolerance)
+        self.stdout.write(
+            f"Compared {new.get('commit') or 'current run'} against {old.get('commit') or 'baseline'} "
+            f'(tolerance {tolerance:.0%})'
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
+            return
+        for name, metric, before, after in regressions:
+            self.stdout.write(self.style.ERROR(f'REGRESSION  {name}: {metric} {before} -> {after}'))
+        raise CommandError(f'{len(regressions)} regressions against the baseline')
@@ -0,0 +1,108 @@
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from core.models import CampusEvent, Club
+from core.serializers import CampusEventSerializer
+from core.views import CampusEventViewSet
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the campus event calendar, .ics feed and upcoming endpoints against a large event table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=50000, help='Events to create for the run (rolled back)')
+        parser.add_argument('--iterations', type=int, default=20, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        with transaction.atomic():
+            if options['events']:
+                self.seed(options['events'])
+            self.run(options['iterations'])
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+    def run(self, iterations):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        factory = APIRequestFactory(SERVER_NAME=host)
+        today = timezone.localdate()
+        month_start = today.replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        week_start = today - timedelta(days=today.weekday())
+
+        scenarios = [
+            ('calendar month', 'calendar', f'from={month_start}&to={month_end}'),
+            ('calendar week', 'calendar', f'from={week_start}&to={week_start + timedelta(days=6)}'),
+            ('ics 90 days', 'calendar_ics', f'from={today}&to={today + timedelta(days=89)}'),
+            ('ics default year', 'calendar_ics', ''),
+            ('upcoming (page 1)', 'upcoming', ''),
+        ]
+        self.stdout.write(f"{'scenario':<24} {'bytes':>10} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, action, query in scenarios:
+            view = CampusEventViewSet.as_view({'get': action})
+            self.report(label, iterations, lambda: self.call(view, factory.get(f'/api/campus-events/?{query}')))
+
+        # The previous upcoming action: every future event, serialized in one response
+        def legacy_upcoming():
+            events = CampusEvent.objects.filter(is_active=True, start_date__gte=today).select_related('club')
+            return len(json.dumps(CampusEventSerializer(events.order_by('start_date'), many=True).data, default=str))
+        self.report('upcoming (before)', max(1, iterations // 5), legacy_upcoming)
+
+        plan = CampusEvent.objects.filter(is_active=True).overlapping(month_start, month_end).explain()
+        used = 'event_span_gist_idx' in plan
+        self.stdout.write((self.style.SUCCESS if used else self.style.ERROR)(
+            f"Month query {'uses' if used else 'does NOT use'} event_span_gist_idx"
+        ))
+        if self.verbosity >= 2:
+            self.stdout.write(plan)
+
+    def call(self, view, request):
+        response = view(request)
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        response.render()
+        return len(response.content)
+
+    def report(self, label, iterations, func):
+        timings = []
+        size = queries = 0
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                size = func()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = len(ctx.captured_queries)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f'{label:<24} {size:>10} {queries:>8} {statistics.median(timings):>8.1f} {p95:>8.1f}')
+
+    def seed(self, count):
+        """Events over three years; most last a day or a few, some festivals run for weeks"""
+        self.stdout.write(f'Seeding {count} events (rolled back after the run)...')
+        rng = random.Random(0)
+        today = timezone.localdate()
+        clubs = Club.objects.bulk_create([Club(name=f'Calendar Bench Club {i}', icon='Users') for i in range(20)])
+        event_types = [value for value, _ in CampusEvent.EVENT_TYPE_CHOICES]
+        events = []
+        for i in range(count):
+            start = today + timedelta(days=rng.randint(-730, 365))
+            length = rng.randint(8, 30) if rng.random() < 0.02 else rng.choice([0, 0, 0, 1, 2, 4])
+            events.append(CampusEvent(
+                title=f'Calendar bench event {i}', description='Calendar benchmark event, ' * 10,
+                event_type=event_types[i % len(event_types)], start_date=start,
+                end_date=start + timedelta(days=length) if length else None, venue='Main Auditorium',
+                club=clubs[i % len(clubs)], is_featured=i % 50 == 0, is_active=i % 20 != 0,
+            ))
+        CampusEvent.objects.bulk_create(events, batch_size=2000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {CampusEvent._meta.db_table}')
@@ -0,0 +1,110 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from core.models import Program, Department, DepartmentGalleryImage, News, Notice, Hostel, Timetable
+from core.views import DepartmentViewSet, NewsViewSet, NoticeViewSet, HostelViewSet, TimetableViewSet
+
+# (label, viewset, query params) for the main list endpoints, full vs. card-sized payloads
+SCENARIOS = [
+    ('news', NewsViewSet, ''),
+    ('news', NewsViewSet, 'omit=content'),
+    ('news', NewsViewSet, 'fields=id,title,description,category,image_url,published_date,is_featured'),
+    ('notices', NoticeViewSet, ''),
+    ('notices', NoticeViewSet, 'fields=id,title,category,priority,is_new,created_at'),
+    ('departments', DepartmentViewSet, ''),
+    ('departments', DepartmentViewSet, 'omit=gallery_images,mission,vision,facilities,achievements'),
+    ('departments', DepartmentViewSet, 'fields=id,name,code,hero_image_url,program_name'),
+    ('hostels', HostelViewSet, ''),
+    ('hostels', HostelViewSet, 'omit=rules,images'),
+    ('timetables', TimetableViewSet, ''),
+    ('timetables', TimetableViewSet, 'omit=schedule_data'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark payload size and latency of main list endpoints with and without ?fields=/?omit='
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Requests per scenario')
+        parser.add_argument('--page-size', type=int, default=100, help='page_size query param')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Create this many rows per model for the run (rolled back afterwards)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            self.run(options['iterations'], options['page_size'])
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+    def run(self, iterations, page_size):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        factory = APIRequestFactory(SERVER_NAME=host)
+
+        self.stdout.write(f"{'endpoint':<12} {'params':<72} {'bytes':>10} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, viewset, params in SCENARIOS:
+            view = viewset.as_view({'get': 'list'})
+            query = f'page_size={page_size}' + (f'&{params}' if params else '')
+            timings = []
+            size = queries = 0
+            for _ in range(iterations):
+                request = factory.get(f'/api/{label}/?{query}')
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    response = view(request)
+                    response.render()
+                    timings.append((time.perf_counter() - started) * 1000)
+                size = len(response.content)
+                queries = len(ctx.captured_queries)
+
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{label:<12} {params or '(full)':<72} {size:>10} {queries:>8} "
+                f"{statistics.median(timings):>8.1f} {p95:>8.1f}"
+            )
+
+    def seed(self, count):
+        """Insert realistic-looking rows with long text fields"""
+        self.stdout.write(f'Seeding {count} rows per model (rolled back after the run)...')
+        long_text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 40
+        program = Program.objects.create(name='Bench Program', code='BENCHPROG')
+
+        departments = Department.objects.bulk_create([
+            Department(
+                name=f'Bench Department {i}', code=f'BENCH{i}', program=program,
+                mission=long_text, vision=long_text,
+                facilities=[f'Facility {n}' for n in range(10)],
+                achievements=[f'Achievement {n}' for n in range(10)],
+            )
+            for i in range(count)
+        ])
+        DepartmentGalleryImage.objects.bulk_create([
+            DepartmentGalleryImage(department=department, caption=f'Gallery {n}', display_order=n)
+            for department in departments for n in range(4)
+        ])
+        News.objects.bulk_create([
+            News(title=f'Bench news {i}', description=long_text[:300], content=long_text * 3)
+            for i in range(count)
+        ])
+        Notice.objects.bulk_create([
+            Notice(title=f'Bench notice {i}', description=long_text[:500])
+            for i in range(count)
+        ])
+        Hostel.objects.bulk_create([
+            Hostel(name=f'Bench hostel {i}', hostel_type='boys', capacity=200, rooms_available=50,
+                   rules=long_text, facilities=['WiFi', 'Mess', 'Laundry'])
+            for i in range(count)
+        ])
+        Timetable.objects.bulk_create([
+            Timetable(title=f'Bench timetable {i}', department=departments[i % len(departments)],
+                      schedule_data={f'day{d}': [f'Period {p}' for p in range(8)] for d in range(6)})
+            for i in range(count)
+        ])
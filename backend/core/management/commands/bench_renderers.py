@@ -0,0 +1,104 @@
+import json
+import statistics
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from authentication.models import Profile
+from authentication.serializers import UserListSerializer
+from core.models import News, Notice, Topper, Scholarship
+from core.renderers import ORJSONRenderer, orjson
+from core.serializers import NewsSerializer, NoticeSerializer, TopperSerializer, ScholarshipSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare JSONRenderer and ORJSONRenderer on real serializer output (page_size=1000 sized lists)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Renders per payload and renderer')
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per payload')
+        parser.add_argument('--seed', action='store_true',
+                            help='Create --rows rows per model for the run (rolled back afterwards)')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; ORJSONRenderer falls back to JSONRenderer.'))
+
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['rows'])
+            payloads = self.build_payloads(options['rows'])
+            self.run(payloads, options['iterations'])
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+    def build_payloads(self, rows):
+        """Serialize list pages the same way the API views do"""
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        request = Request(APIRequestFactory(SERVER_NAME=host).get('/api/'))
+        context = {'request': request}
+        users = User.objects.order_by('-date_joined').values(*UserListSerializer.VALUES_FIELDS)[:rows]
+        return [
+            ('news', NewsSerializer(News.objects.all()[:rows], many=True, context=context).data),
+            ('notices', NoticeSerializer(Notice.objects.all()[:rows], many=True, context=context).data),
+            ('toppers', TopperSerializer(Topper.objects.all()[:rows], many=True, context=context).data),
+            ('scholarships', ScholarshipSerializer(Scholarship.objects.all()[:rows], many=True, context=context).data),
+            ('users', UserListSerializer(users, many=True).data),
+        ]
+
+    def run(self, payloads, iterations):
+        renderers = [('json', JSONRenderer()), ('orjson', ORJSONRenderer())]
+        self.stdout.write(f"{'payload':<14} {'rows':>6} {'bytes':>10} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}")
+        for label, data in payloads:
+            medians = {}
+            outputs = {}
+            for name, renderer in renderers:
+                timings = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    outputs[name] = renderer.render(data, 'application/json')
+                    timings.append((time.perf_counter() - started) * 1000)
+                medians[name] = statistics.median(timings)
+
+            if json.loads(outputs['json']) != json.loads(outputs['orjson']):
+                self.stdout.write(self.style.ERROR(f'{label}: renderers produced different JSON'))
+
+            speedup = medians['json'] / medians['orjson'] if medians['orjson'] else 0
+            self.stdout.write(
+                f"{label:<14} {len(data):>6} {len(outputs['orjson']):>10} "
+                f"{medians['json']:>9.2f} {medians['orjson']:>10.2f} {speedup:>7.1f}x"
+            )
+
+    def seed(self, count):
+        """Insert rows with long text, JSON and Decimal fields"""
+        self.stdout.write(f'Seeding {count} rows per model (rolled back after the run)...')
+        long_text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 20
+        News.objects.bulk_create([
+            News(title=f'Bench news {i}', description=long_text[:300], content=long_text * 3)
+            for i in range(count)
+        ])
+        Notice.objects.bulk_create([
+            Notice(title=f'Bench notice {i}', description=long_text[:500])
+            for i in range(count)
+        ])
+        Topper.objects.bulk_create([
+            Topper(name=f'Bench topper {i}', department='CSE', cgpa=Decimal('9.25'), year=2024, rank=i + 1,
+                   achievements=[f'Achievement {n}' for n in range(5)])
+            for i in range(count)
+        ])
+        Scholarship.objects.bulk_create([
+            Scholarship(title=f'Bench scholarship {i}', description=long_text, amount=Decimal('25000.00'))
+            for i in range(count)
+        ])
+        users = User.objects.bulk_create([
+            User(username=f'benchrender_{i}', email=f'benchrender_{i}@example.com', first_name='Bench')
+            for i in range(count)
+        ])
+        Profile.objects.bulk_create([Profile(user=user, full_name=f'Bench User {user.pk}') for user in users])
@@ -0,0 +1,121 @@
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.compiled import read_plan
+from core.models import CampusEvent, Club, News, Notice, Topper
+from core.renderers import ORJSONRenderer
+from core.serializers import CampusEventSerializer, NewsSerializer, NoticeSerializer, TopperSerializer
+
+# (label, serializer, queryset) in the shape the list views use
+SCENARIOS = [
+    ('news', NewsSerializer, lambda: News.objects.filter(is_active=True)),
+    ('notices', NoticeSerializer, lambda: Notice.objects.all()),
+    ('events', CampusEventSerializer, lambda: CampusEvent.objects.filter(is_active=True).select_related('club')),
+    ('toppers', TopperSerializer, lambda: Topper.objects.filter(is_active=True)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF serializers with the compiled read path (core.compiled) on 1k/10k row lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help='List sizes to measure')
+        parser.add_argument('--iterations', type=int, default=5, help='Runs per scenario and path')
+        parser.add_argument('--seed', action='store_true',
+                            help='Create enough rows per model for the largest size (rolled back afterwards)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(max(options['rows']))
+            self.run(options['rows'], options['iterations'])
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+    def run(self, sizes, iterations):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        context = {'request': Request(APIRequestFactory(SERVER_NAME=host).get('/api/'))}
+        renderer = ORJSONRenderer()
+
+        self.stdout.write(
+            f"{'list':<10} {'rows':>6} {'drf ms':>9} {'compiled ms':>12} {'speedup':>8} "
+            f"{'drf total':>10} {'compiled total':>15} {'speedup':>8}  output"
+        )
+        for label, serializer_class, queryset in SCENARIOS:
+            plan = read_plan(serializer_class(context=context))
+            if plan is None:
+                self.stdout.write(self.style.ERROR(f'{label}: {serializer_class.__name__} does not compile'))
+                continue
+            for size in sizes:
+                drf = {'serialize': [], 'total': []}
+                compiled = {'serialize': [], 'total': []}
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    objects = list(queryset()[:size])
+                    fetched = time.perf_counter()
+                    expected = serializer_class(objects, many=True, context=context).data
+                    drf['serialize'].append((time.perf_counter() - fetched) * 1000)
+                    drf['total'].append((time.perf_counter() - started) * 1000)
+
+                    started = time.perf_counter()
+                    rows = list(plan.values(queryset())[:size])
+                    fetched = time.perf_counter()
+                    actual = plan.render(rows, context)
+                    compiled['serialize'].append((time.perf_counter() - fetched) * 1000)
+                    compiled['total'].append((time.perf_counter() - started) * 1000)
+
+                if len(objects) < size:
+                    self.stdout.write(self.style.WARNING(f'{label}: only {len(objects)} rows (use --seed)'))
+                same = renderer.render(actual, 'application/json') == renderer.render(expected, 'application/json')
+                medians = {
+                    key: (statistics.median(drf[key]), statistics.median(compiled[key])) for key in drf
+                }
+                self.stdout.write(
+                    f"{label:<10} {len(objects):>6} "
+                    f"{medians['serialize'][0]:>9.1f} {medians['serialize'][1]:>12.1f} "
+                    f"{self.speedup(*medians['serialize']):>7.1f}x "
+                    f"{medians['total'][0]:>10.1f} {medians['total'][1]:>15.1f} "
+                    f"{self.speedup(*medians['total']):>7.1f}x  "
+                    + (self.style.SUCCESS('identical') if same else self.style.ERROR('DIFFERENT'))
+                )
+
+    def speedup(self, before, after):
+        return before / after if after else 0
+
+    def seed(self, count):
+        """Bring each benchmarked table up to `count` rows"""
+        self.stdout.write(f'Seeding up to {count} rows per model (rolled back after the run)...')
+        long_text = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 20
+        today = timezone.localdate()
+        club = Club.objects.first() or Club.objects.create(name='Bench club', icon='users')
+
+        def missing(queryset):
+            return max(0, count - queryset.count())
+
+        News.objects.bulk_create([
+            News(title=f'Bench news {i}', description=long_text[:300], content=long_text * 3, image=f'news/{i}.jpg')
+            for i in range(missing(News.objects.filter(is_active=True)))
+        ], batch_size=1000)
+        Notice.objects.bulk_create([
+            Notice(title=f'Bench notice {i}', description=long_text[:500])
+            for i in range(missing(Notice.objects.all()))
+        ], batch_size=1000)
+        CampusEvent.objects.bulk_create([
+            CampusEvent(title=f'Bench event {i}', description=long_text[:300], event_type='workshop',
+                        start_date=today + timedelta(days=i % 365), club=club if i % 2 else None)
+            for i in range(missing(CampusEvent.objects.filter(is_active=True)))
+        ], batch_size=1000)
+        Topper.objects.bulk_create([
+            Topper(name=f'Bench topper {i}', department='CSE', cgpa=Decimal('9.25'), year=2024, rank=i + 1,
+                   achievements=[f'Achievement {n}' for n in range(5)], photo=f'toppers/{i}.jpg')
+            for i in range(missing(Topper.objects.filter(is_active=True)))
+        ], batch_size=1000)
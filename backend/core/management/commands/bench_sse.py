@@ -0,0 +1,190 @@
+import asyncio
+import json
+import resource
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from core.events import CHANNEL
+from core.sse import EVENTS_PATH, EventStreamApp, broker
+
+
+def rss_kb(pid='self'):
+    """Current resident set size of a process in KiB (Linux)"""
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def notify(payload):
+    close_old_connections()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, json.dumps(payload)])
+    finally:
+        close_old_connections()
+
+
+class ASGIClient:
+    """An idle EventSource talking to the ASGI app directly"""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.received = asyncio.Event()
+        self.leave = asyncio.Event()
+        self.status = None
+        self.arrived = None
+
+    async def receive(self):
+        await self.leave.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+            self.started.set()
+        elif b'\nevent: ' in b'\n' + message.get('body', b''):
+            self.arrived = time.perf_counter()
+            self.received.set()
+
+
+class SocketClient:
+    """An idle EventSource on a real connection to a running ASGI server"""
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.received = asyncio.Event()
+        self.arrived = None
+
+    @classmethod
+    async def connect(cls, host, port, path):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n'.encode())
+        await writer.drain()
+        head = await reader.readuntil(b'\r\n\r\n')
+        if not head.startswith(b'HTTP/1.1 200'):
+            raise RuntimeError(head.split(b'\r\n', 1)[0].decode())
+        return cls(reader, writer)
+
+    async def read(self):
+        while line := await self.reader.readline():
+            if line.startswith(b'event: '):
+                self.arrived = time.perf_counter()
+                self.received.set()
+
+    def close(self):
+        self.writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Hold thousands of idle SSE clients on one process and time how long one change event takes to '
+        'reach all of them. By default the clients talk to the ASGI app in this process; with --url they '
+        'open real connections to a running server (uvicorn college_website.asgi:application).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=5000, help='Idle clients to hold')
+        parser.add_argument('--events', type=int, default=5, help='Change events to fan out')
+        parser.add_argument('--idle', type=float, default=0, help='Seconds to stay idle before the events')
+        parser.add_argument('--url', help='Event stream URL of a running server, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--pid', type=int, help='With --url: server process whose memory to report')
+
+    def handle(self, *args, **options):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if options['url'] and soft < options['connections'] + 100:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, options['connections'] + 100), hard))
+        if options['url']:
+            asyncio.run(self.over_sockets(options))
+        else:
+            asyncio.run(self.in_process(options))
+
+    async def in_process(self, options):
+        count = options['connections']
+        app = EventStreamApp(django_application=None)
+        scope = {'type': 'http', 'method': 'GET', 'path': EVENTS_PATH, 'query_string': b'', 'headers': []}
+
+        tracemalloc.start()
+        memory_before, rss_before = tracemalloc.get_traced_memory()[0], rss_kb()
+        clients = [ASGIClient() for _ in range(count)]
+        streams = [asyncio.ensure_future(app.stream(scope, client.receive, client.send)) for client in clients]
+        await asyncio.gather(*(client.started.wait() for client in clients))
+        refused = sum(client.status != 200 for client in clients)
+        while broker.connection is None:
+            await asyncio.sleep(0.05)
+        memory_after, rss_after = tracemalloc.get_traced_memory()[0], rss_kb()
+        tracemalloc.stop()
+        self.report_memory(count - refused, memory_after - memory_before, rss_after - rss_before, refused)
+
+        await self.idle(options['idle'])
+        await self.fan_out([client for client in clients if client.status == 200], options['events'])
+
+        for client in clients:
+            client.leave.set()
+        await asyncio.gather(*streams)
+
+    async def over_sockets(self, options):
+        url = urlsplit(options['url'])
+        host, port = url.hostname, url.port or 80
+        count = options['connections']
+        rss_before = rss_kb(options['pid']) if options['pid'] else None
+
+        clients = []
+        # Connect in waves so the server's accept backlog is not overrun
+        for start in range(0, count, 500):
+            clients += await asyncio.gather(*(
+                SocketClient.connect(host, port, EVENTS_PATH) for _ in range(min(500, count - start))
+            ))
+        readers = [asyncio.ensure_future(client.read()) for client in clients]
+        if options['pid']:
+            self.report_memory(count, None, rss_kb(options['pid']) - rss_before, 0)
+        else:
+            self.stdout.write(f'{count} streams open (pass --pid for the server\'s memory)')
+
+        await self.idle(options['idle'])
+        await self.fan_out(clients, options['events'])
+
+        for client in clients:
+            client.close()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    async def idle(self, seconds):
+        if seconds:
+            self.stdout.write(f'Idle for {seconds:g}s...')
+            await asyncio.sleep(seconds)
+
+    async def fan_out(self, clients, events):
+        if not clients:
+            return
+        self.stdout.write(f"{'event':>5} {'clients':>8} {'p50 ms':>8} {'p99 ms':>8} {'last ms':>8}")
+        for number in range(1, events + 1):
+            for client in clients:
+                client.received.clear()
+            payload = {'type': 'notice.updated', 'id': f'bench-{number}', 'at': timezone.now().isoformat()}
+            sent = time.perf_counter()
+            await sync_to_async(notify, thread_sensitive=False)(payload)
+            await asyncio.gather(*(client.received.wait() for client in clients))
+            latencies = sorted((client.arrived - sent) * 1000 for client in clients)
+            self.stdout.write(
+                f'{number:>5} {len(latencies):>8} {statistics.median(latencies):>8.1f} '
+                f'{latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:>8.1f} {latencies[-1]:>8.1f}'
+            )
+
+    def report_memory(self, count, python_bytes, rss_delta_kb, refused):
+        parts = [f'{count} idle streams']
+        if python_bytes is not None:
+            parts.append(f'python heap +{python_bytes / 1024 / 1024:.1f} MiB ({python_bytes / max(count, 1) / 1024:.2f} KiB each)')
+        parts.append(f'RSS +{rss_delta_kb / 1024:.1f} MiB')
+        if refused:
+            parts.append(f'{refused} refused (SSE_MAX_CONNECTIONS)')
+        self.stdout.write(', '.join(parts))
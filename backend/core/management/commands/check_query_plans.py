@@ -0,0 +1,211 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import (
+    Program, Department, Club, Notice, News, CampusEvent, Timetable, StudentSubmission, AcademicService
+)
+from core.views import (
+    NoticeViewSet, NewsViewSet, CampusEventViewSet, TimetableViewSet, StudentSubmissionViewSet,
+    AcademicServiceViewSet
+)
+
+# Placeholder for "a value that exists in the table", resolved at run time
+ANY = object()
+
+# (viewset, list query params) combinations the frontend and admin panel use
+LIST_PLANS = [
+    (NoticeViewSet, {}),
+    (NoticeViewSet, {'is_active': 'true'}),
+    (NoticeViewSet, {'is_active': 'true', 'category': ANY}),
+    (NoticeViewSet, {'is_active': 'true', 'priority': ANY}),
+    (NewsViewSet, {}),
+    (NewsViewSet, {'is_featured': 'true'}),
+    (NewsViewSet, {'category': ANY}),
+    (CampusEventViewSet, {}),
+    (CampusEventViewSet, {'is_featured': 'true'}),
+    (CampusEventViewSet, {'club': ANY}),
+    (TimetableViewSet, {}),
+    (TimetableViewSet, {'department': ANY}),
+    (StudentSubmissionViewSet, {}),
+    (StudentSubmissionViewSet, {'status': 'pending'}),
+    (AcademicServiceViewSet, {}),
+    (AcademicServiceViewSet, {'category': ANY}),
+    (AcademicServiceViewSet, {'department': ANY}),
+]
+
+
+def action_querysets():
+    """Querysets built by custom viewset actions rather than the list filters"""
+    today = timezone.now().date()
+    submitter = StudentSubmission.objects.values_list('user_id', flat=True).first()
+    return [
+        ('news (public)', News.objects.published()[:20]),
+        ('notices (public)', Notice.objects.published()[:20]),
+        ('events/upcoming', CampusEvent.objects.filter(is_active=True).overlapping(today).order_by('start_date')),
+        ('events/calendar', CampusEvent.objects.filter(is_active=True).overlapping(today, today + timedelta(days=30))),
+        ('events/featured', CampusEvent.objects.filter(is_active=True, is_featured=True).order_by('-start_date')),
+        ('timetables/current', Timetable.objects.filter(is_active=True, valid_from__lte=today, valid_to__gte=today)),
+        ('submissions (own)', StudentSubmission.objects.filter(user_id=submitter)),
+        ('submissions/pending', StudentSubmission.objects.filter(status='pending')),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the common filter/ordering combinations of the core list endpoints and fail '
+        'if any of them sequentially scans a table larger than --threshold rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=int, default=1000,
+                            help='Sequential scans are allowed on tables up to this many rows')
+        parser.add_argument('--page-size', type=int, default=20, help='LIMIT applied to list queries')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Create this many rows per table for the run (rolled back afterwards)')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            failures = self.check_plans(options['threshold'], options['page_size'])
+            # Never keep benchmark data
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(
+                f'{len(failures)} queries fall back to a sequential scan:\n' + '\n'.join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS('No sequential scans above the threshold.'))
+
+    def check_plans(self, threshold, page_size):
+        factory = APIRequestFactory()
+        staff = User(id=0, username='query-plan-check', is_staff=True)
+        queries = []
+
+        for viewset, params in LIST_PLANS:
+            model = viewset.queryset.model
+            params = {
+                name: self.existing_value(model, name) if value is ANY else value
+                for name, value in params.items()
+            }
+            request = Request(factory.get('/', params))
+            request.user = staff
+            view = viewset(request=request, format_kwarg=None, action='list', args=(), kwargs={})
+            queryset = view.filter_queryset(view.get_queryset())[:page_size]
+            label = model._meta.model_name + ('?' + '&'.join(f'{k}={v}' for k, v in params.items()) if params else '')
+            queries.append((label, queryset))
+        queries.extend(action_querysets())
+
+        failures = []
+        table_sizes = {}
+        for label, queryset in queries:
+            plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+            scans = []
+            for node in self.walk(plan):
+                if node['Node Type'] != 'Seq Scan':
+                    continue
+                table = node['Relation Name']
+                if table not in table_sizes:
+                    table_sizes[table] = self.table_size(table)
+                scans.append((table, table_sizes[table]))
+
+            large = [f'{table} ({rows} rows)' for table, rows in scans if rows > threshold]
+            if large:
+                failures.append(f'  {label}: Seq Scan on ' + ', '.join(large))
+                self.stdout.write(self.style.ERROR(f'SEQ SCAN  {label}: ' + ', '.join(large)))
+            else:
+                self.stdout.write(f'ok        {label}')
+            if self.verbosity >= 2:
+                self.stdout.write(queryset.explain())
+        return failures
+
+    def walk(self, node):
+        yield node
+        for child in node.get('Plans', []):
+            yield from self.walk(child)
+
+    def table_size(self, table):
+        """Planner row estimate for a table, counted if it was never analyzed"""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [table])
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return int(row[0])
+            cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
+
+    def existing_value(self, model, name):
+        field = model._meta.get_field(name)
+        value = (
+            model.objects.exclude(**{f'{name}__isnull': True})
+            .values_list(field.attname, flat=True).first()
+        )
+        if value is None and field.choices:
+            value = field.choices[0][0]
+        return '' if value is None else str(value)
+
+    def seed(self, count):
+        """Insert `count` rows per table (mostly active, spread over the filter values) and ANALYZE"""
+        self.stdout.write(f'Seeding {count} rows per table (rolled back after the run)...')
+        now = timezone.now()
+        today = now.date()
+
+        def choices(model, name):
+            return [value for value, _ in model._meta.get_field(name).choices]
+
+        program = Program.objects.create(name='Plan Check Program', code='PLANCHECK')
+        departments = Department.objects.bulk_create([
+            Department(name=f'Plan Check Department {i}', code=f'PLAN{i}', program=program) for i in range(20)
+        ])
+        clubs = Club.objects.bulk_create([Club(name=f'Plan Check Club {i}') for i in range(20)])
+        users = User.objects.bulk_create([
+            User(username=f'plancheck_{i}', email=f'plancheck_{i}@example.com') for i in range(max(count // 10, 1))
+        ])
+
+        notice_categories, notice_priorities = choices(Notice, 'category'), choices(Notice, 'priority')
+        Notice.objects.bulk_create([
+            Notice(title=f'Notice {i}', description='Plan check', category=notice_categories[i % len(notice_categories)],
+                   priority=notice_priorities[i % len(notice_priorities)], is_active=i % 10 != 0,
+                   expiry_date=today - timedelta(days=i % 30) if i % 3 == 0 else None, is_expired=i % 3 == 0)
+            for i in range(count)
+        ], batch_size=1000)
+        news_categories = choices(News, 'category')
+        News.objects.bulk_create([
+            News(title=f'News {i}', description='Plan check', category=news_categories[i % len(news_categories)],
+                 is_featured=i % 20 == 0, is_active=i % 10 != 0,
+                 expiry_date=today - timedelta(days=i % 30) if i % 3 == 0 else None, is_expired=i % 3 == 0)
+            for i in range(count)
+        ], batch_size=1000)
+        CampusEvent.objects.bulk_create([
+            CampusEvent(title=f'Event {i}', start_date=today + timedelta(days=i % 730 - 365),
+                        club=clubs[i % len(clubs)], is_featured=i % 20 == 0, is_active=i % 10 != 0)
+            for i in range(count)
+        ], batch_size=1000)
+        Timetable.objects.bulk_create([
+            Timetable(title=f'Timetable {i}', department=departments[i % len(departments)], display_order=i % 10,
+                      valid_from=today - timedelta(days=i % 365), valid_to=today + timedelta(days=i % 90 - 45),
+                      is_active=i % 10 != 0)
+            for i in range(count)
+        ], batch_size=1000)
+        submission_categories, statuses = choices(StudentSubmission, 'category'), choices(StudentSubmission, 'status')
+        StudentSubmission.objects.bulk_create([
+            StudentSubmission(title=f'Submission {i}', category=submission_categories[i % len(submission_categories)],
+                              status=statuses[i % len(statuses)], user=users[i % len(users)])
+            for i in range(count)
+        ], batch_size=1000)
+        AcademicService.objects.bulk_create([
+            AcademicService(title=f'Document {i}', category=f'Category {i % 12}', department=f'Department {i % 20}')
+            for i in range(count)
+        ], batch_size=1000)
+
+        with connection.cursor() as cursor:
+            for model in (Notice, News, CampusEvent, Timetable, StudentSubmission, AcademicService, User):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete tombstones older than TOMBSTONE_RETENTION_DAYS. Delta sync clients with an older '
+        'updated_since get 410 and reload the full list. Run it from cron, e.g. daily.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TOMBSTONE_RETENTION_DAYS,
+                            help='Keep tombstones from the last this many days')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['days'] < settings.TOMBSTONE_RETENTION_DAYS:
+            self.stdout.write(self.style.WARNING(
+                f'--days is below TOMBSTONE_RETENTION_DAYS ({settings.TOMBSTONE_RETENTION_DAYS}); clients '
+                'syncing from before the cutoff will miss deletions.'
+            ))
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} tombstones would be deleted (dry run).')
+            return
+        # A single DELETE: tombstones have no relations or delete signals to collect for
+        deleted, _ = expired.delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}.'))
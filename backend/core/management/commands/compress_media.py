@@ -0,0 +1,82 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from whitenoise.compress import Compressor
+
+from core.snapshots import write_atomic
+
+# Uploaded media worth precompressing; images, video and archives are already compressed
+TEXT_MEDIA_EXTENSIONS = ('pdf', 'svg', 'txt', 'csv', 'json', 'xml', 'html', 'css', 'js', 'md', 'ics')
+# Under MEDIA_ROOT: relative path -> [mtime_ns, size] of each file as last compressed. Compressor
+# writes no variant when it would not save 5% (common for PDFs), so without this those files
+# would look out of date on every run.
+STATE_FILE = '.compress_media.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Write .gz/.br siblings for text-like files under MEDIA_ROOT so the web server can '
+        'serve them precompressed (nginx: gzip_static on; brotli_static on;). Files are only '
+        'recompressed after they change, including those that did not compress well enough to get a variant.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--extensions', default=','.join(TEXT_MEDIA_EXTENSIONS),
+                            help='Comma-separated file extensions to compress')
+        parser.add_argument('--force', action='store_true', help='Recompress every file, changed or not')
+        parser.add_argument('--no-brotli', action='store_true', help='Only write .gz variants')
+
+    def handle(self, *args, **options):
+        extensions = tuple(f".{ext.strip().lstrip('.').lower()}" for ext in options['extensions'].split(',') if ext.strip())
+        # Compressor only knows a skip list; we select files by extension ourselves
+        compressor = Compressor(extensions=[], use_brotli=not options['no_brotli'], quiet=True)
+
+        state_path = os.path.join(settings.MEDIA_ROOT, STATE_FILE)
+        previous = self.read_state(state_path)
+        state = {}
+
+        scanned = compressed = written = skipped = 0
+        for root, _, filenames in os.walk(settings.MEDIA_ROOT):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                if not filename.lower().endswith(extensions) or path == state_path:
+                    continue
+                scanned += 1
+                name = os.path.relpath(path, settings.MEDIA_ROOT)
+                stat = os.stat(path)
+                stamp = [stat.st_mtime_ns, stat.st_size]
+                if not options['force'] and (previous.get(name) == stamp or self.is_up_to_date(path)):
+                    state[name] = stamp
+                    continue
+                outputs = compressor.compress(path)
+                # Variants the new content did not get belong to an older version of the file
+                for suffix in ('.br', '.gz'):
+                    if f'{path}{suffix}' not in outputs and os.path.exists(f'{path}{suffix}'):
+                        os.unlink(f'{path}{suffix}')
+                if outputs:
+                    compressed += 1
+                    written += len(outputs)
+                else:
+                    skipped += 1
+                state[name] = stamp
+
+        if state != previous and os.path.isdir(settings.MEDIA_ROOT):
+            write_atomic(state_path, json.dumps(state, sort_keys=True).encode())
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {scanned} files, compressed {compressed} ({written} variants written), '
+            f'{skipped} not worth compressing.'
+        ))
+
+    def read_state(self, path):
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def is_up_to_date(self, path):
+        """True if a .gz variant exists that is newer than the file"""
+        variant = f'{path}.gz'
+        return os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path)
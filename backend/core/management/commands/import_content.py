@@ -0,0 +1,106 @@
+import csv
+import json
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.cache import bump_content_version
+from core.content import ITEM_COLUMNS, validate_data
+from core.models import ContentCollection, ContentItem
+
+BATCH_SIZE = 500
+TRUE_VALUES = {'true', 't', '1', 'yes'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Import rows exported from a Supabase table (JSON array or CSV) into a content collection. '
+        'id, display_order and is_active are kept, so re-running the import updates the same items.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Content collection slug, e.g. about-pages')
+        parser.add_argument('path', help='JSON or CSV export of the table')
+        parser.add_argument('--replace', action='store_true', help='Delete items that are not in the file')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Import the valid rows instead of aborting on the first invalid one')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only')
+
+    def handle(self, *args, **options):
+        collection = ContentCollection.objects.filter(slug=options['slug']).first()
+        if collection is None:
+            raise CommandError(
+                f"No content collection '{options['slug']}'; run sync_content_collections or create it first."
+            )
+        rows = self.read(options['path'])
+        fields = collection.schema.get('fields') or {}
+
+        items = []
+        invalid = 0
+        for number, row in enumerate(rows, start=1):
+            data = {key: self.coerce(fields.get(key), value) for key, value in row.items() if key not in ITEM_COLUMNS}
+            errors = validate_data(collection.schema, data)
+            if errors:
+                message = f"Row {number}: " + '; '.join(f'{key}: {error}' for key, error in errors.items())
+                if not options['skip_invalid']:
+                    raise CommandError(message)
+                self.stderr.write(message)
+                invalid += 1
+                continue
+            items.append(ContentItem(
+                id=uuid.UUID(str(row['id'])) if row.get('id') else uuid.uuid4(),
+                collection=collection,
+                data=data,
+                display_order=int(row.get('display_order') or 0),
+                is_active=self.coerce({'type': 'boolean'}, row.get('is_active', True)),
+            ))
+
+        if options['dry_run']:
+            self.stdout.write(f'{len(items)} rows valid, {invalid} invalid (dry run).')
+            return
+
+        with transaction.atomic():
+            if options['replace']:
+                collection.items.exclude(id__in=[item.id for item in items]).delete()
+            ContentItem.objects.bulk_create(
+                items, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['id'],
+                update_fields=['collection', 'data', 'display_order', 'is_active', 'updated_at'],
+            )
+        # bulk_create sends no signals, so invalidate the cached collections here
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'{len(items)} items imported into {collection.slug}, {invalid} skipped.'))
+
+    def read(self, path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                if path.lower().endswith('.csv'):
+                    return list(csv.DictReader(handle))
+                rows = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise CommandError('The JSON export must be an array of row objects.')
+        return rows
+
+    def coerce(self, spec, value):
+        """CSV exports carry every value as text; convert it to the schema type"""
+        if not isinstance(value, str) or spec is None:
+            return value
+        if value == '':
+            return None
+        field_type = spec['type']
+        try:
+            if field_type == 'integer':
+                return int(value)
+            if field_type == 'number':
+                return float(value)
+            if field_type in ('list', 'object'):
+                return json.loads(value)
+        except ValueError:
+            return value  # left for validate_data to report
+        if field_type == 'boolean':
+            return value.lower() in TRUE_VALUES
+        if field_type == 'date':
+            return value[:10]  # timestamps exported for date columns
+        return value
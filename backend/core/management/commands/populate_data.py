@@ -3,11 +3,29 @@ from django.contrib.auth.models import User
 from core.models import (
     Department, Club, AcademicService, Notice, Topper, CreativeWork, Magazine
 )
+from core.seeding import Seeder
 from authentication.models import Profile
 
+# Row counts created by --bench (the volumes the API benchmark is run against);
+# every other model is seeded at BENCH_SCALE
+BENCH_VOLUMES = {
+    'departments': 50,
+    'notices': 10000,
+    'news': 10000,
+    'events': 2000,
+    'timetables': 500,
+    'users': 20000,
+    'activity_logs': 100000,
+}
+BENCH_SCALE = 50
+
 class Command(BaseCommand):
     help = 'Populate database with initial data from Supabase migration'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--bench', action='store_true',
+                            help='Also seed benchmark volumes (%s)' % ', '.join(f'{v} {k}' for k, v in BENCH_VOLUMES.items()))
+
     def handle(self, *args, **options):
         self.stdout.write('Populating database with initial data...')
 
@@ -47,15 +65,15 @@ class Command(BaseCommand):
 
         # Create academic services
         services_data = [
-            {'name': 'Timetable', 'description': 'Access current semester timetables and schedules', 'icon': 'Calendar', 'link_url': '/academic/timetable'},
-            {'name': 'Fees & Scholarships', 'description': 'Fee structure and scholarship opportunities', 'icon': 'Bookmark', 'link_url': '/academic/fees'},
-            {'name': 'Academic Transcripts', 'description': 'Request transcripts and academic documents', 'icon': 'FileText', 'link_url': '/academic/transcripts'},
-            {'name': 'Online Library', 'description': 'Digital resources and research materials', 'icon': 'Library', 'link_url': '/academic/library'},
+            {'title': 'Timetable', 'description': 'Access current semester timetables and schedules', 'category': 'Academic Calendar', 'drive_url': 'https://example.com/academic/timetable'},
+            {'title': 'Fees & Scholarships', 'description': 'Fee structure and scholarship opportunities', 'category': 'Fees', 'drive_url': 'https://example.com/academic/fees'},
+            {'title': 'Academic Transcripts', 'description': 'Request transcripts and academic documents', 'category': 'Transcripts', 'drive_url': 'https://example.com/academic/transcripts'},
+            {'title': 'Online Library', 'description': 'Digital resources and research materials', 'category': 'Library', 'drive_url': 'https://example.com/academic/library'},
         ]
 
         for service_data in services_data:
             AcademicService.objects.get_or_create(
-                name=service_data['name'],
+                title=service_data['title'],
                 defaults=service_data
             )
 
@@ -135,6 +153,14 @@ class Command(BaseCommand):
             profile.full_name = 'Admin User'
             profile.save()
 
+        if options['bench']:
+            self.add_bench_volume()
+
         self.stdout.write(
             self.style.SUCCESS('Successfully populated database with initial data!')
         )
+
+    def add_bench_volume(self):
+        """Seed the benchmark volumes; re-running skips rows that already exist"""
+        counts = Seeder(scale=BENCH_SCALE, counts=BENCH_VOLUMES).run()
+        self.stdout.write('Benchmark volumes: ' + ', '.join(f'{count} {label}' for label, count in counts.items()))
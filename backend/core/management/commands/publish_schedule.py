@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import bump_content_version
+from core.models import News, Notice
+
+
+class Command(BaseCommand):
+    help = (
+        'Apply publish windows: mark News/Notice past their expiry_date as expired (so they drop out of '
+        'the public lists and their partial indexes) and clear is_new/is_breaking after NEW_BADGE_DAYS/'
+        'BREAKING_NEWS_HOURS. Run it from cron, e.g. every 15 minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--new-days', type=int, default=settings.NEW_BADGE_DAYS,
+                            help='Clear is_new on items older than this many days')
+        parser.add_argument('--breaking-hours', type=int, default=settings.BREAKING_NEWS_HOURS,
+                            help='Clear is_breaking on news older than this many hours')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        today = timezone.localdate()
+        new_cutoff = now - timedelta(days=options['new_days'])
+        breaking_cutoff = now - timedelta(hours=options['breaking_hours'])
+
+        updates = [
+            # (label, queryset, values)
+            ('news expired', News.objects.filter(is_expired=False, expiry_date__lte=today), {'is_expired': True}),
+            ('news unexpired', News.objects.filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=today),
+                                                    is_expired=True), {'is_expired': False}),
+            ('notices expired', Notice.objects.filter(is_expired=False, expiry_date__lte=today), {'is_expired': True}),
+            ('notices unexpired', Notice.objects.filter(Q(expiry_date__isnull=True) | Q(expiry_date__gt=today),
+                                                         is_expired=True), {'is_expired': False}),
+            ('news no longer new', News.objects.filter(self.older_than(new_cutoff, 'published_date'), is_new=True),
+             {'is_new': False}),
+            ('news no longer breaking', News.objects.filter(self.older_than(breaking_cutoff, 'published_date'),
+                                                            is_breaking=True), {'is_breaking': False}),
+            ('notices no longer new', Notice.objects.filter(self.older_than(new_cutoff, 'created_at'), is_new=True),
+             {'is_new': False}),
+        ]
+
+        changed = 0
+        with transaction.atomic():
+            for label, queryset, values in updates:
+                if options['dry_run']:
+                    count = queryset.count()
+                else:
+                    # One UPDATE per rule; save() and signals are deliberately skipped
+                    count = queryset.update(updated_at=now, **values)
+                changed += count
+                if count:
+                    self.stdout.write(f'{label}: {count}')
+
+        if options['dry_run']:
+            self.stdout.write(f'{changed} rows would change (dry run).')
+        elif changed:
+            version = bump_content_version()
+            self.stdout.write(self.style.SUCCESS(f'{changed} rows updated; content version is now {version}.'))
+        else:
+            self.stdout.write('Nothing to update.')
+
+    def older_than(self, cutoff, timestamp_field):
+        """Age from publish_date when it is set, otherwise from the row's own timestamp"""
+        return (
+            Q(publish_date__isnull=False, publish_date__lt=cutoff.date())
+            | Q(publish_date__isnull=True, **{f'{timestamp_field}__lt': cutoff})
+        )
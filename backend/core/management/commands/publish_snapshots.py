@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.snapshots import SNAPSHOTS, publish
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the static JSON snapshots of public endpoints into SNAPSHOT_ROOT and update its manifest. '
+        'Writes publish them on their own; run this after a deploy and from cron to pick up changes that '
+        'bypass model signals.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Snapshots to publish (default: all of {', '.join(SNAPSHOTS)})")
+        parser.add_argument('--force', action='store_true', help='Rewrite snapshots whose response is unchanged')
+
+    def handle(self, *args, **options):
+        if not settings.SNAPSHOT_ROOT:
+            raise CommandError('SNAPSHOT_ROOT is not set.')
+        unknown = set(options['names']) - set(SNAPSHOTS)
+        if unknown:
+            raise CommandError(f"Unknown snapshots: {', '.join(sorted(unknown))}.")
+        names = options['names'] or None
+        changed, failed = publish(names, force=options['force'])
+        checked = len(options['names'] or SNAPSHOTS)
+        unchanged = checked - len(changed) - len(failed)
+        self.stdout.write(
+            f"Published {len(changed)} of {checked} snapshots to {settings.SNAPSHOT_ROOT}"
+            + (f" ({', '.join(changed)})" if changed else '')
+            + f"; {unchanged} unchanged, {len(failed)} failed."
+        )
+        if failed:
+            raise CommandError('Not published:\n' + '\n'.join(f'  {name}: {error}' for name, error in failed.items()))
+        self.stdout.write(self.style.SUCCESS('Snapshots are up to date.'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.content import COLLECTIONS
+from core.models import ContentCollection
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the built-in content collections (one per former Supabase table, see core.content.COLLECTIONS). '
+        'Existing collections keep their schema unless --update is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--update', action='store_true',
+                            help='Overwrite name and schema of existing collections with the built-in definitions')
+
+    def handle(self, *args, **options):
+        created = updated = 0
+        for slug, (name, schema) in COLLECTIONS.items():
+            collection = ContentCollection.objects.filter(slug=slug).first()
+            if collection is None:
+                ContentCollection.objects.create(slug=slug, name=name, schema=schema)
+                created += 1
+            elif options['update'] and (collection.name != name or collection.schema != schema):
+                collection.name, collection.schema = name, schema
+                collection.save(update_fields=['name', 'schema', 'updated_at'])
+                updated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} collections created, {updated} updated, {len(COLLECTIONS) - created - updated} unchanged.'
+        ))
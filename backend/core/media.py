@@ -0,0 +1,122 @@
+"""
+Absolute URLs for uploaded media.
+
+Serializers used to call request.build_absolute_uri(obj.image.url) for every
+file field of every row, which re-parses the request host and scheme and asks
+storage for a URL (possibly signing it) each time. MediaURLResolver works out
+the base URL once per request and memoizes storage URLs per (storage, name);
+MediaURLField is the read-only serializer field that uses it.
+
+Settings:
+    MEDIA_CDN_URL            origin that serves /media/ (e.g. https://cdn.example.com);
+                             when set it replaces the request host, also for
+                             serializers rendered without a request
+    MEDIA_URL_CACHE_SECONDS  keep storage URLs in a process-wide memo for this
+                             long (0 = per request only). Keep it below the
+                             expiry of signed URLs.
+"""
+import time
+
+from django.conf import settings
+from rest_framework import serializers
+
+# Process-wide storage URL memo: (storage, name) -> (url, expires_at)
+_storage_urls = {}
+_STORAGE_URLS_MAX_SIZE = 10000
+
+
+def _cached_storage_url(storage, name):
+    ttl = getattr(settings, 'MEDIA_URL_CACHE_SECONDS', 0)
+    if not ttl:
+        return storage.url(name)
+
+    key = (storage, name)
+    now = time.monotonic()
+    cached = _storage_urls.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    url = storage.url(name)
+    if len(_storage_urls) >= _STORAGE_URLS_MAX_SIZE:
+        _storage_urls.clear()
+    _storage_urls[key] = (url, now + ttl)
+    return url
+
+
+class MediaURLResolver:
+    """Turns FieldFiles into absolute URLs against a base computed once"""
+
+    def __init__(self, base):
+        # base is '' when there is neither a request nor a CDN; URLs stay relative
+        self.base = base.rstrip('/')
+        self._urls = {}
+
+    @classmethod
+    def for_request(cls, request):
+        """Return the resolver for this request, creating it on first use"""
+        resolver = getattr(request, '_media_url_resolver', None)
+        if resolver is None:
+            cdn = getattr(settings, 'MEDIA_CDN_URL', '')
+            if cdn:
+                resolver = cls(cdn)
+            elif request is not None:
+                resolver = cls(request.build_absolute_uri('/'))
+            else:
+                return cls('')
+            if request is not None:
+                request._media_url_resolver = resolver
+        return resolver
+
+    def storage_url(self, storage, name):
+        key = (storage, name)
+        url = self._urls.get(key)
+        if url is None:
+            url = self._urls[key] = _cached_storage_url(storage, name)
+        return url
+
+    def name_url(self, storage, name):
+        """Absolute URL of a stored file name (used by the compiled read path, which has no FieldFile)"""
+        url = self.storage_url(storage, name)
+        # Storages such as S3 already return absolute URLs
+        if url.startswith('/') and not url.startswith('//'):
+            return self.base + url
+        return url
+
+    def url(self, file):
+        """Absolute URL of a FieldFile, or None if it is empty"""
+        if not file:
+            return None
+        return self.name_url(file.storage, file.name)
+
+
+class MediaURLField(serializers.Field):
+    """
+    Read-only absolute URL of a file field.
+
+    link_source names a URL field on the model that takes precedence when set
+    (e.g. an external link). Without a request or CDN the field is None, unless
+    allow_relative is set, in which case the storage URL is returned as is.
+    """
+
+    def __init__(self, link_source=None, allow_relative=False, **kwargs):
+        kwargs['read_only'] = True
+        self.link_source = link_source
+        self.allow_relative = allow_relative
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if self.link_source:
+            link = getattr(instance, self.link_source, None)
+            if link:
+                return link
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if isinstance(value, str):
+            return value
+        resolver = MediaURLResolver.for_request(self.context.get('request'))
+        if not resolver.base and not self.allow_relative:
+            return None
+        return resolver.url(value)
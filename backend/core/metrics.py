@@ -0,0 +1,137 @@
+"""
+Prometheus metrics for the Django/gunicorn stack.
+
+Under gunicorn every worker writes its samples to mmap-backed files in
+PROMETHEUS_MULTIPROC_DIR (prometheus_client's multiprocess mode) and the
+gunicorn master serves the merged view on a separate bind (METRICS_BIND in
+gunicorn.conf.py), so /metrics is never reachable through the public site.
+
+Requests are labelled with the route template from the URL resolver
+(e.g. /api/news/{pk}/ for the DRF router's news-detail route) rather than the
+raw path, which keeps label cardinality bounded.
+
+prometheus_client is optional: without it the middleware disables itself and
+the record_* helpers do nothing.
+"""
+import re
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_finished
+from django.db import connection
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 512 * 1024, 1024 ** 2, 5 * 1024 ** 2, 10 * 1024 ** 2, 50 * 1024 ** 2)
+
+if prometheus_client is not None:
+    REQUESTS = Counter(
+        'django_http_requests_total', 'HTTP requests by route template and status',
+        ['method', 'route', 'status'],
+    )
+    LATENCY = Histogram(
+        'django_http_request_duration_seconds', 'Request latency by route template',
+        ['method', 'route'], buckets=LATENCY_BUCKETS,
+    )
+    IN_PROGRESS = Gauge(
+        'django_http_requests_in_progress', 'Requests being handled (worker saturation)',
+        multiprocess_mode='livesum',
+    )
+    DB_QUERIES = Histogram(
+        'django_db_queries_per_request', 'SQL queries per request', ['route'], buckets=QUERY_BUCKETS,
+    )
+    DB_TIME = Histogram(
+        'django_db_query_seconds_per_request', 'Total SQL time per request', ['route'], buckets=LATENCY_BUCKETS,
+    )
+    DB_CONNECTIONS = Gauge(
+        'django_db_connections_open', 'Workers holding an open database connection',
+        multiprocess_mode='livesum',
+    )
+    REQUEST_BODY = Histogram(
+        'django_http_request_body_bytes', 'Size of request bodies with a Content-Length',
+        ['method', 'route'], buckets=SIZE_BUCKETS,
+    )
+    UPLOADED_FILES = Histogram(
+        'django_uploaded_file_bytes', 'Size of uploaded files', ['route'], buckets=SIZE_BUCKETS,
+    )
+    CACHE_REQUESTS = Counter(
+        'app_cache_requests_total', 'Cache lookups by cache name and result (hit/miss)',
+        ['cache', 'result'],
+    )
+
+GROUP_RE = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+CONVERTER_RE = re.compile(r'<(?:\w+:)?(\w+)>')
+FORMAT_SUFFIX_RE = re.compile(r'\\\.\{format\}/\?')
+
+
+def route_template(request):
+    """URL pattern of the resolved view with parameters as {name}, or 'unmatched'"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.route:
+        return 'unmatched'
+    route = GROUP_RE.sub(r'{\1}', match.route)
+    route = CONVERTER_RE.sub(r'{\1}', route)
+    route = FORMAT_SUFFIX_RE.sub('.{format}', route)
+    route = route.replace('^', '').replace('$', '').replace('\\', '')
+    return '/' + route.lstrip('/')
+
+
+def record_cache(name, hit):
+    """Count a lookup in an application cache (used to derive the hit ratio)"""
+    if prometheus_client is not None:
+        CACHE_REQUESTS.labels(name, 'hit' if hit else 'miss').inc()
+
+
+def record_db_connection(**kwargs):
+    """After close_old_connections has run: is this worker keeping a connection open?"""
+    DB_CONNECTIONS.set(1 if connection.connection is not None else 0)
+
+
+if prometheus_client is not None:
+    # Connected after django.db's close_old_connections, so it sees the result
+    request_finished.connect(record_db_connection, dispatch_uid='core.metrics.record_db_connection')
+
+
+class PrometheusMetricsMiddleware:
+    """Record request rate, latency, in-flight requests, SQL and upload sizes per route"""
+
+    def __init__(self, get_response):
+        if prometheus_client is None:
+            raise MiddlewareNotUsed('prometheus_client is not installed')
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        IN_PROGRESS.inc()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_PROGRESS.dec()
+        duration = time.perf_counter() - started
+
+        route = route_template(request)
+        method = request.method
+        REQUESTS.labels(method, route, str(response.status_code)).inc()
+        LATENCY.labels(method, route).observe(duration)
+
+        query_metrics = getattr(request, '_query_metrics', None)
+        if query_metrics is not None:
+            DB_QUERIES.labels(route).observe(query_metrics.queries)
+            DB_TIME.labels(route).observe(query_metrics.db_time)
+
+        content_length = request.META.get('CONTENT_LENGTH')
+        if content_length and content_length.isdigit() and int(content_length):
+            REQUEST_BODY.labels(method, route).observe(int(content_length))
+        # Only look at files that were already parsed; never parse the body here
+        files = getattr(request, '_files', None)
+        if files:
+            for _, uploads in files.lists():
+                for uploaded in uploads:
+                    UPLOADED_FILES.labels(route).observe(uploaded.size)
+        return response
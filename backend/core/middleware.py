@@ -0,0 +1,158 @@
+"""
+Response compression for API responses.
+
+CompressionMiddleware negotiates brotli (if the brotli package is installed)
+or gzip from Accept-Encoding and compresses text-like responses above
+COMPRESSION_MIN_SIZE bytes. 200 responses get a strong content ETag (unless
+the view already set one) and compressed bodies are kept in a small per-process
+LRU keyed by (ETag, encoding), so repeated hits on the same list page skip the
+compressor. Paths in COMPRESSION_EXCLUDE_PATHS are never compressed: they
+return tokens next to user input (the BREACH pattern).
+"""
+import gzip
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers, set_response_etag
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """Pick 'br' or 'gzip' for an Accept-Encoding header, preferring br on ties"""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in ('br', 'gzip'):
+        if coding == 'br' and brotli is None:
+            continue
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies bounded by total size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress text-like responses with brotli or gzip, caching bodies by ETag"""
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        if request.path.startswith(tuple(settings.COMPRESSION_EXCLUDE_PATHS)):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        key = None
+        if response.status_code == 200:
+            if not response.has_header('ETag'):
+                set_response_etag(response)
+            etag = response['ETag']
+            # Weak ETags do not promise byte-identical bodies, so they can't key the cache
+            if etag.startswith('"'):
+                key = (etag, encoding)
+
+        body = None
+        if key:
+            body = compressed_bodies.get(key)
+            record_cache('compressed_bodies', body is not None)
+        if body is None:
+            body = compress(response.content, encoding)
+            if len(body) >= len(response.content):
+                return response
+            if key:
+                compressed_bodies.set(key, body)
+
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['Content-Encoding'] = encoding
+        # The compressed body is a different representation of the same resource
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
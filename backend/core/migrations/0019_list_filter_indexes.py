@@ -0,0 +1,124 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Composite and partial (WHERE is_active) indexes for the filter and ordering
+    combinations used by the core list endpoints.
+
+    AcademicService's category/department columns are not in this app's
+    migration state, so its indexes are created with raw SQL (skipped where
+    the columns are missing) and only recorded in the state.
+    """
+
+    dependencies = [
+        ('core', '0018_club_website_link_campusevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['-created_at'], name='notice_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-created_at'], name='notice_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['priority', '-created_at'], name='notice_active_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-published_date'], name='news_active_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-published_date'], name='news_featured_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-published_date'], name='news_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campusevent',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-start_date', '-created_at'], name='event_active_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campusevent',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-start_date'], name='event_featured_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='campusevent',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['club', '-start_date'], name='event_active_club_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order', '-created_at'], name='timetable_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department', 'display_order', '-created_at'], name='timetable_active_dept_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['valid_from', 'valid_to'], name='timetable_active_valid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsubmission',
+            index=models.Index(fields=['-submitted_at'], name='submission_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsubmission',
+            index=models.Index(fields=['status', '-submitted_at'], name='submission_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsubmission',
+            index=models.Index(fields=['user', '-submitted_at'], name='submission_user_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[
+                        'CREATE INDEX IF NOT EXISTS "academic_created_idx" ON "core_academicservice" ("created_at" DESC);',
+                        # Only where the columns exist (databases built from these migrations alone lack them)
+                        """
+                        DO $$
+                        BEGIN
+                            IF EXISTS (SELECT 1 FROM information_schema.columns
+                                       WHERE table_name = 'core_academicservice' AND column_name = 'category') THEN
+                                CREATE INDEX IF NOT EXISTS "academic_category_idx"
+                                    ON "core_academicservice" ("category", "created_at" DESC);
+                            END IF;
+                            IF EXISTS (SELECT 1 FROM information_schema.columns
+                                       WHERE table_name = 'core_academicservice' AND column_name = 'department') THEN
+                                CREATE INDEX IF NOT EXISTS "academic_department_idx"
+                                    ON "core_academicservice" ("department", "created_at" DESC);
+                            END IF;
+                        END
+                        $$;
+                        """,
+                    ],
+                    reverse_sql=[
+                        'DROP INDEX IF EXISTS "academic_created_idx";',
+                        'DROP INDEX IF EXISTS "academic_category_idx";',
+                        'DROP INDEX IF EXISTS "academic_department_idx";',
+                    ],
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='academicservice',
+                    index=models.Index(fields=['-created_at'], name='academic_created_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='academicservice',
+                    index=models.Index(fields=['category', '-created_at'], name='academic_category_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='academicservice',
+                    index=models.Index(fields=['department', '-created_at'], name='academic_department_idx'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_expired(apps, schema_editor):
+    today = timezone.localdate()
+    for model_name in ('News', 'Notice'):
+        model = apps.get_model('core', model_name)
+        model.objects.filter(expiry_date__lte=today).update(is_expired=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notice',
+            name='publish_date',
+            field=models.DateField(blank=True, help_text='Hidden from the public before this date', null=True),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='expiry_date',
+            field=models.DateField(blank=True, help_text='Hidden from the public from this date on', null=True),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='is_expired',
+            field=models.BooleanField(default=False, editable=False, help_text='Set once expiry_date has passed (kept by publish_schedule)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='is_expired',
+            field=models.BooleanField(default=False, editable=False, help_text='Set once expiry_date has passed (kept by publish_schedule)'),
+        ),
+        migrations.RunPython(mark_expired, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_expired', False)), fields=['-created_at'], name='notice_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_expired', False)), fields=['-published_date'], name='news_live_published_idx'),
+        ),
+    ]
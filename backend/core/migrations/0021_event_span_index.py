@@ -0,0 +1,17 @@
+import core.models
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_publish_window'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campusevent',
+            index=django.contrib.postgres.indexes.GistIndex(core.models.EventSpan(), condition=models.Q(('is_active', True), ('start_date__isnull', False)), name='event_span_gist_idx'),
+        ),
+    ]
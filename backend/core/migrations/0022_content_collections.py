@@ -0,0 +1,50 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_event_span_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentCollection',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('schema', models.JSONField(blank=True, default=dict, help_text='Field definitions, see core.content')),
+            ],
+            options={
+                'verbose_name': 'Content Collection',
+                'verbose_name_plural': 'Content Collections',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('display_order', models.IntegerField(default=0)),
+                ('collection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='core.contentcollection')),
+            ],
+            options={
+                'verbose_name': 'Content Item',
+                'verbose_name_plural': 'Content Items',
+                'ordering': ['display_order', 'created_at'],
+                'indexes': [models.Index(fields=['collection', 'is_active', 'display_order'], name='content_item_access_idx')],
+            },
+        ),
+    ]
@@ -1,23 +1,61 @@
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.db.backends.postgresql.psycopg_any import DateRange
+from django.utils import timezone
 import uuid
 
 class BaseModel(models.Model):
     """Base model with common fields"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Indexed for ?updated_since= delta sync (core.sync)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         abstract = True
 
+
+class PublishWindowQuerySet(models.QuerySet):
+    """For models with publish_date/expiry_date and the denormalized is_expired flag"""
+
+    def published(self, today=None):
+        """Active rows inside their window: publish_date <= today < expiry_date (either end optional)"""
+        today = today or timezone.localdate()
+        # is_expired lets the partial indexes skip expired rows; the date check covers
+        # rows that expired since the last publish_schedule run
+        return self.filter(is_active=True, is_expired=False).filter(
+            models.Q(publish_date__isnull=True) | models.Q(publish_date__lte=today),
+            models.Q(expiry_date__isnull=True) | models.Q(expiry_date__gt=today),
+        )
+
+
+def is_past_expiry(expiry_date):
+    return expiry_date is not None and expiry_date <= timezone.localdate()
+
+
+class ProgramQuerySet(models.QuerySet):
+    def with_trades_count(self):
+        """Annotate trades_total, which ProgramSerializer reads instead of counting per program"""
+        # A subquery rather than Count('trades'): GROUP BY would drop Meta.ordering
+        trades = (
+            Trade.objects.filter(program=models.OuterRef('pk'))
+            .order_by().values('program').annotate(n=models.Count('pk')).values('n')
+        )
+        return self.annotate(trades_total=Coalesce(models.Subquery(trades), 0))
+
+
 class Program(BaseModel):
     """Academic programs (UG, PG, etc.)"""
     name = models.CharField(max_length=100, unique=True)
     code = models.CharField(max_length=20, unique=True)
     description = models.TextField(blank=True, null=True)
     is_predefined = models.BooleanField(default=False, help_text="UG, PG are predefined")
+
+    objects = ProgramQuerySet.as_manager()
     
     def __str__(self):
         return self.name
@@ -26,6 +64,16 @@ class Program(BaseModel):
         ordering = ['-is_predefined', 'name']
 
 
+class TradeQuerySet(models.QuerySet):
+    def with_departments_count(self):
+        """Annotate departments_total, which TradeSerializer reads instead of counting per trade"""
+        departments = (
+            Department.objects.filter(trade=models.OuterRef('pk'))
+            .order_by().values('trade').annotate(n=models.Count('pk')).values('n')
+        )
+        return self.annotate(departments_total=Coalesce(models.Subquery(departments), 0))
+
+
 class Trade(BaseModel):
     """Trades within programs (B.Tech, M.Tech, etc.)"""
     name = models.CharField(max_length=100)
@@ -33,6 +81,8 @@ class Trade(BaseModel):
     program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='trades')
     description = models.TextField(blank=True, null=True)
     is_predefined = models.BooleanField(default=False, help_text="B.Tech, M.Tech are predefined")
+
+    objects = TradeQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.program.name} - {self.name}"
@@ -135,6 +185,11 @@ class DepartmentGalleryImage(BaseModel):
 
     def __str__(self):
         return f"{self.department.name} - Gallery {self.media_type.title()} {self.display_order}"
+    
+    @property
+    def media_file(self):
+        """The image or video file, whichever matches media_type"""
+        return self.video if self.media_type == 'video' else self.image
 
     def delete(self, *args, **kwargs):
         """Override delete to remove media files from storage"""
@@ -230,12 +285,31 @@ class Notice(BaseModel):
     is_new = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False, help_text="Show in featured section on homepage")
     link = models.URLField(blank=True, null=True, help_text="Optional Google Drive or external link")
+    publish_date = models.DateField(blank=True, null=True, help_text="Hidden from the public before this date")
+    expiry_date = models.DateField(blank=True, null=True, help_text="Hidden from the public from this date on")
+    is_expired = models.BooleanField(default=False, editable=False,
+                                     help_text="Set once expiry_date has passed (kept by publish_schedule)")
+
+    objects = PublishWindowQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.is_expired = is_past_expiry(self.expiry_date)
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='notice_created_idx'),
+            models.Index(fields=['-created_at'], name='notice_live_created_idx',
+                         condition=models.Q(is_active=True, is_expired=False)),
+            models.Index(fields=['category', '-created_at'], name='notice_active_category_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['priority', '-created_at'], name='notice_active_priority_idx',
+                         condition=models.Q(is_active=True)),
+        ]
 
 class Magazine(BaseModel):
     """College magazines and publications"""
@@ -286,6 +360,17 @@ class Magazine(BaseModel):
     class Meta:
         ordering = ['-issue_date', '-created_at']
 
+class ClubQuerySet(models.QuerySet):
+    def with_events_count(self):
+        """Annotate active_events_count, which ClubSerializer reads instead of counting per club"""
+        # A subquery rather than Count('events'): GROUP BY would drop Meta.ordering
+        events = (
+            CampusEvent.objects.filter(club=models.OuterRef('pk'), is_active=True)
+            .order_by().values('club').annotate(n=models.Count('pk')).values('n')
+        )
+        return self.annotate(active_events_count=Coalesce(models.Subquery(events), 0))
+
+
 class Club(BaseModel):
     """Student clubs and societies"""
     name = models.CharField(max_length=200)
@@ -295,6 +380,8 @@ class Club(BaseModel):
     event_count = models.IntegerField(default=0)
     website_link = models.URLField(blank=True, null=True, help_text="Club website or social media link")
 
+    objects = ClubQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -302,6 +389,28 @@ class Club(BaseModel):
         ordering = ['name']
 
 
+class EventSpan(models.Func):
+    """
+    daterange(start_date, GREATEST(start_date, end_date), '[]'): the days an event
+    runs, inclusive. GREATEST skips NULLs, so one-day events without end_date (or
+    with an end_date before start_date) span just their start date. Queries must
+    use this exact expression to hit event_span_gist_idx.
+    """
+    function = 'daterange'
+    output_field = DateRangeField()
+
+    def __init__(self, **extra):
+        super().__init__(models.F('start_date'), Greatest('start_date', 'end_date'), models.Value('[]'), **extra)
+
+
+class CampusEventQuerySet(models.QuerySet):
+    def overlapping(self, start, end=None):
+        """Events running on any day of [start, end] (end=None: open-ended)"""
+        return self.alias(span=EventSpan()).filter(
+            start_date__isnull=False, span__overlap=DateRange(start, end, '[]'),
+        )
+
+
 class CampusEvent(BaseModel):
     """Campus events and activities"""
     EVENT_TYPE_CHOICES = [
@@ -330,6 +439,8 @@ class CampusEvent(BaseModel):
     is_featured = models.BooleanField(default=False, help_text="Show in featured section")
     club = models.ForeignKey(Club, on_delete=models.SET_NULL, null=True, blank=True, related_name='events', help_text="Associated club (if any)")
 
+    objects = CampusEventQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -337,6 +448,16 @@ class CampusEvent(BaseModel):
         ordering = ['-start_date', '-created_at']
         verbose_name = 'Campus Event'
         verbose_name_plural = 'Campus Events'
+        indexes = [
+            models.Index(fields=['-start_date', '-created_at'], name='event_active_start_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-start_date'], name='event_featured_start_idx',
+                         condition=models.Q(is_active=True, is_featured=True)),
+            models.Index(fields=['club', '-start_date'], name='event_active_club_start_idx',
+                         condition=models.Q(is_active=True)),
+            GistIndex(EventSpan(), name='event_span_gist_idx',
+                      condition=models.Q(is_active=True, start_date__isnull=False)),
+        ]
 
 def academic_service_upload_path(instance, filename):
     """Generate upload path for academic service files"""
@@ -401,6 +522,11 @@ class AcademicService(BaseModel):
         ordering = ['-created_at']
         verbose_name = 'Academic Download'
         verbose_name_plural = 'Academic Downloads'
+        indexes = [
+            models.Index(fields=['-created_at'], name='academic_created_idx'),
+            models.Index(fields=['category', '-created_at'], name='academic_category_idx'),
+            models.Index(fields=['department', '-created_at'], name='academic_department_idx'),
+        ]
 
 class Topper(BaseModel):
     """Academic toppers"""
@@ -755,6 +881,8 @@ class StudentSubmission(BaseModel):
         if self.pk:
             try:
                 old_instance = StudentSubmission.objects.get(pk=self.pk)
+                # Read by core.events to tell a review from other edits
+                self._previous_status = old_instance.status
                 if old_instance.image and old_instance.image != self.image:
                     if old_instance.image.storage.exists(old_instance.image.name):
                         old_instance.image.storage.delete(old_instance.image.name)
@@ -767,6 +895,11 @@ class StudentSubmission(BaseModel):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at'], name='submission_submitted_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='submission_status_idx'),
+            models.Index(fields=['user', '-submitted_at'], name='submission_user_idx'),
+        ]
 
 
 class CampusStats(BaseModel):
@@ -826,6 +959,10 @@ class News(BaseModel):
     pdf_link = models.URLField(blank=True, null=True, help_text="Google Drive link to PDF document")
     tags = models.JSONField(default=list, blank=True)
     is_breaking = models.BooleanField(default=False)
+    is_expired = models.BooleanField(default=False, editable=False,
+                                     help_text="Set once expiry_date has passed (kept by publish_schedule)")
+
+    objects = PublishWindowQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -847,11 +984,22 @@ class News(BaseModel):
                         old_instance.image.storage.delete(old_instance.image.name)
             except News.DoesNotExist:
                 pass
+        self.is_expired = is_past_expiry(self.expiry_date)
         super().save(*args, **kwargs)
 
     class Meta:
         ordering = ['-published_date']
         verbose_name_plural = "News"
+        indexes = [
+            models.Index(fields=['-published_date'], name='news_active_published_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-published_date'], name='news_featured_published_idx',
+                         condition=models.Q(is_active=True, is_featured=True)),
+            models.Index(fields=['category', '-published_date'], name='news_active_category_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-published_date'], name='news_live_published_idx',
+                         condition=models.Q(is_active=True, is_expired=False)),
+        ]
 
 
 class ContactInfo(BaseModel):
@@ -1001,6 +1149,14 @@ class Timetable(BaseModel):
 
     class Meta:
         ordering = ['display_order', '-created_at']
+        indexes = [
+            models.Index(fields=['display_order', '-created_at'], name='timetable_active_order_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['department', 'display_order', '-created_at'], name='timetable_active_dept_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['valid_from', 'valid_to'], name='timetable_active_valid_idx',
+                         condition=models.Q(is_active=True)),
+        ]
 
 
 class FeesStructure(BaseModel):
@@ -1114,7 +1270,7 @@ class AdminRole(models.Model):
     expires_at = models.DateTimeField(null=True, blank=True, help_text="Optional expiry date for temporary roles")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user.username} - {self.get_role_level_display()}"
@@ -1163,3 +1319,54 @@ class AdminActivityLog(models.Model):
             models.Index(fields=['admin', '-created_at']),
             models.Index(fields=['resource_type', '-created_at']),
         ]
+
+
+class ContentCollection(BaseModel):
+    """A section of typed content blocks (about pages, publications, ...); schema is checked by core.content"""
+    slug = models.SlugField(max_length=100, unique=True)
+    name = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    schema = models.JSONField(default=dict, blank=True, help_text="Field definitions, see core.content")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Content Collection'
+        verbose_name_plural = 'Content Collections'
+
+
+class ContentItem(BaseModel):
+    """One row of a content collection; its fields live in the JSONB data payload"""
+    collection = models.ForeignKey(ContentCollection, on_delete=models.CASCADE, related_name='items')
+    data = models.JSONField(default=dict, blank=True)
+    display_order = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.collection.slug} #{self.display_order}"
+
+    class Meta:
+        ordering = ['display_order', 'created_at']
+        verbose_name = 'Content Item'
+        verbose_name_plural = 'Content Items'
+        indexes = [
+            # The only access path of the cached read endpoint
+            models.Index(fields=['collection', 'is_active', 'display_order'], name='content_item_access_idx'),
+        ]
+
+
+class Tombstone(models.Model):
+    """A hard-deleted core row, kept for delta sync clients until compact_tombstones drops it (core.sync)"""
+    model = models.CharField(max_length=100, help_text="Model label, e.g. 'core.notice'")
+    object_id = models.CharField(max_length=64)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_sync_idx'),
+        ]
@@ -0,0 +1,48 @@
+"""
+Fast JSON rendering for the REST API.
+
+ORJSONRenderer encodes with orjson when it is installed, which serializes
+UUIDs, datetimes, dates, dicts/lists (including ReturnDict/ReturnList) and
+JSONField contents natively. Anything orjson does not know (Decimal, lazy
+translation strings, timedeltas, querysets, ...) goes through DRF's own
+JSONEncoder.default, so the output matches JSONRenderer. When orjson is
+missing, or the client asks for an indent orjson cannot produce (the
+browsable API asks for 4), it falls back to JSONRenderer itself.
+"""
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_default_encoder = encoders.JSONEncoder()
+
+
+def orjson_default(obj):
+    """Fallback for types orjson does not serialize natively"""
+    return _default_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when available"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or self.ensure_ascii or indent not in (None, 2):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=orjson_default, option=option)
+
+        # Same strict-javascript-subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,447 @@
+"""
+Deterministic bulk seeding for demo, fixture and benchmark data.
+
+Every core model has a factory that builds row i from a random.Random seeded
+with (seed, factory label, i), so the same --seed always yields the same rows
+regardless of batch size or which factories run. UUID primary keys are derived
+the same way, which makes re-running idempotent: rows are written with
+bulk_create(ignore_conflicts=True), or with update_conflicts=True to refresh
+them in place. Models without a natural key (activity logs) are topped up to
+their target count instead.
+
+Row counts are base * scale (at least `minimum`) unless the Seeder is given
+explicit counts per label; scale 50 gives the volumes bench_api is run against. Images are rendered once into a small shared pool
+by a process pool and referenced by the rows that need one.
+"""
+import io
+import os
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from authentication.models import Profile
+from .models import (
+    Program, Department, Club, Notice, News, CampusEvent, Timetable, Magazine, Topper, CreativeWork, HeroImage,
+    AcademicService, CampusStats, Hostel, SportsFacility, FeesStructure, Scholarship, TranscriptService,
+    StudentSubmission, AdminActivityLog
+)
+
+NAMESPACE = uuid.UUID('6f1c3a52-4d1e-4a8e-9d43-2f4e4f0b9a11')
+IMAGE_DIR = 'seed_images'
+IMAGE_SIZE = (800, 450)
+SEED_PASSWORD = 'seed-password'
+# The fee item categories of the admin fees manager, with their labels
+FEE_CATEGORIES = [
+    ('tuition', 'Tuition Fees'), ('hostel', 'Hostel Fees'), ('examination', 'Examination Fees'),
+    ('library', 'Library Fees'), ('development', 'Development Fees'), ('registration', 'Registration Fees'),
+    ('other', 'Other Fees'),
+]
+
+WORDS = (
+    'campus annual research student faculty semester workshop national technical cultural placement library '
+    'laboratory seminar examination results admission scholarship hostel sports innovation project department '
+    'guest lecture registration schedule festival committee alumni industry internship robotics coding'
+).split()
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Kavya', 'Rohit', 'Isha', 'Karan', 'Meera']
+LAST_NAMES = ['Sharma', 'Kumar', 'Singh', 'Patel', 'Gupta', 'Reddy', 'Mehta', 'Verma', 'Iyer', 'Das', 'Jha', 'Sinha']
+
+
+def seeded_uuid(seed, label, i):
+    return uuid.uuid5(NAMESPACE, f'{seed}:{label}:{i}')
+
+
+def sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def paragraph(rng, sentences=5):
+    return '. '.join(sentence(rng, rng.randint(8, 16)) for _ in range(sentences)) + '.'
+
+
+def choice(rng, model, field):
+    return rng.choice(model._meta.get_field(field).choices)[0]
+
+
+def render_image(args):
+    """JPEG bytes for pool image n (runs in a worker process)"""
+    from PIL import Image, ImageDraw
+
+    seed, n = args
+    rng = random.Random(f'{seed}:image:{n}')
+    image = Image.new('RGB', IMAGE_SIZE, tuple(rng.randint(40, 220) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randint(0, IMAGE_SIZE[0]), rng.randint(0, IMAGE_SIZE[1])
+        w, h = rng.randint(40, 300), rng.randint(40, 200)
+        draw.rectangle((x, y, x + w, y + h), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=80)
+    return output.getvalue()
+
+
+def generate_images(seed, count, workers=None):
+    """Render the shared image pool in parallel, skipping files already in storage; returns the paths"""
+    paths = [f'{IMAGE_DIR}/{seed}_{n}.jpg' for n in range(count)]
+    missing = [n for n, path in enumerate(paths) if not default_storage.exists(path)]
+    if missing:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(missing) > 1:
+            with get_context('fork').Pool(min(workers, len(missing))) as pool:
+                rendered = pool.map(render_image, [(seed, n) for n in missing])
+        else:
+            rendered = [render_image((seed, n)) for n in missing]
+        for n, content in zip(missing, rendered):
+            default_storage.save(paths[n], ContentFile(content))
+    return paths
+
+
+class Factory:
+    """Builds rows of one model; subclasses set the counts and implement build()"""
+    model = None
+    label = None
+    base = 0        # rows at scale 1
+    minimum = 0
+    unique_fields = ['id']
+
+    def count(self, seeder):
+        if self.label in seeder.counts:
+            return seeder.counts[self.label]
+        return max(self.minimum, round(self.base * seeder.scale))
+
+    def build(self, i, rng, seeder):
+        raise NotImplementedError
+
+    def pk(self, seeder, i):
+        return seeded_uuid(seeder.seed, self.label, i)
+
+    def pending(self, seeder, target):
+        return range(target)
+
+    def update_fields(self):
+        return [
+            f.name for f in self.model._meta.concrete_fields
+            if not f.primary_key and f.name not in self.unique_fields and f.name != 'created_at'
+        ]
+
+    def insert(self, objs, seeder):
+        if seeder.refresh:
+            return self.model.objects.bulk_create(
+                objs, update_conflicts=True, unique_fields=self.unique_fields, update_fields=self.update_fields()
+            )
+        return self.model.objects.bulk_create(objs, ignore_conflicts=True)
+
+    def seed(self, seeder):
+        indexes = self.pending(seeder, self.count(seeder))
+        for start in range(0, len(indexes), seeder.batch_size):
+            objs = []
+            for i in indexes[start:start + seeder.batch_size]:
+                obj = self.build(i, random.Random(f'{seeder.seed}:{self.label}:{i}'), seeder)
+                if self.unique_fields == ['id']:
+                    obj.pk = self.pk(seeder, i)
+                objs.append(obj)
+            self.insert(objs, seeder)
+        return len(indexes)
+
+
+class ProgramFactory(Factory):
+    model, label, base, minimum = Program, 'programs', 0.1, 3
+
+    def build(self, i, rng, seeder):
+        return Program(name=f'Program {seeder.seed}-{i}', code=f'P{seeder.seed}-{i}', description=paragraph(rng, 2))
+
+
+class DepartmentFactory(Factory):
+    model, label, base, minimum = Department, 'departments', 1, 8
+
+    def build(self, i, rng, seeder):
+        return Department(
+            name=f'Department of {sentence(rng, 2)} {i}', code=f'D{seeder.seed}-{i}',
+            program_id=seeder.pick(Program, i), is_direct_branch=True,
+            description=paragraph(rng, 2), head_name=f'Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            mission=paragraph(rng), vision=paragraph(rng), hero_image=seeder.image(rng),
+            facilities=[sentence(rng, 3) for _ in range(6)], achievements=[sentence(rng, 6) for _ in range(6)],
+        )
+
+
+class ClubFactory(Factory):
+    model, label, base, minimum = Club, 'clubs', 0.4, 6
+
+    def build(self, i, rng, seeder):
+        return Club(name=f'{sentence(rng, 2)} Club {i}', description=paragraph(rng, 2), icon='Users',
+                    member_count=rng.randint(20, 300), event_count=rng.randint(1, 30))
+
+
+def publish_window(rng, today):
+    """(publish_date, expiry_date, is_expired): a year of history, a third with an expiry date"""
+    publish_date = today - timedelta(days=rng.randint(-7, 365))
+    expiry_date = publish_date + timedelta(days=rng.randint(7, 180)) if rng.random() < 0.3 else None
+    return publish_date, expiry_date, expiry_date is not None and expiry_date <= today
+
+
+class NoticeFactory(Factory):
+    model, label, base = Notice, 'notices', 200
+
+    def build(self, i, rng, seeder):
+        publish_date, expiry_date, is_expired = publish_window(rng, seeder.today)
+        return Notice(title=sentence(rng), description=paragraph(rng, 3), category=choice(rng, Notice, 'category'),
+                      priority=choice(rng, Notice, 'priority'), is_new=rng.random() < 0.3,
+                      is_featured=rng.random() < 0.02, is_active=rng.random() < 0.9, publish_date=publish_date,
+                      expiry_date=expiry_date, is_expired=is_expired)
+
+
+class NewsFactory(Factory):
+    model, label, base = News, 'news', 200
+
+    def build(self, i, rng, seeder):
+        publish_date, expiry_date, is_expired = publish_window(rng, seeder.today)
+        return News(title=sentence(rng), description=paragraph(rng, 2), content=paragraph(rng, 20),
+                    category=choice(rng, News, 'category'), priority=choice(rng, News, 'priority'),
+                    image=seeder.image(rng) if rng.random() < 0.2 else None, is_featured=rng.random() < 0.02,
+                    author=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    tags=rng.sample(WORDS, 3), is_active=rng.random() < 0.9, is_breaking=rng.random() < 0.01,
+                    publish_date=publish_date, expiry_date=expiry_date, is_expired=is_expired)
+
+
+class CampusEventFactory(Factory):
+    model, label, base = CampusEvent, 'events', 40
+
+    def build(self, i, rng, seeder):
+        start = seeder.today + timedelta(days=rng.randint(-365, 365))
+        return CampusEvent(title=sentence(rng, 5), description=paragraph(rng, 3),
+                           event_type=choice(rng, CampusEvent, 'event_type'), start_date=start,
+                           end_date=start + timedelta(days=rng.randint(0, 3)), venue='Main Auditorium',
+                           club_id=seeder.pick(Club, i), is_featured=rng.random() < 0.02)
+
+
+class TimetableFactory(Factory):
+    model, label, base = Timetable, 'timetables', 10
+
+    def build(self, i, rng, seeder):
+        valid_from = seeder.today - timedelta(days=rng.randint(0, 180))
+        return Timetable(title=f'Timetable {sentence(rng, 3)}', department_id=seeder.pick(Department, i),
+                         timetable_type=choice(rng, Timetable, 'timetable_type'),
+                         semester=choice(rng, Timetable, 'semester'), academic_year='2025-26',
+                         valid_from=valid_from, valid_to=valid_from + timedelta(days=rng.randint(60, 240)),
+                         schedule_data={f'day{d}': [sentence(rng, 2) for _ in range(8)] for d in range(6)},
+                         display_order=i % 10)
+
+
+class MagazineFactory(Factory):
+    model, label, base, minimum = Magazine, 'magazines', 2, 3
+
+    def build(self, i, rng, seeder):
+        return Magazine(title=f'{sentence(rng, 3)} Magazine', description=paragraph(rng, 2),
+                        cover_image=seeder.image(rng), issue_date=seeder.today - timedelta(days=30 * i))
+
+
+class TopperFactory(Factory):
+    model, label, base, minimum = Topper, 'toppers', 2, 5
+
+    def build(self, i, rng, seeder):
+        return Topper(name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', department=sentence(rng, 3),
+                      cgpa=Decimal(rng.randint(850, 999)) / 100, achievements=[sentence(rng, 3) for _ in range(3)],
+                      photo=seeder.image(rng), year=seeder.today.year - i % 5, rank=i % 10 + 1)
+
+
+class CreativeWorkFactory(Factory):
+    model, label, base = CreativeWork, 'creative_works', 4
+
+    def build(self, i, rng, seeder):
+        return CreativeWork(title=sentence(rng, 4), description=paragraph(rng, 2),
+                            author_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                            category=choice(rng, CreativeWork, 'category'), image=seeder.image(rng),
+                            is_featured=rng.random() < 0.1)
+
+
+class HeroImageFactory(Factory):
+    model, label, minimum = HeroImage, 'hero_images', 5
+
+    def build(self, i, rng, seeder):
+        return HeroImage(title=sentence(rng, 5), description=sentence(rng, 8), image=seeder.image(rng),
+                         display_order=i)
+
+
+class AcademicServiceFactory(Factory):
+    model, label, base = AcademicService, 'academic_services', 4
+
+    def build(self, i, rng, seeder):
+        return AcademicService(title=sentence(rng, 4), description=paragraph(rng, 1),
+                               category=rng.choice(['Syllabus', 'Forms', 'Academic Calendar', 'Results']),
+                               department=f'Department {i % 10}', drive_url='https://example.com/document')
+
+
+class CampusStatsFactory(Factory):
+    model, label, minimum = CampusStats, 'campus_stats', 4
+
+    def build(self, i, rng, seeder):
+        return CampusStats(stat_name=sentence(rng, 2), stat_value=f'{rng.randint(10, 5000)}+', display_order=i)
+
+
+class HostelFactory(Factory):
+    model, label, base, minimum = Hostel, 'hostels', 0.2, 3
+
+    def build(self, i, rng, seeder):
+        capacity = rng.randint(100, 400)
+        return Hostel(name=f'Hostel {i}', description=paragraph(rng, 2), hostel_type=choice(rng, Hostel, 'hostel_type'),
+                      capacity=capacity, rooms_available=rng.randint(0, capacity // 2),
+                      facilities=['WiFi', 'Mess', 'Laundry'], rules=paragraph(rng, 4))
+
+
+class SportsFacilityFactory(Factory):
+    model, label, minimum = SportsFacility, 'sports_facilities', 4
+
+    def build(self, i, rng, seeder):
+        return SportsFacility(name=f'{sentence(rng, 2)} Ground {i}', description=paragraph(rng, 2),
+                              facility_type=choice(rng, SportsFacility, 'facility_type'),
+                              capacity=rng.randint(10, 500))
+
+
+class FeesStructureFactory(Factory):
+    model, label, base = FeesStructure, 'fees', 2
+
+    def build(self, i, rng, seeder):
+        return FeesStructure(title=f'Fees {sentence(rng, 3)}', academic_year='2025-26', semester=str(i % 8 + 1),
+                             fee_items=[{'category': category, 'label': label, 'amount': rng.randint(1000, 50000)}
+                                        for category, label in rng.sample(FEE_CATEGORIES, 5)])
+
+
+class ScholarshipFactory(Factory):
+    model, label, base, minimum = Scholarship, 'scholarships', 1, 3
+
+    def build(self, i, rng, seeder):
+        return Scholarship(title=f'{sentence(rng, 3)} Scholarship', description=paragraph(rng, 2),
+                           amount=Decimal(rng.randint(5, 100) * 1000),
+                           application_deadline=seeder.today + timedelta(days=rng.randint(10, 120)))
+
+
+class TranscriptServiceFactory(Factory):
+    model, label, minimum = TranscriptService, 'transcript_services', 3
+
+    def build(self, i, rng, seeder):
+        return TranscriptService(service_name=f'{sentence(rng, 2)} Transcript', description=paragraph(rng, 1),
+                                 processing_time='7 working days', fees_amount=Decimal(rng.randint(1, 20) * 100))
+
+
+class UserFactory(Factory):
+    """Users keyed by username; their profiles are written right after each batch"""
+    model, label, base, minimum = User, 'users', 400, 1
+    unique_fields = ['username']
+
+    def build(self, i, rng, seeder):
+        return User(username=f'seed{seeder.seed}_user_{i}', email=f'seed{seeder.seed}_user_{i}@example.com',
+                    first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                    password=seeder.password, is_staff=i == 0)
+
+    def update_fields(self):
+        return ['email', 'first_name', 'last_name', 'password', 'is_staff']
+
+    def insert(self, objs, seeder):
+        super().insert(objs, seeder)
+        # ignore_conflicts leaves pks unset, so look the ids up by username
+        ids = dict(User.objects.filter(username__in=[u.username for u in objs]).values_list('username', 'id'))
+        profiles = []
+        for user in objs:
+            rng = random.Random(f'{seeder.seed}:profiles:{user.username}')
+            profiles.append(Profile(
+                id=seeded_uuid(seeder.seed, 'profiles', user.username), user_id=ids[user.username],
+                full_name=f'{user.first_name} {user.last_name}', role='admin' if user.is_staff else 'student',
+                department=sentence(rng, 3), enrollment_year=2020 + rng.randint(0, 5),
+                semester=str(rng.randint(1, 8)),
+            ))
+        if seeder.refresh:
+            Profile.objects.bulk_create(
+                profiles, update_conflicts=True, unique_fields=['user'],
+                update_fields=['full_name', 'role', 'department', 'enrollment_year', 'semester'],
+            )
+        else:
+            Profile.objects.bulk_create(profiles, ignore_conflicts=True)
+
+
+class StudentSubmissionFactory(Factory):
+    model, label, base = StudentSubmission, 'submissions', 20
+
+    def build(self, i, rng, seeder):
+        return StudentSubmission(title=sentence(rng, 4), description=paragraph(rng, 2),
+                                 category=choice(rng, StudentSubmission, 'category'),
+                                 status=choice(rng, StudentSubmission, 'status'), user_id=seeder.pick(User, i))
+
+
+class ActivityLogFactory(Factory):
+    """No natural key: rows carry the seed in details and are topped up to the target count"""
+    model, label, base = AdminActivityLog, 'activity_logs', 2000
+    unique_fields = []
+
+    def pending(self, seeder, target):
+        existing = AdminActivityLog.objects.filter(details__seed=seeder.seed).count()
+        return range(existing, target)
+
+    def insert(self, objs, seeder):
+        AdminActivityLog.objects.bulk_create(objs)
+
+    def build(self, i, rng, seeder):
+        return AdminActivityLog(admin_id=seeder.pick(User, i, is_staff=True) or seeder.pick(User, i),
+                                action=rng.choice(['create', 'update', 'delete', 'grant_role']),
+                                resource_type=rng.choice(['notice', 'news', 'scholarship', 'transcript', 'timetable']),
+                                resource_id=str(rng.randint(1, 10000)), details={'seed': seeder.seed, 'n': i},
+                                ip_address=f'10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}')
+
+
+# In dependency order
+FACTORIES = [
+    ProgramFactory(), DepartmentFactory(), ClubFactory(), NoticeFactory(), NewsFactory(), CampusEventFactory(),
+    TimetableFactory(), MagazineFactory(), TopperFactory(), CreativeWorkFactory(), HeroImageFactory(),
+    AcademicServiceFactory(), CampusStatsFactory(), HostelFactory(), SportsFacilityFactory(), FeesStructureFactory(),
+    ScholarshipFactory(), TranscriptServiceFactory(), UserFactory(), StudentSubmissionFactory(), ActivityLogFactory(),
+]
+
+
+class Seeder:
+    """Runs the factories; holds the options and the lookups they share"""
+
+    def __init__(self, scale=1.0, seed=0, batch_size=1000, refresh=False, images=True, workers=None, only=None,
+                 counts=None):
+        self.scale = scale
+        # {label: rows} overriding base * scale for those factories
+        self.counts = dict(counts or {})
+        self.seed = seed
+        self.batch_size = batch_size
+        self.refresh = refresh
+        self.only = set(only or [])
+        self.today = timezone.now().date()
+        self.password = make_password(SEED_PASSWORD)
+        self.images = (
+            generate_images(seed, min(64, max(8, round(8 * scale))), workers) if images else []
+        )
+        self._pks = {}
+
+    def image(self, rng):
+        return rng.choice(self.images) if self.images else None
+
+    def pick(self, model, i, **filters):
+        """Deterministic existing pk of `model` for row i (None if the table is empty)"""
+        key = (model, tuple(sorted(filters.items())))
+        if key not in self._pks:
+            self._pks[key] = list(model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True))
+        pks = self._pks[key]
+        return pks[i % len(pks)] if pks else None
+
+    def run(self, report=None):
+        """Seed every selected factory; returns {label: rows attempted}"""
+        counts = {}
+        for factory in FACTORIES:
+            if self.only and factory.label not in self.only:
+                continue
+            counts[factory.label] = factory.seed(self)
+            # Later factories pick foreign keys from this table
+            self._pks = {key: pks for key, pks in self._pks.items() if key[0] is not factory.model}
+            if report:
+                report(factory.label, counts[factory.label])
+        return counts
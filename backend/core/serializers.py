@@ -2,122 +2,98 @@ from rest_framework import serializers
 from .models import (
     Program, Trade, Department, DepartmentGalleryImage, HeroImage, Notice, Magazine, Club, CampusEvent,
     AcademicService, Topper, CreativeWork, StudentSubmission, CampusStats, News, ContactInfo, OfficeLocation, QuickContactInfo, Timetable,
-    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage
+    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage,
+    ContentCollection, ContentItem
 )
 from django.contrib.auth.models import User
+from .fieldsets import DynamicFieldsMixin
+from .media import MediaURLField
+from .content import validate_data, validate_schema
 
-class ProgramSerializer(serializers.ModelSerializer):
+class ProgramSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     trades_count = serializers.SerializerMethodField()
     
+    field_dependencies = {'trades_count': []}
+    
     class Meta:
         model = Program
         fields = '__all__'
     
     def get_trades_count(self, obj):
+        # Annotated by Program.objects.with_trades_count() on list querysets
+        if hasattr(obj, 'trades_total'):
+            return obj.trades_total
         return obj.trades.count()
 
 
-class TradeSerializer(serializers.ModelSerializer):
+class TradeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     program_name = serializers.CharField(source='program.name', read_only=True)
     program_code = serializers.CharField(source='program.code', read_only=True)
     departments_count = serializers.SerializerMethodField()
     
+    field_dependencies = {'departments_count': []}
+    expandable_fields = {'program': 'ProgramSerializer'}
+    
     class Meta:
         model = Trade
         fields = '__all__'
     
     def get_departments_count(self, obj):
+        # Annotated by Trade.objects.with_departments_count() on list querysets
+        if hasattr(obj, 'departments_total'):
+            return obj.departments_total
         return obj.departments.count()
 
 
-class DepartmentGalleryImageSerializer(serializers.ModelSerializer):
-    image_url = serializers.SerializerMethodField()
-    video_url = serializers.SerializerMethodField()
-    media_url = serializers.SerializerMethodField()
+class DepartmentGalleryImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_url = MediaURLField(source='image')
+    video_url = MediaURLField(source='video')
+    media_url = MediaURLField(source='media_file')
+    
+    field_dependencies = {'media_url': ['media_type', 'image', 'video']}
+    expandable_fields = {'department': 'DepartmentSerializer'}
     
     class Meta:
         model = DepartmentGalleryImage
         fields = '__all__'
-    
-    def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-        return None
-    
-    def get_video_url(self, obj):
-        if obj.video:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video.url)
-        return None
-    
-    def get_media_url(self, obj):
-        if obj.media_type == 'image' and obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-        elif obj.media_type == 'video' and obj.video:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video.url)
-        return None
-
-class DepartmentSerializer(serializers.ModelSerializer):
-    hero_image_url = serializers.SerializerMethodField()
+
+class DepartmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    hero_image_url = MediaURLField(source='hero_image')
     gallery_images = DepartmentGalleryImageSerializer(many=True, read_only=True)
     program_name = serializers.CharField(source='program.name', read_only=True)
     program_code = serializers.CharField(source='program.code', read_only=True)
     trade_name = serializers.CharField(source='trade.name', read_only=True, allow_null=True)
     trade_code = serializers.CharField(source='trade.code', read_only=True, allow_null=True)
     
+    expandable_fields = {'program': 'ProgramSerializer', 'trade': 'TradeSerializer'}
+    
     class Meta:
         model = Department
         fields = '__all__'
-    
-    def get_hero_image_url(self, obj):
-        if obj.hero_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.hero_image.url)
-        return None
 
-class HeroImageSerializer(serializers.ModelSerializer):
-    image_url = serializers.SerializerMethodField()
+class HeroImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_url = MediaURLField(source='image')
     
     class Meta:
         model = HeroImage
         fields = '__all__'
-    
-    def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-        return None
 
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notice
         fields = '__all__'
 
-class MagazineSerializer(serializers.ModelSerializer):
-    cover_image_url = serializers.SerializerMethodField()
+class MagazineSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    cover_image_url = MediaURLField(source='cover_image')
     download_url = serializers.SerializerMethodField()
     delete_cover_image = serializers.BooleanField(write_only=True, required=False)
     
+    field_dependencies = {'download_url': ['file_url', 'file']}
+    
     class Meta:
         model = Magazine
         fields = '__all__'
     
-    def get_cover_image_url(self, obj):
-        if obj.cover_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.cover_image.url)
-        return None
-    
     def get_download_url(self, obj):
         """Return the download URL - external URL if available, otherwise local file URL"""
         return obj.get_file_url
@@ -141,49 +117,51 @@ class MagazineSerializer(serializers.ModelSerializer):
         # Update other fields
         return super().update(instance, validated_data)
 
-class ClubSerializer(serializers.ModelSerializer):
+class ClubSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     events_count = serializers.SerializerMethodField()
     
+    field_dependencies = {'events_count': []}
+    
     class Meta:
         model = Club
         fields = '__all__'
     
     def get_events_count(self, obj):
         """Get count of active events for this club"""
+        # Annotated by Club.objects.with_events_count() on list querysets
+        if hasattr(obj, 'active_events_count'):
+            return obj.active_events_count
         return obj.events.filter(is_active=True).count()
 
 
-class CampusEventSerializer(serializers.ModelSerializer):
+class CampusEventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     club_name = serializers.CharField(source='club.name', read_only=True)
     
+    expandable_fields = {'club': 'ClubSerializer'}
+    
     class Meta:
         model = CampusEvent
         fields = '__all__'
 
 
-class AcademicServiceSerializer(serializers.ModelSerializer):
+class AcademicServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AcademicService
         fields = '__all__'
 
-class TopperSerializer(serializers.ModelSerializer):
-    photo_url = serializers.SerializerMethodField()
+class TopperSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    photo_url = MediaURLField(source='photo')
     
     class Meta:
         model = Topper
         fields = '__all__'
-    
-    def get_photo_url(self, obj):
-        if obj.photo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.photo.url)
-        return None
 
-class CreativeWorkSerializer(serializers.ModelSerializer):
+class CreativeWorkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     content_url = serializers.SerializerMethodField()
     
+    field_dependencies = {'image_url': ['image_url', 'image'], 'content_url': ['content_url', 'file']}
+    
     class Meta:
         model = CreativeWork
         fields = '__all__'
@@ -197,12 +175,19 @@ class CreativeWorkSerializer(serializers.ModelSerializer):
         return obj.get_content_url
 
 
-class StudentSubmissionSerializer(serializers.ModelSerializer):
+class StudentSubmissionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
     user_name = serializers.SerializerMethodField()
     user_email = serializers.SerializerMethodField()
     
+    field_dependencies = {
+        'image_url': ['image_url', 'image'],
+        'file_url': ['file_url', 'file'],
+        'user_name': ['user'],
+        'user_email': ['user'],
+    }
+    
     class Meta:
         model = StudentSubmission
         fields = '__all__'
@@ -232,77 +217,57 @@ class StudentSubmissionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CampusStatsSerializer(serializers.ModelSerializer):
+class CampusStatsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CampusStats
         fields = '__all__'
 
 
-class NewsSerializer(serializers.ModelSerializer):
-    image_url = serializers.SerializerMethodField()
+class NewsSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_url = MediaURLField(source='image')
     
     class Meta:
         model = News
         fields = '__all__'
-    
-    def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-        return None
 
 
-class ContactInfoSerializer(serializers.ModelSerializer):
+class ContactInfoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ContactInfo
         fields = '__all__'
 
 
-class OfficeLocationSerializer(serializers.ModelSerializer):
+class OfficeLocationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = OfficeLocation
         fields = '__all__'
 
 
-class QuickContactInfoSerializer(serializers.ModelSerializer):
+class QuickContactInfoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = QuickContactInfo
         fields = '__all__'
 
 
-class TimetableSerializer(serializers.ModelSerializer):
+class TimetableSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     department_name = serializers.CharField(source='department.name', read_only=True)
     department_code = serializers.CharField(source='department.code', read_only=True)
-    file_url = serializers.SerializerMethodField()
-    image_url = serializers.SerializerMethodField()
+    file_url = MediaURLField(source='timetable_file', link_source='external_link')
+    image_url = MediaURLField(source='timetable_image')
+    
+    field_dependencies = {'file_url': ['external_link', 'timetable_file']}
+    expandable_fields = {'department': 'DepartmentSerializer'}
     
     class Meta:
         model = Timetable
         fields = '__all__'
-    
-    def get_file_url(self, obj):
-        """Get the file URL (external or local)"""
-        if obj.external_link:
-            return obj.external_link
-        elif obj.timetable_file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.timetable_file.url)
-        return None
-    
-    def get_image_url(self, obj):
-        """Get the image URL"""
-        if obj.timetable_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.timetable_image.url)
-        return None
 
 
-class FeesStructureSerializer(serializers.ModelSerializer):
+class FeesStructureSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     total_amount = serializers.ReadOnlyField()
     
+    field_dependencies = {'total_amount': ['fee_items']}
+    
     class Meta:
         model = FeesStructure
         fields = '__all__'
@@ -325,25 +290,32 @@ class FeesStructureSerializer(serializers.ModelSerializer):
         return value
 
 
-class ScholarshipSerializer(serializers.ModelSerializer):
+class ScholarshipSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Scholarship
         fields = '__all__'
 
 
-class TranscriptServiceSerializer(serializers.ModelSerializer):
+class TranscriptServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TranscriptService
         fields = '__all__'
 
 
-class AdminRoleSerializer(serializers.ModelSerializer):
+class AdminRoleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     user_full_name = serializers.SerializerMethodField()
     granted_by_name = serializers.SerializerMethodField()
     role_level_display = serializers.CharField(source='get_role_level_display', read_only=True)
     is_superadmin = serializers.BooleanField(read_only=True)
     
+    field_dependencies = {
+        'user_full_name': ['user'],
+        'granted_by_name': ['granted_by'],
+        'role_level_display': ['role_level'],
+        'is_superadmin': ['role_level'],
+    }
+    
     class Meta:
         model = AdminRole
         fields = '__all__'
@@ -364,9 +336,14 @@ class AdminRoleSerializer(serializers.ModelSerializer):
         return 'System'
 
 
-class AdminActivityLogSerializer(serializers.ModelSerializer):
+class AdminActivityLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     admin_email = serializers.EmailField(source='admin.email', read_only=True)
     admin_name = serializers.SerializerMethodField()
+    # DRF 3.14's IPAddressField cannot be built under Django 5.2 (ip_address_validators
+    # returns only the validators); the log is read-only, so the string is enough
+    ip_address = serializers.CharField(read_only=True, allow_null=True)
+    
+    field_dependencies = {'admin_name': ['admin']}
     
     class Meta:
         model = AdminActivityLog
@@ -379,23 +356,15 @@ class AdminActivityLogSerializer(serializers.ModelSerializer):
             return profile.full_name or obj.admin.username
         return obj.admin.username
 
-class HostelImageSerializer(serializers.ModelSerializer):
-    image_url = serializers.SerializerMethodField()
+class HostelImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_url = MediaURLField(source='image', allow_relative=True)
     
     class Meta:
         model = HostelImage
         fields = ['id', 'image', 'image_url', 'display_order', 'created_at']
         read_only_fields = ['created_at']
-    
-    def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
-
-class HostelSerializer(serializers.ModelSerializer):
+
+class HostelSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = HostelImageSerializer(many=True, read_only=True)
     uploaded_images = serializers.ListField(
         child=serializers.ImageField(),
@@ -444,21 +413,15 @@ class HostelSerializer(serializers.ModelSerializer):
         
         return instance
 
-class SportsFacilityImageSerializer(serializers.ModelSerializer):
-    image_url = serializers.SerializerMethodField()
+class SportsFacilityImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_url = MediaURLField(source='image', allow_relative=True)
     
     class Meta:
         model = SportsFacilityImage
         fields = ['id', 'image', 'image_url', 'display_order', 'created_at']
         read_only_fields = ['created_at']
-    
-    def get_image_url(self, obj):
-        request = self.context.get('request')
-        if obj.image and hasattr(obj.image, 'url'):
-            return request.build_absolute_uri(obj.image.url) if request else obj.image.url
-        return None
 
-class SportsFacilitySerializer(serializers.ModelSerializer):
+class SportsFacilitySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = SportsFacilityImageSerializer(many=True, read_only=True)
     uploaded_images = serializers.ListField(
         child=serializers.ImageField(),
@@ -508,3 +471,34 @@ class SportsFacilitySerializer(serializers.ModelSerializer):
                 )
         
         return instance
+
+
+class ContentCollectionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ContentCollection
+        fields = '__all__'
+
+    def validate_schema(self, value):
+        errors = validate_schema(value)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+
+class ContentItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    collection_slug = serializers.CharField(source='collection.slug', read_only=True)
+
+    field_dependencies = {'collection_slug': ['collection']}
+
+    class Meta:
+        model = ContentItem
+        fields = '__all__'
+
+    def validate(self, attrs):
+        collection = attrs.get('collection') or getattr(self.instance, 'collection', None)
+        data = attrs.get('data', getattr(self.instance, 'data', {}))
+        if collection is not None:
+            errors = validate_data(collection.schema, data)
+            if errors:
+                raise serializers.ValidationError({'data': errors})
+        return attrs
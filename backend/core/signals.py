@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_content_version
+from .content import invalidate
+from .events import publish
+from . import swr
+from .invalidation import publish as publish_invalidation
+from .snapshots import debouncer, dependents, snapshot_models
+from .models import (
+    CampusEvent, Club, ContentCollection, ContentItem, Department, News, Notice, Program, StudentSubmission, Tombstone,
+    Trade,
+)
+from .sync import model_label, tombstones
+
+
+@receiver([post_save, post_delete], sender=ContentItem)
+def invalidate_content_item(sender, instance, **kwargs):
+    if ContentItem.collection.is_cached(instance):
+        slug = instance.collection.slug
+    else:
+        slug = ContentCollection.objects.filter(pk=instance.collection_id).values_list('slug', flat=True).first()
+    # None while the collection itself is being deleted; its own signal covers that
+    if slug is not None:
+        invalidate(slug)
+
+
+@receiver([post_save, post_delete], sender=ContentCollection)
+def invalidate_content_collection(sender, instance, **kwargs):
+    # A renamed slug leaves the old key behind, so drop every cached collection
+    bump_content_version()
+
+
+@receiver([post_save, post_delete], sender=Program)
+@receiver([post_save, post_delete], sender=Trade)
+@receiver([post_save, post_delete], sender=Department)
+def invalidate_hierarchy(sender, instance, **kwargs):
+    swr.invalidate('hierarchy')
+
+
+@receiver([post_save, post_delete], sender=CampusEvent)
+@receiver([post_save, post_delete], sender=Club)
+def invalidate_upcoming_events(sender, instance, **kwargs):
+    swr.invalidate('upcoming-events')
+
+
+@receiver(post_save, sender=Notice)
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=CampusEvent)
+@receiver(post_save, sender=StudentSubmission)
+def publish_change(sender, instance, created, **kwargs):
+    publish(instance, 'created' if created else 'updated')
+
+
+@receiver(post_delete, sender=Notice)
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=CampusEvent)
+@receiver(post_delete, sender=StudentSubmission)
+def publish_delete(sender, instance, **kwargs):
+    publish(instance, 'deleted')
+
+
+def record_tombstone(sender, instance, using, **kwargs):
+    # Buffered per transaction: a queryset delete writes its tombstones in one INSERT on commit
+    tombstones.add(sender, instance.pk, using)
+
+
+# Connected per model rather than for every sender, so Django keeps fast-deleting other apps' rows
+for model in apps.get_app_config('core').get_models():
+    if model is not Tombstone:
+        post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'tombstone:{model_label(model)}')
+
+
+def invalidate_l1(sender, instance, **kwargs):
+    publish_invalidation(model_label(sender), instance.pk)
+
+
+# Every write to these apps' models, and to users (roles and staff status), reaches the per-worker caches
+for model in [*apps.get_app_config('core').get_models(), *apps.get_app_config('authentication').get_models(),
+              apps.get_model('auth', 'User')]:
+    if model is not Tombstone:
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate_l1, sender=model, dispatch_uid=f'l1:{model_label(model)}')
+
+
+def schedule_snapshots(sender, instance, **kwargs):
+    debouncer.schedule(dependents(model_label(sender)))
+
+
+# Static snapshots of public endpoints (core.snapshots) are republished after writes to what they show
+for label in snapshot_models():
+    for signal in (post_save, post_delete):
+        signal.connect(schedule_snapshots, sender=apps.get_model(label), dispatch_uid=f'snapshots:{label}')
@@ -0,0 +1,262 @@
+"""
+Static JSON snapshots of public read-only endpoints.
+
+Data such as departments or scholarships changes a few times a week but is
+read on every page view. With SNAPSHOT_ROOT set, the anonymous response of
+each endpoint in SNAPSHOTS is rendered to a file there, so the web server
+answers those requests without Python:
+
+    SNAPSHOT_ROOT/api/departments/index.json(.gz, .br)   current response
+    SNAPSHOT_ROOT/v/departments.<digest>.json(.gz, .br)  immutable copy per version
+    SNAPSHOT_ROOT/manifest.json                          path, file, version, etag, size
+
+Responses are rendered through the full middleware stack, so a file has the
+same bytes as the live API. Every file is written to a temporary name and
+renamed into place, so readers never see half a file; the manifest goes last.
+core.signals schedules the snapshots of a model after each committed write;
+a process publishes SNAPSHOT_DEBOUNCE_SECONDS after its last change (at most
+SNAPSHOT_MAX_DELAY after the first), and workers take turns through a
+PostgreSQL advisory lock. Unchanged responses are not rewritten. Writes that
+bypass model signals are picked up by `manage.py publish_snapshots`, which
+also writes the first set after a deploy.
+
+Only the bare URL is a snapshot. Filtered, paginated and authenticated
+requests (admins see inactive rows) go to the API, e.g. with nginx:
+
+    map "$request_method:$args:$http_authorization" $api_snapshot {
+        default  "-";
+        "GET::"  "index.json";
+    }
+    location /api/ {
+        root /srv/nalanda/snapshots;  # SNAPSHOT_ROOT
+        gzip_static on;
+        brotli_static on;
+        default_type application/json;
+        try_files $uri$api_snapshot @django;
+    }
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler, WSGIRequest
+from django.db import connection, transaction
+from django.http.request import validate_host
+from django.utils import timezone
+from whitenoise.compress import Compressor, brotli_installed
+
+from .idempotency import acquire_lock, lock_id, release_lock
+
+logger = logging.getLogger(__name__)
+
+# name -> (path, models whose changes can alter the response)
+SNAPSHOTS = {
+    'departments': ('/api/departments/', ('core.department', 'core.departmentgalleryimage', 'core.program', 'core.trade')),
+    'programs-hierarchy': ('/api/programs/hierarchy/', ('core.program', 'core.trade', 'core.department')),
+    'clubs': ('/api/clubs/', ('core.club', 'core.campusevent')),
+    'hostels': ('/api/hostels/', ('core.hostel', 'core.hostelimage')),
+    'sports-facilities': ('/api/sports-facilities/', ('core.sportsfacility', 'core.sportsfacilityimage')),
+    'fees-structure': ('/api/fees-structure/', ('core.feesstructure',)),
+    'scholarships': ('/api/scholarships/', ('core.scholarship',)),
+    'contact-info': ('/api/contact-info/', ('core.contactinfo',)),
+    'office-locations': ('/api/office-locations/', ('core.officelocation',)),
+}
+MANIFEST = 'manifest.json'
+VERSIONS_DIR = 'v'
+LOCK_WAIT_SECONDS = 30
+
+
+def snapshot_models():
+    return {label for _, models in SNAPSHOTS.values() for label in models}
+
+
+def dependents(label):
+    """Names of the snapshots a change to the model can alter"""
+    return {name for name, (_, models) in SNAPSHOTS.items() if label in models}
+
+
+class RenderError(Exception):
+    """An endpoint did not answer the snapshot request with 200 JSON"""
+
+
+def host_error():
+    """Why requests to SNAPSHOT_BASE_URL would be rejected, or None"""
+    host = urlsplit(settings.SNAPSHOT_BASE_URL).hostname or ''
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        # What HttpRequest.get_host() allows in development
+        allowed_hosts = ['.localhost', '127.0.0.1', '[::1]']
+    if validate_host(host, allowed_hosts):
+        return None
+    return f'the SNAPSHOT_BASE_URL host {host!r} is not in ALLOWED_HOSTS'
+
+
+def render(handler, path):
+    """Body of an anonymous GET for path; raises RenderError unless it is a 200 JSON response"""
+    base = urlsplit(settings.SNAPSHOT_BASE_URL)
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'SCRIPT_NAME': '', 'QUERY_STRING': '',
+        'SERVER_NAME': base.hostname, 'SERVER_PORT': str(base.port or (443 if base.scheme == 'https' else 80)),
+        'HTTP_HOST': base.netloc, 'HTTP_ACCEPT': 'application/json', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.url_scheme': base.scheme, 'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': True, 'wsgi.run_once': False,
+    }
+    # get_response() rather than the WSGI call: request_finished would close the
+    # connection that holds the advisory lock
+    response = handler.get_response(WSGIRequest(environ))
+    content_type = response.get('Content-Type', '')
+    if response.status_code != 200 or response.streaming or not content_type.startswith('application/json'):
+        raise RenderError(f'GET {path} answered {response.status_code} {content_type}'.strip())
+    return response.content
+
+
+def write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        # mkstemp creates 0600; the web server needs to read it
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def write_variants(path, body):
+    """path and its precompressed siblings, each replaced atomically"""
+    if brotli_installed:
+        write_atomic(f'{path}.br', Compressor.compress_brotli(body))
+    write_atomic(f'{path}.gz', Compressor.compress_gzip(body))
+    write_atomic(path, body)
+
+
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {'snapshots': {}}
+
+
+def prune_versions(root, keep):
+    """Delete version files other than keep (file names without compression suffixes)"""
+    directory = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        version = f"{VERSIONS_DIR}/{filename.removesuffix('.gz').removesuffix('.br')}"
+        if version not in keep and not filename.startswith('.tmp-'):
+            os.unlink(os.path.join(directory, filename))
+
+
+def publish(names=None, force=False):
+    """
+    Render and write the named snapshots (all by default).
+
+    Returns (changed, failed): the names that were rewritten and {name: error}
+    for those that could not be rendered; the rest were unchanged.
+    """
+    root = settings.SNAPSHOT_ROOT
+    names = sorted(SNAPSHOTS if names is None else names)
+    # Every request would be a 400 (DisallowedHost)
+    error = host_error()
+    if error is not None:
+        logger.error('Not publishing snapshots: %s', error)
+        return [], dict.fromkeys(names, error)
+    lock = lock_id(f'snapshots:{root}')
+    if not acquire_lock(lock, LOCK_WAIT_SECONDS):
+        logger.warning('Another process is still publishing snapshots; skipped %s', ', '.join(names))
+        return [], dict.fromkeys(names, 'another process is still publishing snapshots')
+    try:
+        manifest = read_manifest(root)
+        previous = {entry['version'] for entry in manifest['snapshots'].values()}
+        handler = WSGIHandler()
+        changed, failed = [], {}
+        for name in names:
+            path = SNAPSHOTS[name][0]
+            try:
+                body = render(handler, path)
+            except RenderError as exc:
+                logger.warning('Not publishing %s: %s', name, exc)
+                failed[name] = str(exc)
+                continue
+            digest = hashlib.sha256(body).hexdigest()[:16]
+            version = f'{VERSIONS_DIR}/{name}.{digest}.json'
+            current = manifest['snapshots'].get(name)
+            if current is not None and current['version'] == version and not force:
+                continue
+            write_variants(os.path.join(root, version), body)
+            write_variants(os.path.join(root, path.lstrip('/'), 'index.json'), body)
+            manifest['snapshots'][name] = {
+                'path': path,
+                'file': f"{path.lstrip('/')}index.json",
+                'version': version,
+                'etag': f'"{digest}"',
+                'bytes': len(body),
+                'published_at': timezone.now().isoformat(),
+            }
+            changed.append(name)
+        if changed:
+            manifest['generated_at'] = timezone.now().isoformat()
+            write_atomic(os.path.join(root, MANIFEST), json.dumps(manifest, indent=2).encode())
+            # A client that just read the old manifest can still fetch the version it names
+            prune_versions(root, previous | {entry['version'] for entry in manifest['snapshots'].values()})
+        return changed, failed
+    finally:
+        release_lock(lock)
+
+
+class Debouncer:
+    """Collects changed snapshot names in this process and publishes them once writes settle"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._first_change = None
+        self._timer = None
+
+    def schedule(self, names):
+        if not settings.SNAPSHOT_ROOT or not names:
+            return
+        # Rendered after commit so the snapshot sees the write
+        transaction.on_commit(lambda: self._add(names))
+
+    def _add(self, names):
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_change = now
+            self._pending |= names
+            delay = min(settings.SNAPSHOT_DEBOUNCE_SECONDS,
+                        max(0, self._first_change + settings.SNAPSHOT_MAX_DELAY - now))
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            names, self._pending, self._timer = self._pending, set(), None
+        if not names:
+            # A timer replaced while it was firing; the earlier one took its names
+            return
+        try:
+            publish(names)
+        except Exception:
+            logger.exception('Publishing snapshots %s failed', ', '.join(sorted(names)))
+        finally:
+            connection.close()
+
+
+debouncer = Debouncer()
@@ -0,0 +1,342 @@
+"""
+Server-Sent Events stream of core change events (GET /api/events/, ASGI only).
+
+college_website.asgi routes EVENTS_PATH to EventStreamApp and everything else
+to Django. Serve it with an ASGI server, e.g.
+
+    uvicorn college_website.asgi:application --workers 2
+
+Under WSGI (gunicorn sync workers) the path is not routed: a long-lived stream
+would hold a whole worker.
+
+    GET /api/events/?types=notice,news&token=<access token>
+
+    retry: 5000
+
+    id: 2026-10-19T08:05:00.123456+00:00
+    event: notice.updated
+    data: {"type": "notice.updated", "id": "...", "at": "..."}
+
+    : ping
+
+EventSource cannot send an Authorization header, so the access token may be
+passed as ?token= (an Authorization: Bearer header works too). Without one the
+stream carries only the public families; submission events go to the
+submitting student and to admins (see core.events). ?types= narrows the
+families. After a reconnect, EventSource sends the last event id as
+Last-Event-ID; clients catch up with ?updated_since= (core.sync) from it.
+
+Each process holds one LISTEN connection (Broker) whose socket is watched by
+the event loop, and one timer that sends the heartbeats, so an idle client
+costs a small buffer and two tasks, not a thread or a database connection.
+Events are encoded once and shared by every client that receives them. A
+client buffers at most SSE_QUEUE_SIZE events while its writes are slow; past
+that its backlog is replaced by a "reset" event and the stream ends, so it
+reconnects and resyncs instead of growing the process's memory. A comment
+line goes to clients idle for SSE_HEARTBEAT_SECONDS so proxies keep the
+connection open and dead clients are noticed.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from urllib.parse import parse_qsl
+
+import psycopg2
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .events import CHANNEL, FAMILIES, PRIVATE_FAMILIES
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PATH = '/api/events/'
+RECONNECT_SECONDS = 2
+
+
+def is_admin_user(user):
+    return user.is_staff or (hasattr(user, 'profile') and user.profile.role == 'admin')
+
+
+def _load_subscriber(user_id):
+    """(user id, is admin) for an active user, or None"""
+    from django.contrib.auth.models import User
+
+    close_old_connections()
+    try:
+        user = User.objects.select_related('profile').filter(pk=user_id, is_active=True).first()
+        return None if user is None else (str(user.pk), is_admin_user(user))
+    finally:
+        close_old_connections()
+
+
+class Subscription:
+    """One connected client: what it may see and the encoded events waiting to be written"""
+
+    def __init__(self, families, user_id=None, is_admin=False, expires_at=None):
+        self.families = families
+        self.user_id = user_id
+        self.is_admin = is_admin
+        # A private stream ends when its token does, so the client reconnects with a fresh one
+        self.expires_at = expires_at
+        self.pending = deque()
+        self.ending = False  # a reset is pending; write it and close
+        self.closed = False  # the client went away
+        self.ping = False
+        self.last_write = time.monotonic()
+        self._waiter = None
+
+    def wants(self, event):
+        family = event['type'].split('.', 1)[0]
+        if family not in self.families:
+            return False
+        if family in PRIVATE_FAMILIES:
+            return self.is_admin or (self.user_id is not None and str(event.get('user')) == self.user_id)
+        return True
+
+    def offer(self, body):
+        if self.ending:
+            return
+        if len(self.pending) >= settings.SSE_QUEUE_SIZE:
+            # Drop the backlog; the client reconnects and catches up with a delta sync
+            self.reset('overflow')
+            return
+        self.pending.append(body)
+        self.wake()
+
+    def reset(self, reason):
+        if self.ending:
+            return
+        self.ending = True
+        self.pending.clear()
+        self.pending.append(format_event({'type': 'reset', 'reason': reason}))
+        self.wake()
+
+    def wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def wait(self):
+        """Until there is something to write or the client has left"""
+        if self.pending or self.ping or self.closed:
+            return
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+
+class Broker:
+    """The process's LISTEN connection, its clients and their heartbeat"""
+
+    def __init__(self):
+        self.subscriptions = set()
+        self.connection = None
+        self._starting = None
+        self._heartbeat = None
+
+    def subscribe(self, subscription):
+        self.subscriptions.add(subscription)
+        # The first client starts listening; later ones never wait for the database
+        if self.connection is None and (self._starting is None or self._starting.done()):
+            self._starting = asyncio.ensure_future(self._connect())
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.ensure_future(self._beat())
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+
+    def _open(self):
+        params = connections['default'].get_connection_params()
+        connection = psycopg2.connect(**params)
+        connection.set_session(autocommit=True)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        return connection
+
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        while self.connection is None:
+            try:
+                # psycopg2 connects synchronously; keep it off the event loop
+                connection = await loop.run_in_executor(None, self._open)
+            except psycopg2.Error:
+                logger.exception('Cannot LISTEN for events, retrying in %ss', RECONNECT_SECONDS)
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+            self.connection = connection
+            loop.add_reader(connection.fileno(), self._read)
+
+    def _read(self):
+        try:
+            self.connection.poll()
+        except psycopg2.Error:
+            logger.warning('Lost the LISTEN connection, reconnecting')
+            self._lost()
+            return
+        while self.connection.notifies:
+            notify = self.connection.notifies.pop(0)
+            try:
+                event = json.loads(notify.payload)
+            except ValueError:
+                logger.warning('Ignoring malformed event payload %r', notify.payload[:200])
+                continue
+            self.dispatch(event)
+
+    def _lost(self):
+        asyncio.get_running_loop().remove_reader(self.connection.fileno())
+        try:
+            self.connection.close()
+        except psycopg2.Error:
+            pass
+        self.connection = None
+        # Events may have been missed while the connection was down
+        for subscription in list(self.subscriptions):
+            subscription.reset('reconnect')
+        self._starting = asyncio.ensure_future(self._connect())
+
+    def dispatch(self, event):
+        body = None
+        for subscription in list(self.subscriptions):
+            if subscription.wants(event):
+                # Encoded once for every client
+                body = body or format_event(event)
+                subscription.offer(body)
+
+    async def _beat(self):
+        """One timer for all clients: ping the idle ones, end streams whose token expired"""
+        interval = settings.SSE_HEARTBEAT_SECONDS
+        while self.subscriptions:
+            await asyncio.sleep(interval / 2)
+            now, idle_since = time.time(), time.monotonic() - interval
+            for subscription in list(self.subscriptions):
+                if subscription.expires_at is not None and now >= subscription.expires_at:
+                    subscription.reset('token_expired')
+                elif subscription.last_write <= idle_since:
+                    subscription.ping = True
+                    subscription.wake()
+
+
+broker = Broker()
+
+
+def format_event(event):
+    data = dict(event)
+    data.pop('user', None)
+    lines = []
+    if 'at' in data:
+        lines.append(f"id: {data['at']}")
+    lines.append(f"event: {data['type']}")
+    lines.append(f'data: {json.dumps(data)}')
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class EventStreamApp:
+    """ASGI app serving EVENTS_PATH and handing everything else to Django"""
+
+    def __init__(self, django_application):
+        self.django_application = django_application
+        self.broker = broker
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+            return await self.stream(scope, receive, send)
+        return await self.django_application(scope, receive, send)
+
+    async def respond(self, send, status, body, headers=()):
+        await send({'type': 'http.response.start', 'status': status, 'headers': [
+            (b'content-type', b'application/json'), *headers,
+        ]})
+        await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+    def cors_headers(self, headers):
+        origin = headers.get(b'origin', b'').decode('latin-1')
+        if not origin or not (settings.CORS_ALLOW_ALL_ORIGINS or origin in settings.CORS_ALLOWED_ORIGINS):
+            return []
+        cors = [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+        if settings.CORS_ALLOW_CREDENTIALS:
+            cors.append((b'access-control-allow-credentials', b'true'))
+        return cors
+
+    async def authenticate(self, headers, query):
+        """(user id, is admin, expiry) for the request's token, (None, False, None) without one, None for a bad one"""
+        raw = query.get('token')
+        authorization = headers.get(b'authorization', b'').decode('latin-1')
+        if not raw and authorization.startswith('Bearer '):
+            raw = authorization[len('Bearer '):]
+        if not raw:
+            return None, False, None
+        try:
+            token = AccessToken(raw)
+        except (InvalidToken, TokenError):
+            return None
+        user = await sync_to_async(_load_subscriber, thread_sensitive=False)(token[jwt_settings.USER_ID_CLAIM])
+        return None if user is None else (*user, token['exp'])
+
+    async def stream(self, scope, receive, send):
+        headers = dict(scope['headers'])
+        query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        cors = self.cors_headers(headers)
+        if scope['method'] != 'GET':
+            return await self.respond(send, 405, {'error': 'Method not allowed'}, [(b'allow', b'GET'), *cors])
+        if len(self.broker.subscriptions) >= settings.SSE_MAX_CONNECTIONS:
+            return await self.respond(send, 503, {'error': 'Too many event streams'}, [(b'retry-after', b'5'), *cors])
+
+        subscriber = await self.authenticate(headers, query)
+        if subscriber is None:
+            return await self.respond(send, 401, {'error': 'Invalid or expired token'}, cors)
+        families = set(FAMILIES.values())
+        if query.get('types'):
+            families &= {name.strip() for name in query['types'].split(',')}
+        subscription = Subscription(families, *subscriber)
+
+        self.broker.subscribe(subscription)
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Stop nginx from buffering the stream
+                (b'x-accel-buffering', b'no'),
+                *cors,
+            ]})
+            await send({'type': 'http.response.body', 'body': f'retry: {settings.SSE_RETRY_MS}\n\n'.encode(),
+                        'more_body': True})
+            disconnected = await self.pump(subscription, receive, send)
+        finally:
+            self.broker.unsubscribe(subscription)
+        if not disconnected:
+            await send({'type': 'http.response.body', 'body': b''})
+
+    async def pump(self, subscription, receive, send):
+        """Write events and heartbeats until the client leaves (True) or the stream has to end (False)"""
+        watcher = asyncio.ensure_future(self.watch_disconnect(subscription, receive))
+        try:
+            while True:
+                await subscription.wait()
+                if subscription.closed:
+                    return True
+                if subscription.pending:
+                    # Everything that queued up while the last write was in flight goes out at once
+                    body = b''.join(subscription.pending)
+                    subscription.pending.clear()
+                else:
+                    body = b': ping\n\n'
+                subscription.ping = False
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+                subscription.last_write = time.monotonic()
+                if subscription.ending:
+                    return False
+        finally:
+            watcher.cancel()
+
+    async def watch_disconnect(self, subscription, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        subscription.closed = True
+        subscription.wake()
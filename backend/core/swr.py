@@ -0,0 +1,164 @@
+"""
+Stale-while-revalidate for hot responses that are expensive to build.
+
+    data = swr.get_or_refresh('hierarchy', 'all', build_hierarchy)
+
+The shared cache keeps {'value', 'fresh_until'} for ttl + grace seconds, so
+an expired value is still there for a while:
+    - fresh: returned as is
+    - stale (past ttl, within grace): returned as is, and one worker rebuilds
+      it in a background thread. Threads of a process share one refresh and
+      workers take a PostgreSQL advisory lock for it, so an expiry under load
+      costs one build instead of one per request.
+    - missing: built in the request. Concurrent misses for a key in one
+      process wait for a single build; other workers wait up to
+      SWR_LOCK_WAIT seconds on the same advisory lock, then read what the
+      holder stored (or build it themselves if it is still running).
+
+Keys are namespaced by name and a generation: invalidate(name) moves every
+key of that name to a new generation once the current transaction commits
+(core.signals does it for the models each name is built from), so writes are
+never served stale. Writes that bypass model signals are picked up after ttl.
+A build that returns None is not stored.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .idempotency import acquire_lock, lock_id, release_lock
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'swr-generation:{}'
+
+
+class Flight:
+    """One build of a key that concurrent callers in this process wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}
+_refreshing = set()
+_lock = threading.Lock()
+
+
+def generation(name):
+    return cache.get_or_set(GENERATION_KEY.format(name), 1, timeout=None)
+
+
+def storage_key(name, key):
+    return f'swr:{name}:{generation(name)}:{key}'
+
+
+def get_or_refresh(name, key, build, ttl=None, grace=None):
+    """Cached build() for key, served stale within grace while it is rebuilt"""
+    ttl = settings.SWR_TTL if ttl is None else ttl
+    grace = settings.SWR_GRACE_SECONDS if grace is None else grace
+    stored_at = storage_key(name, key)
+    envelope = cache.get(stored_at)
+    record_cache(name, envelope is not None)
+    if envelope is None:
+        return single_flight(stored_at, lambda: fill(stored_at, build, ttl, grace))
+    if time.time() >= envelope['fresh_until']:
+        refresh_in_background(stored_at, build, ttl, grace)
+    return envelope['value']
+
+
+def delete(name, key):
+    cache.delete(storage_key(name, key))
+
+
+def invalidate(name):
+    """Drop every key of name once the current transaction commits"""
+    def bump():
+        key = GENERATION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted or never set: start above the default so old keys still miss
+            cache.add(key, 2, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def store(stored_at, value, ttl, grace):
+    if value is not None:
+        cache.set(stored_at, {'value': value, 'fresh_until': time.time() + ttl}, ttl + grace)
+    return value
+
+
+def single_flight(stored_at, build):
+    with _lock:
+        flight = _flights.get(stored_at)
+        leader = flight is None
+        if leader:
+            flight = _flights[stored_at] = Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    try:
+        flight.value = build()
+        return flight.value
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _lock:
+            del _flights[stored_at]
+        flight.done.set()
+
+
+def fill(stored_at, build, ttl, grace):
+    """Build a missing key, letting one worker at a time do it"""
+    lock = lock_id(stored_at)
+    if not acquire_lock(lock, settings.SWR_LOCK_WAIT):
+        # The holder is slow: build without it rather than keep the request waiting
+        return store(stored_at, build(), ttl, grace)
+    try:
+        envelope = cache.get(stored_at)
+        if envelope is not None:
+            return envelope['value']
+        return store(stored_at, build(), ttl, grace)
+    finally:
+        release_lock(lock)
+
+
+def refresh_in_background(stored_at, build, ttl, grace):
+    with _lock:
+        if stored_at in _refreshing:
+            return
+        _refreshing.add(stored_at)
+    threading.Thread(
+        target=refresh, args=(stored_at, build, ttl, grace), name='swr-refresh', daemon=True,
+    ).start()
+
+
+def refresh(stored_at, build, ttl, grace):
+    lock = lock_id(stored_at)
+    try:
+        # Another worker holding the lock is already refreshing it
+        if acquire_lock(lock, 0):
+            try:
+                envelope = cache.get(stored_at)
+                if envelope is None or time.time() >= envelope['fresh_until']:
+                    store(stored_at, build(), ttl, grace)
+            finally:
+                release_lock(lock)
+    except Exception:
+        # The stale value stays until grace runs out; the next miss builds in the request
+        logger.exception('Refreshing %s failed', stored_at)
+    finally:
+        with _lock:
+            _refreshing.discard(stored_at)
+        connection.close()
@@ -0,0 +1,162 @@
+"""
+Delta sync for the core list endpoints.
+
+GET /api/notices/?updated_since=2026-10-19T08:00:00Z returns only the rows
+changed since then, plus what the client has to drop:
+
+    {"count": 2, "next": null, "previous": null, "results": [...],
+     "deleted": ["<id>", ...], "synced_at": "2026-10-19T08:05:00Z"}
+
+    - results   rows of the list (same filters) with updated_at >= since
+    - deleted   ids hard-deleted since then (from Tombstone) and ids of rows
+                that changed but no longer match the list, e.g. deactivated
+                rows on a public list
+    - synced_at the value to send as updated_since next time
+
+Tombstones are recorded by core.signals for every delete of a core model
+(instance.delete(), the models' delete() overrides, queryset deletes and
+cascades) and written with one INSERT when the transaction commits, so a
+rolled back delete leaves none and deleted_at is never older than the commit.
+compact_tombstones drops them after TOMBSTONE_RETENTION_DAYS;
+a client whose updated_since is older than that gets 410 and has to reload
+the full list.
+
+synced_at lags the request by SYNC_OVERLAP so a write that was committed just
+after the read, with an updated_at from just before it, is picked up next
+time; clients upsert results by id, so the overlap only repeats rows.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Tombstone
+
+PARAM = 'updated_since'
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'updated_since is older than the deletion history; reload the full list.'
+    default_code = 'resync_required'
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def sync_field(model):
+    """Column that moves when a row changes; append-only models only have created_at"""
+    names = {field.name for field in model._meta.concrete_fields}
+    return 'updated_at' if 'updated_at' in names else 'created_at'
+
+
+def parse_since(value):
+    """Aware datetime from the updated_since parameter, raising ValidationError for a bad one"""
+    # An unencoded '+' in the offset arrives as a space
+    since = parse_datetime(value.strip().replace(' ', '+'))
+    if since is None:
+        raise ValidationError({PARAM: 'Expected an ISO 8601 timestamp such as 2026-10-19T08:00:00Z.'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    if since < timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+        raise ResyncRequired()
+    return since
+
+
+def removed_ids(model, visible, since):
+    """Ids to drop: tombstones since `since` and changed rows the list no longer shows"""
+    field = sync_field(model)
+    deleted = list(
+        Tombstone.objects.filter(model=model_label(model), deleted_at__gte=since).values_list('object_id', flat=True)
+    )
+    if field != 'updated_at':
+        return deleted
+    # Both sides are small and served by the updated_at index
+    changed = set(model._default_manager.filter(updated_at__gte=since).values_list('pk', flat=True))
+    if changed:
+        changed -= set(visible.filter(pk__in=changed).values_list('pk', flat=True))
+    return deleted + [str(pk) for pk in changed]
+
+
+class TombstoneBatch:
+    def __init__(self, connection):
+        # on_commit() appends to this list; commit, rollback and savepoint rollbacks replace it
+        self.callbacks = connection.run_on_commit
+        self.savepoint_ids = list(connection.savepoint_ids)
+        self.rows = []
+        self.flushed = False
+
+    def is_open(self, connection):
+        return (
+            not self.flushed and self.callbacks is connection.run_on_commit
+            and self.savepoint_ids == connection.savepoint_ids
+        )
+
+
+class TombstoneBuffer:
+    """Collects the deleted rows of this thread's transaction and writes their tombstones on commit"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def add(self, model, object_id, using):
+        connection = connections[using]
+        batch = getattr(self._local, using, None)
+        if batch is not None and batch.is_open(connection):
+            batch.rows.append((model_label(model), str(object_id)))
+            return
+        # Rows deleted inside a savepoint get their own batch, dropped with the savepoint if it rolls back
+        batch = TombstoneBatch(connection)
+        batch.rows.append((model_label(model), str(object_id)))
+        setattr(self._local, using, batch)
+        transaction.on_commit(lambda: self.flush(batch, using), using=using)
+
+    def flush(self, batch, using):
+        batch.flushed = True
+        Tombstone.objects.using(using).bulk_create(
+            [Tombstone(model=label, object_id=object_id) for label, object_id in batch.rows], batch_size=1000,
+        )
+
+
+tombstones = TombstoneBuffer()
+
+
+class DeltaSyncViewMixin:
+    """ViewSet mixin for ?updated_since= on list; must come before the other list mixins"""
+
+    def sync_since(self):
+        if not hasattr(self, '_sync_since'):
+            value = self.request.query_params.get(PARAM) if self.action == 'list' else None
+            self._sync_since = parse_since(value) if value else None
+        return self._sync_since
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        since = self.sync_since()
+        if since is not None:
+            queryset = queryset.filter(**{f'{sync_field(queryset.model)}__gte': since})
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        since = self.sync_since()
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        synced_at = timezone.now() - SYNC_OVERLAP
+        response = super().list(request, *args, **kwargs)
+        queryset = super().filter_queryset(self.get_queryset())
+        extra = {
+            'deleted': removed_ids(queryset.model, queryset.order_by(), since),
+            'synced_at': synced_at.isoformat().replace('+00:00', 'Z'),
+        }
+        if isinstance(response.data, list):
+            response.data = {'results': response.data, **extra}
+        else:
+            response.data.update(extra)
+        return response
@@ -1,3 +1,957 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers, viewsets
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from whitenoise.compress import Compressor
+
+from . import serializers as core_serializers
+from . import batch, calendar, content, sse, swr
+from .httpcache import PRIVATE
+from .compiled import CompiledListViewMixin, ReadPlan, read_plan
+from .fieldsets import SparseFieldsetViewMixin
+from .idempotency import lock_id
+from .models import (
+    AdminActivityLog, AdminRole, CampusEvent, ContactInfo, ContentCollection, ContentItem, Department, DepartmentGalleryImage, Hostel, HostelImage,
+    Magazine, OfficeLocation, Program, QuickContactInfo, SportsFacility, SportsFacilityImage, StudentSubmission,
+    Trade, News, Notice, CreativeWork, Timetable, Tombstone,
+)
+from .renderers import ORJSONRenderer
+from .seeding import Seeder
+from .urls import router
+from .views import NoticeViewSet
+
+def core_model_serializers():
+    return [
+        cls for cls in vars(core_serializers).values()
+        if isinstance(cls, type) and issubclass(cls, serializers.ModelSerializer)
+        and cls.__module__ == core_serializers.__name__
+    ]
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CompiledReadPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Seeder(scale=0.5, images=False).run()
+        program = Program.objects.first()
+        Trade.objects.create(name='B.Tech', code='BT', program=program)
+        Trade.objects.create(name='M.Tech', code='MT', program=program)
+        department = Department.objects.first()
+        for order, media_type in enumerate(['image', 'video', 'image'], start=1):
+            DepartmentGalleryImage.objects.create(
+                department=department, media_type=media_type, display_order=order,
+                image=f'department_gallery/{order}.jpg' if media_type == 'image' else '',
+                video=f'department_gallery/{order}.mp4' if media_type == 'video' else '',
+            )
+        hostel = Hostel.objects.first()
+        facility = SportsFacility.objects.first()
+        for order in range(1, 4):
+            HostelImage.objects.create(hostel=hostel, image=f'hostel_images/{order}.jpg', display_order=order)
+            SportsFacilityImage.objects.create(facility=facility, image=f'sports/{order}.jpg', display_order=order)
+        ContactInfo.objects.create(office_name='Admissions', phone='+91 000', display_order=1)
+        OfficeLocation.objects.create(name='Admin Block', address='Campus')
+        QuickContactInfo.objects.create(main_phone='112', social_media_links={'x': 'https://x.com/nalanda'})
+        admin = User.objects.create_user('compiled_admin', 'compiled@example.com', 'pw', is_staff=True)
+        admin.profile.role = 'admin'
+        admin.profile.full_name = 'Compiled Admin'
+        admin.profile.save()
+        AdminRole.objects.create(user=admin, role_level=1, granted_by=None)
+        viewer = User.objects.create_user('compiled_viewer', 'viewer@example.com', 'pw')
+        AdminRole.objects.create(user=viewer, role_level=2, granted_by=admin, allowed_pages=['news'])
+        for i in range(6):
+            AdminActivityLog.objects.create(
+                admin=admin if i % 2 else viewer, action='update', resource_type='news',
+                ip_address='10.0.0.1' if i % 3 else None,
+            )
+        collection = ContentCollection.objects.create(slug='awards', name='Awards')
+        ContentItem.objects.create(collection=collection, data={'title': 'Best College'}, display_order=1)
+        # Exercise the file URL and external link branches
+        News.objects.filter(pk__in=News.objects.values('pk')[:3]).update(image='news/a b.jpg')
+        Magazine.objects.filter(pk__in=Magazine.objects.values('pk')[:2]).update(file='magazines/m.pdf', file_url='')
+        CreativeWork.objects.filter(pk__in=CreativeWork.objects.values('pk')[:2]).update(image='creative/c.png', image_url='')
+        Timetable.objects.filter(pk__in=Timetable.objects.values('pk')[:2]).update(timetable_file='tt/t.pdf', external_link='')
+        StudentSubmission.objects.filter(pk__in=StudentSubmission.objects.values('pk')[:2]).update(image='s/i.jpg')
+        cls.admin = admin
+
+    def setUp(self):
+        request = Request(APIRequestFactory(SERVER_NAME='localhost').get('/api/'))
+        self.context = {'request': request}
+        self.renderer = ORJSONRenderer()
+
+    def render(self, data):
+        return self.renderer.render(data, 'application/json')
+
+    def test_every_core_serializer_compiles_with_identical_output(self):
+        for serializer_class in core_model_serializers():
+            with self.subTest(serializer=serializer_class.__name__):
+                model = serializer_class.Meta.model
+                queryset = model._default_manager.all()
+                self.assertTrue(queryset.exists(), f'no {model.__name__} rows to compare')
+                expected = serializer_class(queryset, many=True, context=self.context).data
+
+                plan = read_plan(serializer_class(context=self.context))
+                self.assertIsNotNone(plan)
+                actual = plan.render(plan.values(queryset), self.context)
+                self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_list_endpoints_return_the_same_bytes(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.admin)
+        for prefix, viewset, basename in router.registry:
+            url = f'/api/{prefix}/?page_size=1000'
+            with self.subTest(endpoint=prefix):
+                with override_settings(COMPILED_READ_PATH=False):
+                    expected = client.get(url)
+                with override_settings(COMPILED_READ_PATH=True):
+                    actual = client.get(url)
+                self.assertEqual(actual.status_code, expected.status_code)
+                self.assertEqual(actual.content, expected.content)
+
+    @override_settings(COMPILED_READ_PATH=False)
+    def test_serializer_path_does_not_query_per_row(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.admin)
+        for url in ['/api/clubs/', '/api/campus-events/?expand=club', '/api/student-submissions/',
+                    '/api/programs/', '/api/trades/', '/api/admin-roles/', '/api/admin-activity-logs/']:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url)
+                self.assertGreater(response.data['count'], 1)
+                # The count and the page, plus one prefetch for expanded clubs
+                self.assertLessEqual(len(queries), 3)
+
+    @override_settings(COMPILED_READ_PATH=True)
+    def test_compiled_path_does_not_depend_on_instrumentation(self):
+        class NewsList(CompiledListViewMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
+            queryset = News.objects.all()
+            serializer_class = core_serializers.NewsSerializer
+            permission_classes = []
+
+        request = APIRequestFactory(SERVER_NAME='localhost').get('/api/news/')
+        with mock.patch.object(ReadPlan, 'render', autospec=True, side_effect=ReadPlan.render) as render:
+            response = NewsList.as_view({'get': 'list'})(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(render.call_count, 1)
+
+    def test_sparse_fieldsets_compile_and_expand_falls_back(self):
+        client = APIClient(SERVER_NAME='localhost')
+        for url in ['/api/news/?fields=id,title,image_url', '/api/trades/?omit=departments_count',
+                    '/api/campus-events/?expand=club']:
+            with self.subTest(url=url):
+                with override_settings(COMPILED_READ_PATH=False):
+                    expected = client.get(url)
+                with override_settings(COMPILED_READ_PATH=True):
+                    actual = client.get(url)
+                self.assertEqual(actual.content, expected.content)
+
+        request = Request(APIRequestFactory().get('/api/campus-events/', {'expand': 'club'}))
+        serializer = core_serializers.CampusEventSerializer(context={'request': request})
+        self.assertIsNone(read_plan(serializer))
+
+    @override_settings(COMPILED_READ_PATH=True)
+    def test_method_fields_are_computed_per_batch(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.admin)
+        for url in ['/api/programs/', '/api/trades/', '/api/clubs/', '/api/departments/', '/api/hostels/']:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(url + '?page_size=1000')
+                self.assertEqual(response.status_code, 200)
+                # auth user, count, page, one batch query for the method or nested field
+                self.assertLessEqual(len(ctx.captured_queries), 5, [q['sql'] for q in ctx.captured_queries])
+
+    def test_datetimes_follow_the_current_timezone(self):
+        plan = read_plan(core_serializers.NoticeSerializer(context=self.context))
+        queryset = core_serializers.Notice.objects.all()
+        with timezone.override(timezone.get_fixed_timezone(timedelta(hours=5, minutes=30))):
+            expected = core_serializers.NoticeSerializer(queryset, many=True, context=self.context).data
+            actual = plan.render(plan.values(queryset), self.context)
+        self.assertTrue(actual[0]['created_at'].endswith('+05:30'))
+        self.assertEqual(self.render(actual), self.render(expected))
+
+
+class StaleWhileRevalidateTests(TestCase):
+    THREADS = 32
+
+    def setUp(self):
+        self.name = f'test-{uuid.uuid4().hex}'
+        self.builds = 0
+        self.builds_lock = threading.Lock()
+
+    def tearDown(self):
+        cache.delete_many([swr.storage_key(self.name, 'key'), swr.GENERATION_KEY.format(self.name)])
+
+    def build(self):
+        with self.builds_lock:
+            self.builds += 1
+            number = self.builds
+        # Slow enough for every caller to arrive while it runs
+        time.sleep(0.2)
+        return number
+
+    def hammer(self):
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def call():
+            try:
+                barrier.wait()
+                results.append(swr.get_or_refresh(self.name, 'key', self.build, ttl=60, grace=60))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=call) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_build_once(self):
+        self.assertEqual(self.hammer(), [1] * self.THREADS)
+        self.assertEqual(self.builds, 1)
+
+    def test_expired_key_is_served_stale_and_rebuilt_once(self):
+        swr.get_or_refresh(self.name, 'key', self.build, ttl=60, grace=60)
+        stored_at = swr.storage_key(self.name, 'key')
+        envelope = cache.get(stored_at)
+        envelope['fresh_until'] = time.time() - 1
+        cache.set(stored_at, envelope, 60)
+
+        self.assertEqual(self.hammer(), [1] * self.THREADS)
+        deadline = time.monotonic() + 5
+        while cache.get(stored_at)['value'] != 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(cache.get(stored_at)['value'], 2)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(swr.get_or_refresh(self.name, 'key', self.build, ttl=60, grace=60), 2)
+
+
+# The invalidation listener would hold a connection to the test database past teardown
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class HttpCachePolicyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('cache_admin', 'cache@example.com', 'pw', is_staff=True)
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        AdminRole.objects.create(user=cls.admin, role_level=1, granted_by=None)
+        collection = ContentCollection.objects.create(slug='awards', name='Awards')
+        ContentItem.objects.create(collection=collection, data={'title': 'Best College'}, display_order=1)
+
+    def setUp(self):
+        self.anonymous = APIClient(SERVER_NAME='localhost')
+        self.authenticated = APIClient(SERVER_NAME='localhost')
+        self.authenticated.force_authenticate(self.admin)
+
+    def directives(self, response):
+        return set(response['Cache-Control'].split(', '))
+
+    def expected(self, policy):
+        names = {'max_age': 'max-age', 's_maxage': 's-maxage', 'stale_while_revalidate': 'stale-while-revalidate',
+                 'no_store': 'no-store'}
+        return {
+            names.get(name, name) if value is True else f'{names.get(name, name)}={value}'
+            for name, value in policy.directives().items()
+        }
+
+    def assertVaries(self, response):
+        vary = {header.strip() for header in response['Vary'].split(',')}
+        self.assertLessEqual({'Accept', 'Authorization', 'Origin'}, vary)
+
+    def test_router_routes(self):
+        for prefix, viewset, basename in router.registry:
+            policy = getattr(viewset, 'cache_policy', None) or PRIVATE
+            url = f'/api/{prefix}/'
+            with self.subTest(route=prefix):
+                response = self.anonymous.get(url)
+                self.assertVaries(response)
+                if response.status_code == 200 and not policy.private:
+                    self.assertEqual(self.directives(response), self.expected(policy))
+                    self.assertIn(viewset.queryset.model._meta.label_lower, response['Cache-Tag'].split())
+                else:
+                    self.assertEqual(self.directives(response), {'private', 'no-store'})
+                    self.assertFalse(response.has_header('Cache-Tag'))
+
+                response = self.authenticated.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.directives(response), {'private', 'no-store'})
+                self.assertVaries(response)
+
+    def test_public_routes_outside_the_list(self):
+        for url, max_age in [('/api/programs/hierarchy/', 300), ('/api/campus-events/upcoming/', 60),
+                             ('/api/content/awards/', 60)]:
+            with self.subTest(url=url):
+                response = self.anonymous.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(f'max-age={max_age}', self.directives(response))
+                self.assertIn('public', self.directives(response))
+                self.assertIn('core:content-version', response['Cache-Tag'].split())
+                self.assertVaries(response)
+
+    def test_errors_writes_and_tokens_are_not_shared(self):
+        self.assertEqual(self.directives(self.anonymous.get('/api/content/missing/')), {'private', 'no-store'})
+        self.assertEqual(self.directives(self.anonymous.post('/api/notices/', {})), {'private', 'no-store'})
+        response = self.anonymous.get('/api/notices/', HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.directives(response), {'private', 'no-store'})
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class IdempotencyTests(TestCase):
+    NOTICE = {'title': 'Exam schedule', 'description': 'Out now', 'category': 'Academic', 'priority': 'High'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('idempotency_admin', 'idempotency@example.com', 'pw', is_staff=True)
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        AdminRole.objects.create(user=cls.admin, role_level=1, granted_by=None)
+
+    def setUp(self):
+        self.key = uuid.uuid4().hex
+        self.client = APIClient(SERVER_NAME='localhost')
+        # The middleware scopes keys by the bearer token, not by force_authenticate
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.admin).access_token}')
+
+    def tearDown(self):
+        cache.delete(self.cache_key())
+
+    def cache_key(self):
+        return f'idempotency:{self.admin.pk}:{hashlib.sha256(self.key.encode()).hexdigest()}'
+
+    def post(self, data):
+        return self.client.post('/api/notices/', data, format='json', HTTP_IDEMPOTENCY_KEY=self.key)
+
+    def test_successful_write_is_replayed(self):
+        first = self.post(self.NOTICE)
+        self.assertEqual(first.status_code, 201)
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+
+        second = self.post(self.NOTICE)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(Notice.objects.filter(title='Exam schedule').count(), 1)
+
+    def test_different_request_with_the_same_key_is_rejected(self):
+        self.assertEqual(self.post(self.NOTICE).status_code, 201)
+        response = self.post({**self.NOTICE, 'title': 'Another notice'})
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Notice.objects.filter(title='Another notice').exists())
+
+    def test_errors_are_not_stored(self):
+        self.assertEqual(self.post({'title': 'Incomplete'}).status_code, 400)
+        self.assertIsNone(cache.get(self.cache_key()))
+        response = self.post(self.NOTICE)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_lock_is_released_when_the_view_raises(self):
+        with mock.patch.object(NoticeViewSet, 'create', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError), self.assertLogs('django.request', 'ERROR'):
+                self.post(self.NOTICE)
+        self.assertIsNone(cache.get(self.cache_key()))
+        with connection.cursor() as cursor:
+            # False when this session does not hold the lock
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id(self.cache_key())])
+            self.assertFalse(cursor.fetchone()[0])
+        self.assertEqual(self.post(self.NOTICE).status_code, 201)
+
+    @override_settings(IDEMPOTENCY_LOCK_WAIT=1)
+    def test_duplicate_of_a_running_request_gets_409_without_holding_the_worker(self):
+        other = connections.create_connection('default')
+        try:
+            with other.cursor() as cursor:
+                # The first request, still running in another worker
+                cursor.execute('SELECT pg_advisory_lock(%s)', [lock_id(self.cache_key())])
+            started = time.monotonic()
+            response = self.post(self.NOTICE)
+            self.assertLess(time.monotonic() - started, 5)
+        finally:
+            other.close()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(Notice.objects.filter(title='Exam schedule').exists())
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class TombstoneTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('tombstone_admin', 'tombstone@example.com', 'pw', is_staff=True)
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        AdminRole.objects.create(user=cls.admin, role_level=1, granted_by=None)
+
+    def create_notices(self, title, count):
+        return Notice.objects.bulk_create([
+            Notice(title=f'{title} {i}', description='-', category='General', priority='Low') for i in range(count)
+        ])
+
+    def test_queryset_delete_is_returned_by_delta_sync(self):
+        notices = self.create_notices('Old', 20)
+        since = timezone.now()
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                Notice.objects.filter(title__startswith='Old').delete()
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "core_tombstone"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual(
+            set(Tombstone.objects.filter(model='core.notice').values_list('object_id', flat=True)),
+            {str(notice.pk) for notice in notices},
+        )
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.admin)
+        response = client.get('/api/notices/', {'updated_since': since.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['deleted']), {str(notice.pk) for notice in notices})
+
+    def test_rolled_back_savepoint_leaves_no_tombstones(self):
+        kept, discarded = self.create_notices('Kept', 1)[0], self.create_notices('Discarded', 1)[0]
+        kept_id = str(kept.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                kept.delete()
+                try:
+                    with transaction.atomic():
+                        discarded.delete()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [kept_id])
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class ContentEngineTests(TestCase):
+    SCHEMA = {
+        'fields': {
+            'title': {'type': 'string', 'required': True, 'max_length': 20},
+            'year': {'type': 'integer'},
+            'fee': {'type': 'number'},
+            'featured': {'type': 'boolean'},
+            'held_on': {'type': 'date'},
+            'link': {'type': 'url'},
+            'gallery': {'type': 'list', 'items': 'url'},
+        },
+    }
+
+    def tearDown(self):
+        swr.delete('content', content.cache_key('awards'))
+
+    def test_validate_schema(self):
+        self.assertEqual(content.validate_schema(self.SCHEMA), [])
+        self.assertEqual(content.validate_schema([]), ['Schema must be an object.'])
+        self.assertEqual(content.validate_schema({
+            'fields': {
+                'id': {'type': 'string'},
+                'a': {'type': 'colour'},
+                'b': {'type': 'list', 'items': 'object'},
+                'c': {'type': 'string', 'required': 'yes', 'max_length': 0},
+                'd': 'string',
+            },
+            'additional': 'no',
+            'extra': 1,
+        }), [
+            'Unknown schema keys: extra.',
+            'additional must be true or false.',
+            'id: reserved for the item itself.',
+            'a: type must be one of boolean, date, email, integer, list, number, object, string, text, url.',
+            'b: items must be one of boolean, date, email, integer, number, string, text, url.',
+            'c: required must be true or false.',
+            'c: max_length must be a positive integer.',
+            'd: field definition must be an object.',
+        ])
+        self.assertEqual(content.validate_schema({'fields': []}), ['fields must be an object.'])
+
+    def test_validate_data(self):
+        valid = {'title': 'Convocation', 'year': 2026, 'fee': 10.5, 'featured': False, 'held_on': '2026-10-19',
+                 'link': '/events/convocation', 'gallery': ['https://example.com/a.jpg']}
+        self.assertEqual(content.validate_data(self.SCHEMA, valid), {})
+        self.assertEqual(content.validate_data(self.SCHEMA, {'title': ''}), {'title': 'This field is required.'})
+        self.assertEqual(content.validate_data(self.SCHEMA, 'text'), {'non_field_errors': 'Data must be an object.'})
+        self.assertEqual(content.validate_data({}, {'anything': 1}), {})
+        errors = content.validate_data(self.SCHEMA, {
+            'title': 'An even longer title than that', 'year': True, 'fee': '10', 'featured': 'yes', 'held_on': '19/10/2026',
+            'link': 'not a url', 'gallery': ['https://example.com/a.jpg', 'nope'], 'colour': 'red',
+        })
+        self.assertEqual(errors, {
+            'title': 'Ensure this value has at most 20 characters.',
+            'year': 'Must be an integer.',
+            'fee': 'Must be a number.',
+            'featured': 'Must be true or false.',
+            'held_on': 'Enter a date in YYYY-MM-DD format.',
+            'link': 'Enter a valid URL.',
+            'gallery': 'Item 1: Enter a valid URL.',
+            'colour': 'Not defined in the collection schema.',
+        })
+
+    def import_csv(self, text, *args):
+        descriptor, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descriptor, 'w') as handle:
+            handle.write(text)
+        try:
+            call_command('import_content', 'events', path, *args, stdout=open(os.devnull, 'w'),
+                         stderr=open(os.devnull, 'w'))
+        finally:
+            os.unlink(path)
+
+    def test_import_content_coerces_csv_values(self):
+        collection = ContentCollection.objects.create(slug='events', name='Events', schema=self.SCHEMA)
+        self.import_csv(
+            'id,display_order,is_active,title,year,fee,featured,held_on,link,gallery\n'
+            '6f1c3a52-4d1e-4a8e-9d43-2f4e4f0b9a11,2,false,Convocation,2026,10.5,t,2026-10-19T09:00:00Z,,'
+            '"[""https://example.com/a.jpg""]"\n'
+        )
+        item = collection.items.get()
+        self.assertEqual(str(item.id), '6f1c3a52-4d1e-4a8e-9d43-2f4e4f0b9a11')
+        self.assertEqual((item.display_order, item.is_active), (2, False))
+        self.assertEqual(item.data, {
+            'title': 'Convocation', 'year': 2026, 'fee': 10.5, 'featured': True, 'held_on': '2026-10-19',
+            'link': None, 'gallery': ['https://example.com/a.jpg'],
+        })
+
+        with self.assertRaisesMessage(CommandError, 'Row 1: year: Must be an integer.'):
+            self.import_csv('title,year\nConvocation,twenty\n')
+        self.import_csv('title,year\nConvocation,twenty\nPrizes,2025\n', '--skip-invalid')
+        self.assertEqual(collection.items.filter(data__title='Prizes').count(), 1)
+
+    def test_item_write_drops_the_shared_payload_on_commit(self):
+        collection = ContentCollection.objects.create(slug='awards', name='Awards')
+        with self.captureOnCommitCallbacks(execute=True):
+            ContentItem.objects.create(collection=collection, data={'title': 'Best College'})
+        self.assertEqual(content.shared_payload('awards')['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            ContentItem.objects.create(collection=collection, data={'title': 'Green Campus'})
+            # Still cached until the write commits
+            self.assertEqual(content.shared_payload('awards')['count'], 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(content.shared_payload('awards')['count'], 2)
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('batch_student', 'batch@example.com', 'pw')
+        Notice.objects.create(title='Exam schedule', description='-', category='Academic', priority='High')
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost')
+
+    def run_batch(self, *paths):
+        response = self.client.post('/api/batch/', {
+            'requests': [{'id': item_id, 'path': path} for item_id, path in paths],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['responses']
+
+    def test_anonymous_sub_requests_authenticate_on_their_own(self):
+        responses = self.run_batch(('users', '/api/auth/users/'), ('notices', '/api/notices/'))
+        self.assertEqual(responses['users']['status'], 401)
+        self.assertEqual(responses['notices']['status'], 200)
+        self.assertEqual(responses['notices']['body'], self.client.get('/api/notices/').json())
+
+    def test_views_apply_their_own_permissions(self):
+        self.client.force_authenticate(self.student)
+        responses = self.run_batch(('users', '/api/auth/users/'), ('me', '/api/auth/profile/'))
+        self.assertEqual(responses['users'], {'status': 403, 'body': {'error': 'Permission denied'}})
+        self.assertEqual(responses['me']['status'], 200)
+
+    def test_unknown_and_nested_paths(self):
+        responses = self.run_batch(('missing', '/api/no-such-endpoint/'), ('nested', '/api/batch/'))
+        self.assertEqual(responses['missing'], {'status': 404, 'body': {'error': 'Not found'}})
+        self.assertEqual(responses['nested'], {'status': 400, 'body': {'error': 'Batch requests cannot be nested'}})
+
+    def test_malformed_batches_are_rejected(self):
+        for body in ({}, {'requests': []}, {'requests': [{'path': '/admin/'}]},
+                     {'requests': [{'id': 'a', 'path': '/api/notices/'}, {'id': 'a', 'path': '/api/news/'}]},
+                     {'requests': [{'path': '/api/notices/', 'method': 'DELETE'}]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post('/api/batch/', body, format='json').status_code, 400)
+
+
+# The pool is only used outside a transaction, so these rows have to be committed
+@override_settings(L1_INVALIDATION_LISTENER=False, BATCH_CONCURRENCY=4)
+class ConcurrentBatchTests(TransactionTestCase):
+    def test_results_keep_the_batch_ids_and_order(self):
+        for i in range(3):
+            Notice.objects.create(title=f'Notice {i}', description='-', category='General', priority='Low')
+        paths = [('z', '/api/notices/'), ('a', '/api/no-such-endpoint/'), ('m', '/api/notices/?page_size=1'),
+                 ('3', '/api/news/'), ('b', '/api/auth/users/')]
+        threads = []
+        run_subrequest = batch.run_subrequest
+
+        def record(sub):
+            threads.append(threading.current_thread().name)
+            return run_subrequest(sub)
+
+        client = APIClient(SERVER_NAME='localhost')
+        with mock.patch.object(batch, 'run_subrequest', side_effect=record):
+            response = client.post('/api/batch/', {
+                'requests': [{'id': item_id, 'path': path} for item_id, path in paths],
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(name.startswith('batch') for name in threads), threads)
+
+        responses = response.json()['responses']
+        self.assertEqual(list(responses), [item_id for item_id, _ in paths])
+        self.assertEqual([responses[item_id]['status'] for item_id, _ in paths], [200, 404, 200, 200, 401])
+        self.assertEqual(responses['z']['body'], client.get('/api/notices/').json())
+        self.assertEqual(len(responses['m']['body']['results']), 1)
+
+
+def submission_event(event_id, user_id):
+    return {'type': 'submission.created', 'id': event_id, 'at': f'2026-10-19T08:00:0{event_id}', 'user': user_id,
+            'status': 'pending'}
+
+
+def notice_event(event_id):
+    return {'type': 'notice.created', 'id': event_id, 'at': f'2026-10-19T08:00:0{event_id}'}
+
+
+def stream_events(body):
+    """(event, data) pairs of an SSE body"""
+    events = []
+    for block in body.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith((':', 'retry')))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class SubscriptionTests(TestCase):
+    """Event routing without a LISTEN connection: events are handed to Broker.dispatch"""
+
+    def setUp(self):
+        self.broker = sse.Broker()
+        families = set(sse.FAMILIES.values())
+        self.anonymous = sse.Subscription(families)
+        self.owner = sse.Subscription(families, user_id='7')
+        self.other = sse.Subscription(families, user_id='8')
+        self.admin = sse.Subscription(families, user_id='9', is_admin=True)
+        self.notices_only = sse.Subscription({'notice'}, user_id='7')
+        self.broker.subscriptions = {self.anonymous, self.owner, self.other, self.admin, self.notices_only}
+
+    def test_private_families_go_to_the_owner_and_admins(self):
+        self.broker.dispatch(submission_event('1', 7))
+        self.broker.dispatch(notice_event('2'))
+        received = {
+            name: [event['type'] for _, event in stream_events(b''.join(subscription.pending))]
+            for name, subscription in [('anonymous', self.anonymous), ('owner', self.owner), ('other', self.other),
+                                       ('admin', self.admin), ('notices_only', self.notices_only)]
+        }
+        self.assertEqual(received, {
+            'anonymous': ['notice.created'],
+            'owner': ['submission.created', 'notice.created'],
+            'other': ['notice.created'],
+            'admin': ['submission.created', 'notice.created'],
+            'notices_only': ['notice.created'],
+        })
+        # Encoded once and shared
+        self.assertIs(self.anonymous.pending[0], self.admin.pending[1])
+
+    def test_format_event_drops_the_owner(self):
+        self.assertEqual(
+            sse.format_event(submission_event('1', 7)),
+            b'id: 2026-10-19T08:00:01\nevent: submission.created\n'
+            b'data: {"type": "submission.created", "id": "1", "at": "2026-10-19T08:00:01", "status": "pending"}\n\n',
+        )
+
+    @override_settings(SSE_QUEUE_SIZE=2)
+    def test_overflow_replaces_the_backlog_with_a_reset(self):
+        for i in range(4):
+            self.broker.dispatch(notice_event(str(i)))
+        self.assertTrue(self.anonymous.ending)
+        self.assertEqual(stream_events(b''.join(self.anonymous.pending)), [('reset', {'type': 'reset', 'reason': 'overflow'})])
+
+    @override_settings(SSE_HEARTBEAT_SECONDS=0.02)
+    def test_heartbeat_pings_idle_clients_and_ends_expired_tokens(self):
+        self.owner.expires_at = time.time() - 1
+        for subscription in self.broker.subscriptions:
+            subscription.last_write -= 1
+
+        async def beat():
+            task = asyncio.ensure_future(self.broker._beat())
+            await asyncio.sleep(0.05)
+            self.broker.subscriptions.clear()
+            await asyncio.wait_for(task, 1)
+
+        asyncio.run(beat())
+        self.assertEqual(stream_events(b''.join(self.owner.pending)), [('reset', {'type': 'reset', 'reason': 'token_expired'})])
+        self.assertTrue(self.admin.ping)
+        self.assertFalse(self.admin.pending)
+
+
+# The token's user is loaded on another thread's connection, so it has to be committed
+@mock.patch.object(sse.Broker, '_connect', new=mock.AsyncMock())
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.student = User.objects.create_user('sse_student', 'sse@example.com', 'pw')
+        self.app = sse.EventStreamApp(django_application=None)
+        self.app.broker = self.broker = sse.Broker()
+
+    def stream(self, query=b'', events=()):
+        """Messages sent for a stream that receives events, then disconnects"""
+        sent = []
+
+        async def main():
+            disconnected = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {'type': 'http', 'method': 'GET', 'path': sse.EVENTS_PATH, 'query_string': query, 'headers': []}
+            task = asyncio.ensure_future(self.app(scope, receive, send))
+            deadline = time.monotonic() + 5
+            while not self.broker.subscriptions and not task.done() and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            for event in events:
+                self.broker.dispatch(event)
+            await asyncio.sleep(0.05)
+            disconnected.set()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(main())
+        self.assertFalse(self.broker.subscriptions)
+        return sent
+
+    def body(self, sent):
+        return b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+
+    def test_bad_token_is_rejected(self):
+        sent = self.stream(b'token=not-a-token')
+        self.assertEqual(sent[0]['status'], 401)
+        self.assertEqual(json.loads(self.body(sent)), {'error': 'Invalid or expired token'})
+
+    def test_anonymous_stream_carries_public_events(self):
+        sent = self.stream(events=[submission_event('1', self.student.pk), notice_event('2')])
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertTrue(self.body(sent).startswith(b'retry: 5000\n\n'))
+        self.assertEqual([event for event, _ in stream_events(self.body(sent))], ['notice.created'])
+
+    def test_token_stream_carries_the_users_own_submissions(self):
+        token = RefreshToken.for_user(self.student).access_token
+        sent = self.stream(f'token={token}'.encode(), events=[
+            submission_event('1', self.student.pk), submission_event('2', self.student.pk + 1),
+        ])
+        self.assertEqual(stream_events(self.body(sent)), [
+            ('submission.created', {'type': 'submission.created', 'id': '1', 'at': '2026-10-19T08:00:01',
+                                    'status': 'pending'}),
+        ])
+
+    @override_settings(SSE_QUEUE_SIZE=2)
+    def test_overflow_ends_the_stream_with_a_reset(self):
+        sent = self.stream(events=[notice_event(str(i)) for i in range(3)])
+        self.assertEqual([event for event, _ in stream_events(self.body(sent))], ['reset'])
+        # Ended by the server: the final body closes the response
+        self.assertEqual(sent[-1], {'type': 'http.response.body', 'body': b''})
+
+
+def calendar_event(start_date, end_date=None, **fields):
+    return {'id': uuid.uuid4(), 'start_date': start_date, 'end_date': end_date, **fields}
+
+
+class CalendarTests(TestCase):
+    def test_parse_range(self):
+        self.assertEqual(calendar.parse_range({'from': '2026-10-01', 'to': '2026-10-31'}),
+                         (date(2026, 10, 1), date(2026, 10, 31)))
+        self.assertEqual(calendar.parse_range({}, default='default'), 'default')
+        for params in [{}, {'from': '2026-10-01'}, {'from': '2026-10-01', 'to': '31/10/2026'},
+                       {'from': '2026-10-31', 'to': '2026-10-01'}, {'from': '2026-01-01', 'to': '2027-01-02'}]:
+            with self.subTest(params=params), self.assertRaises(calendar.CalendarRangeError):
+                calendar.parse_range(params)
+        # 366 days, start and end included
+        calendar.parse_range({'from': '2026-01-01', 'to': '2027-01-01'})
+
+    def test_events_are_listed_on_each_day_inside_the_range(self):
+        started_before = calendar_event(date(2026, 9, 29), date(2026, 10, 2))
+        single_day = calendar_event(date(2026, 10, 2))
+        # An end before the start counts as a one-day event
+        inverted = calendar_event(date(2026, 10, 3), date(2026, 10, 1))
+        runs_past = calendar_event(date(2026, 10, 3), date(2026, 10, 9))
+        payload = calendar.group_by_day(
+            [started_before, single_day, inverted, runs_past], date(2026, 10, 1), date(2026, 10, 4),
+        )
+        ids = lambda *events: [str(event['id']) for event in events]
+        self.assertEqual(payload['days'], {
+            '2026-10-01': ids(started_before),
+            '2026-10-02': ids(started_before, single_day),
+            '2026-10-03': ids(inverted, runs_past),
+            '2026-10-04': ids(runs_past),
+        })
+        self.assertEqual(list(payload['events']), ids(started_before, single_day, inverted, runs_past))
+        self.assertEqual((payload['from'], payload['to']), ('2026-10-01', '2026-10-04'))
+
+    def test_fold_keeps_lines_within_75_octets_and_characters_whole(self):
+        self.assertEqual(calendar.fold('SUMMARY:Fest'), 'SUMMARY:Fest\r\n')
+        # Octet 75 is the second byte of the e acute
+        self.assertEqual(calendar.fold('X' * 74 + 'é'), 'X' * 74 + '\r\n é\r\n')
+
+        line = 'DESCRIPTION:' + 'नालंदा ' * 40
+        folded = calendar.fold(line)
+        parts = folded.removesuffix('\r\n').split('\r\n')
+        self.assertTrue(all(len(part.encode()) <= 75 for part in parts))
+        self.assertTrue(all(part.startswith(' ') for part in parts[1:]))
+        self.assertEqual(''.join(part.removeprefix(' ') if i else part for i, part in enumerate(parts)), line)
+
+    def test_escape_text(self):
+        self.assertEqual(calendar.escape_text('Hall A; Block 2, Wing\\B\r\nGate 3\nLeft'),
+                         r'Hall A\; Block 2\, Wing\\B\nGate 3\nLeft')
+        self.assertEqual(calendar.escape_text(None), '')
+
+    def test_ics_dtend_is_exclusive(self):
+        event = calendar_event(date(2026, 10, 3), date(2026, 10, 5), title='Fest', description='', event_type='cultural',
+                               venue=None, updated_at=timezone.now())
+        single_day = {**event, 'end_date': None}
+        self.assertIn('DTSTART;VALUE=DATE:20261003\r\nDTEND;VALUE=DATE:20261006\r\n', calendar.ics_event(event, 'host'))
+        self.assertIn('DTEND;VALUE=DATE:20261004\r\n', calendar.ics_event(single_day, 'host'))
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class CalendarEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.fest = CampusEvent.objects.create(title='Fest', start_date=date(2026, 10, 3), end_date=date(2026, 10, 5))
+        cls.talk = CampusEvent.objects.create(title='Talk', start_date=date(2026, 10, 4))
+        CampusEvent.objects.create(title='Earlier', start_date=date(2026, 9, 1), end_date=date(2026, 9, 2))
+        CampusEvent.objects.create(title='Undated')
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost')
+
+    def test_calendar_groups_the_range_by_day(self):
+        response = self.client.get('/api/campus-events/calendar/', {'from': '2026-10-04', 'to': '2026-10-10'})
+        self.assertEqual(response.status_code, 200)
+        fest, talk = str(self.fest.pk), str(self.talk.pk)
+        self.assertEqual(response.json()['days'], {'2026-10-04': [fest, talk], '2026-10-05': [fest]})
+        self.assertEqual(set(response.json()['events']), {fest, talk})
+
+    def test_bad_range_is_rejected(self):
+        for params in [{}, {'from': '2026-10-04', 'to': 'soon'}, {'from': '2026-10-10', 'to': '2026-10-04'}]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/campus-events/calendar/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+@override_settings(L1_INVALIDATION_LISTENER=False)
+class PublishWindowTests(TestCase):
+    PUBLIC = ['always', 'in window', 'starts today']
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        yesterday, tomorrow = today - timedelta(days=1), today + timedelta(days=1)
+        for model in (Notice, News):
+            rows = {
+                'always': {},
+                'in window': {'publish_date': yesterday, 'expiry_date': tomorrow},
+                'starts today': {'publish_date': today},
+                'scheduled': {'publish_date': tomorrow},
+                'expires today': {'expiry_date': today},
+                'lapsed': {'expiry_date': yesterday},
+            }
+            for title, dates in rows.items():
+                model.objects.create(title=title, description='-', **dates)
+            # Expired since the last publish_schedule run: only the date check hides it
+            model.objects.filter(title='lapsed').update(is_expired=False)
+            model.objects.create(title='inactive', description='-', is_active=False)
+        cls.admin = User.objects.create_user('window_admin', 'window@example.com', 'pw', is_staff=True)
+
+    def titles(self, queryset):
+        return sorted(queryset.values_list('title', flat=True))
+
+    def test_published_is_the_open_window(self):
+        today = timezone.localdate()
+        for model in (Notice, News):
+            with self.subTest(model=model.__name__):
+                self.assertEqual(self.titles(model.objects.published()), sorted(self.PUBLIC))
+                self.assertEqual(self.titles(model.objects.published(today=today + timedelta(days=1))),
+                                 ['always', 'scheduled', 'starts today'])
+
+    def test_save_flags_rows_from_their_expiry_date_on(self):
+        for model in (Notice, News):
+            with self.subTest(model=model.__name__):
+                self.assertEqual(self.titles(model.objects.filter(is_expired=True)), ['expires today'])
+                lapsed = model.objects.get(title='lapsed')
+                lapsed.save()
+                self.assertTrue(lapsed.is_expired)
+
+    def test_public_lists_hide_rows_outside_the_window_and_admins_see_them(self):
+        admin = APIClient(SERVER_NAME='localhost')
+        admin.force_authenticate(self.admin)
+        everything = ['always', 'expires today', 'in window', 'lapsed', 'scheduled', 'starts today']
+        for url, admin_titles in [('/api/notices/', everything + ['inactive']), ('/api/news/', everything)]:
+            with self.subTest(url=url):
+                public = APIClient(SERVER_NAME='localhost').get(url, {'page_size': 100})
+                self.assertEqual(sorted(row['title'] for row in public.data['results']), sorted(self.PUBLIC))
+                response = admin.get(url, {'page_size': 100})
+                self.assertEqual(sorted(row['title'] for row in response.data['results']), sorted(admin_titles))
+
+
+class CompressMediaTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = media_root.name
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.text = self.write('notices/circular.txt', b'Exam schedule. ' * 200)
+        # Random bytes, like most PDFs, do not compress
+        self.pdf = self.write('magazines/issue.pdf', os.urandom(4096))
+
+    def write(self, name, data):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def compress(self, *args):
+        """Paths (relative to MEDIA_ROOT) the command compressed"""
+        with mock.patch.object(Compressor, 'compress', autospec=True, side_effect=Compressor.compress) as compress:
+            call_command('compress_media', *args, '--no-brotli', stdout=io.StringIO())
+        return sorted(os.path.relpath(call.args[1], self.media_root) for call in compress.call_args_list)
+
+    def test_unchanged_files_are_not_recompressed_even_without_a_variant(self):
+        self.assertEqual(self.compress(), ['magazines/issue.pdf', 'notices/circular.txt'])
+        self.assertTrue(os.path.exists(f'{self.text}.gz'))
+        self.assertFalse(os.path.exists(f'{self.pdf}.gz'))
+
+        self.assertEqual(self.compress(), [])
+        self.assertEqual(self.compress('--force'), ['magazines/issue.pdf', 'notices/circular.txt'])
+
+    def test_changed_files_are_recompressed_and_stale_variants_removed(self):
+        self.compress()
+        self.write('notices/circular.txt', os.urandom(4096))
+        os.utime(self.text, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(self.compress(), ['notices/circular.txt'])
+        # The old variant would be served for the new content
+        self.assertFalse(os.path.exists(f'{self.text}.gz'))
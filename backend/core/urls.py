@@ -6,7 +6,8 @@ from .views import (
     TopperViewSet, CreativeWorkViewSet, StudentSubmissionViewSet, CampusStatsViewSet,
     NewsViewSet, ContactInfoViewSet, OfficeLocationViewSet, QuickContactInfoViewSet, TimetableViewSet,
     FeesStructureViewSet, ScholarshipViewSet, TranscriptServiceViewSet, AdminRoleViewSet, AdminActivityLogViewSet,
-    HostelViewSet, SportsFacilityViewSet
+    HostelViewSet, SportsFacilityViewSet, ContentCollectionViewSet, ContentItemViewSet, content_view, metrics_view,
+    batch_view,
 )
 
 router = DefaultRouter()
@@ -36,7 +37,14 @@ router.register(r'admin-roles', AdminRoleViewSet)
 router.register(r'admin-activity-logs', AdminActivityLogViewSet)
 router.register(r'hostels', HostelViewSet)
 router.register(r'sports-facilities', SportsFacilityViewSet)
+router.register(r'content-collections', ContentCollectionViewSet)
+router.register(r'content-items', ContentItemViewSet)
 
 urlpatterns = [
+    path('_metrics/', metrics_view, name='metrics'),
+    path('content/<slug:slug>/', content_view, name='content'),
+    path('batch/', batch_view, name='batch'),
+    # Calendar apps expect the feed URL to end in .ics
+    path('campus-events/calendar.ics', CampusEventViewSet.as_view({'get': 'calendar_ics'}), name='campusevent-calendar-ics-file'),
     path('', include(router.urls)),
 ]
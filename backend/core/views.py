@@ -1,13 +1,19 @@
+import os
+from datetime import timedelta
+
 from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import (
     Program, Trade, Department, DepartmentGalleryImage, HeroImage, Notice, Magazine, Club, CampusEvent,
     AcademicService, Topper, CreativeWork, StudentSubmission, CampusStats, News, ContactInfo, OfficeLocation, QuickContactInfo, Timetable,
-    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage
+    FeesStructure, Scholarship, TranscriptService, AdminRole, AdminActivityLog, Hostel, HostelImage, SportsFacility, SportsFacilityImage,
+    ContentCollection, ContentItem
 )
 from .serializers import (
     ProgramSerializer, TradeSerializer, DepartmentSerializer, DepartmentGalleryImageSerializer, HeroImageSerializer, NoticeSerializer,
@@ -15,9 +21,19 @@ from .serializers import (
     TopperSerializer, CreativeWorkSerializer, StudentSubmissionSerializer, CampusStatsSerializer, 
     NewsSerializer, ContactInfoSerializer, OfficeLocationSerializer, QuickContactInfoSerializer, TimetableSerializer,
     FeesStructureSerializer, ScholarshipSerializer, TranscriptServiceSerializer, AdminRoleSerializer, AdminActivityLogSerializer,
-    HostelSerializer, SportsFacilitySerializer
+    HostelSerializer, SportsFacilitySerializer, ContentCollectionSerializer, ContentItemSerializer
 )
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from .parsers import ORJSONParser
+from .compiled import CompiledListViewMixin
+from .fieldsets import SparseFieldsetViewMixin, get_field_selection
+from .instrumentation import InstrumentedViewMixin, registry
+from .sync import DeltaSyncViewMixin
+from .httpcache import CONTENT, PRIVATE, REFERENCE, cache_policy
+from .content import collection_payload
+from . import swr
+from .batch import BatchError, parse_batch, run_batch
+from .calendar import CALENDAR_FIELDS, CalendarRangeError, ICS_DEFAULT_PAST_DAYS, MAX_RANGE_DAYS, group_by_day, parse_range, stream_ics
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
@@ -32,9 +48,69 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         # Write permissions are only allowed to admin users.
         return request.user.is_authenticated and hasattr(request.user, 'profile') and request.user.profile.role == 'admin'
 
-class ProgramViewSet(viewsets.ModelViewSet):
-    queryset = Program.objects.all()
+
+def program_hierarchy():
+    """Active programs with their trades, departments and direct branches, for navigation"""
+    programs = Program.objects.filter(is_active=True).prefetch_related(
+        'trades__departments'
+    ).order_by('-is_predefined', 'name')
+    
+    hierarchy_data = []
+    for program in programs:
+        program_data = {
+            'id': program.id,
+            'name': program.name,
+            'code': program.code,
+            'is_predefined': program.is_predefined,
+            'trades': [],
+            'direct_branches': []
+        }
+        
+        # Get trades with their departments
+        trades = program.trades.filter(is_active=True).order_by('-is_predefined', 'name')
+        for trade in trades:
+            departments = trade.departments.filter(is_active=True, is_direct_branch=False).order_by('name')
+            if departments.exists():  # Only include trades that have departments
+                trade_data = {
+                    'id': trade.id,
+                    'name': trade.name,
+                    'code': trade.code,
+                    'is_predefined': trade.is_predefined,
+                    'departments': [
+                        {
+                            'id': dept.id,
+                            'name': dept.name,
+                            'code': dept.code
+                        }
+                        for dept in departments
+                    ]
+                }
+                program_data['trades'].append(trade_data)
+        
+        # Get direct branches (departments without trade)
+        direct_branches = program.departments.filter(
+            is_active=True,
+            is_direct_branch=True
+        ).order_by('name')
+        
+        program_data['direct_branches'] = [
+            {
+                'id': dept.id,
+                'name': dept.name,
+                'code': dept.code
+            }
+            for dept in direct_branches
+        ]
+        
+        hierarchy_data.append(program_data)
+    
+    return hierarchy_data
+
+
+class ProgramViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Program.objects.with_trades_count()
     serializer_class = ProgramSerializer
+    cache_policy = REFERENCE.with_tags('core.trade', 'core.department')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_predefined', 'is_active']
@@ -44,65 +120,13 @@ class ProgramViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[])
     def hierarchy(self, request):
         """Get hierarchical structure of programs, trades, and departments for navigation"""
-        programs = Program.objects.filter(is_active=True).prefetch_related(
-            'trades__departments'
-        ).order_by('-is_predefined', 'name')
-        
-        hierarchy_data = []
-        for program in programs:
-            program_data = {
-                'id': program.id,
-                'name': program.name,
-                'code': program.code,
-                'is_predefined': program.is_predefined,
-                'trades': [],
-                'direct_branches': []
-            }
-            
-            # Get trades with their departments
-            trades = program.trades.filter(is_active=True).order_by('-is_predefined', 'name')
-            for trade in trades:
-                departments = trade.departments.filter(is_active=True, is_direct_branch=False).order_by('name')
-                if departments.exists():  # Only include trades that have departments
-                    trade_data = {
-                        'id': trade.id,
-                        'name': trade.name,
-                        'code': trade.code,
-                        'is_predefined': trade.is_predefined,
-                        'departments': [
-                            {
-                                'id': dept.id,
-                                'name': dept.name,
-                                'code': dept.code
-                            }
-                            for dept in departments
-                        ]
-                    }
-                    program_data['trades'].append(trade_data)
-            
-            # Get direct branches (departments without trade)
-            direct_branches = program.departments.filter(
-                is_active=True,
-                is_direct_branch=True
-            ).order_by('name')
-            
-            program_data['direct_branches'] = [
-                {
-                    'id': dept.id,
-                    'name': dept.name,
-                    'code': dept.code
-                }
-                for dept in direct_branches
-            ]
-            
-            hierarchy_data.append(program_data)
-        
-        return Response(hierarchy_data)
+        return Response(swr.get_or_refresh('hierarchy', 'all', program_hierarchy))
 
 
-class TradeViewSet(viewsets.ModelViewSet):
-    queryset = Trade.objects.all()
+class TradeViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Trade.objects.with_departments_count().select_related('program')
     serializer_class = TradeSerializer
+    cache_policy = REFERENCE.with_tags('core.program', 'core.department')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['program', 'is_predefined', 'is_active']
@@ -116,9 +140,10 @@ class TradeViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(program_id=program_id)
         return queryset
 
-class DepartmentViewSet(viewsets.ModelViewSet):
-    queryset = Department.objects.filter(is_active=True)
+class DepartmentViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Department.objects.filter(is_active=True).select_related('program', 'trade').prefetch_related('gallery_images')
     serializer_class = DepartmentSerializer
+    cache_policy = REFERENCE.with_tags('core.program', 'core.trade', 'core.departmentgalleryimage')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -152,36 +177,46 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.data)
 
-class DepartmentGalleryImageViewSet(viewsets.ModelViewSet):
+class DepartmentGalleryImageViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = DepartmentGalleryImage.objects.all()
     serializer_class = DepartmentGalleryImageSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['department', 'is_active']
     search_fields = ['caption']
     ordering_fields = ['display_order', 'created_at']
 
-class HeroImageViewSet(viewsets.ModelViewSet):
+class HeroImageViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = HeroImage.objects.all()  # Show all images for admin
     serializer_class = HeroImageSerializer
+    cache_policy = CONTENT
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['title', 'description']
     ordering_fields = ['display_order', 'created_at']
 
-class NoticeViewSet(viewsets.ModelViewSet):
+class NoticeViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Notice.objects.all()  # Show all notices for admin (like hero images)
     serializer_class = NoticeSerializer
+    cache_policy = CONTENT
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['category', 'priority', 'is_new', 'is_active']
+    filterset_fields = ['category', 'priority', 'is_new', 'is_active', 'is_expired']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'priority']
 
-class MagazineViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        """Admins see every notice; the public only those inside their publish window"""
+        if self.request.user.is_staff or (hasattr(self.request.user, 'profile') and self.request.user.profile.role == 'admin'):
+            return Notice.objects.all()
+        return Notice.objects.published()
+
+class MagazineViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Magazine.objects.filter(is_active=True)
     serializer_class = MagazineSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -199,9 +234,10 @@ class MagazineViewSet(viewsets.ModelViewSet):
         # The model's delete method will handle file cleanup
         instance.delete()
 
-class ClubViewSet(viewsets.ModelViewSet):
-    queryset = Club.objects.filter(is_active=True)
+class ClubViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Club.objects.filter(is_active=True).with_events_count()
     serializer_class = ClubSerializer
+    cache_policy = REFERENCE.with_tags('core.campusevent')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -217,27 +253,68 @@ class ClubViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CampusEventViewSet(viewsets.ModelViewSet):
-    queryset = CampusEvent.objects.filter(is_active=True)
+class CampusEventViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = CampusEvent.objects.filter(is_active=True).select_related('club')
     serializer_class = CampusEventSerializer
+    cache_policy = CONTENT.with_tags('core.club')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['event_type', 'is_featured', 'is_active', 'club']
     search_fields = ['title', 'description', 'organizer', 'venue']
     ordering_fields = ['start_date', 'created_at', 'title']
-    
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if 'club' in get_field_selection(self.request)[2]:
+            # The expanded clubs carry events_count: load them in one query with it annotated
+            queryset = queryset.select_related(None).prefetch_related(
+                Prefetch('club', queryset=Club.objects.with_events_count())
+            )
+        return queryset
+
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
-        """Get upcoming events"""
-        from django.utils import timezone
-        current_date = timezone.now().date()
-        
-        events = self.queryset.filter(
-            start_date__gte=current_date
-        ).order_by('start_date')
-        
+        """Get upcoming and ongoing events (multi-day events stay listed until their end_date)"""
+        today = timezone.localdate()
+        # Image and page links are absolute, so the full URL is part of the key
+        key = f'{today}:{request.build_absolute_uri()}'
+        return Response(swr.get_or_refresh('upcoming-events', key, lambda: self.upcoming_data(today)))
+
+    def upcoming_data(self, today):
+        events = self.queryset.overlapping(today).order_by('start_date', 'created_at')
+        page = self.paginate_queryset(events)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data).data
         serializer = self.get_serializer(events, many=True)
-        return Response(serializer.data)
+        return serializer.data
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """Events overlapping ?from=&to= (YYYY-MM-DD, inclusive), grouped by day"""
+        try:
+            start, end = parse_range(request.query_params)
+        except CalendarRangeError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        events = (
+            self.filter_queryset(self.get_queryset()).overlapping(start, end)
+            .order_by('start_date', 'created_at').values(*CALENDAR_FIELDS)
+        )
+        return Response(group_by_day(events, start, end))
+
+    @action(detail=False, methods=['get'], url_path='ics', url_name='calendar-ics')
+    def calendar_ics(self, request):
+        """iCalendar feed for ?from=&to= (default: last 30 days to a year ahead), streamed"""
+        today = timezone.localdate()
+        default = (today - timedelta(days=ICS_DEFAULT_PAST_DAYS), today + timedelta(days=MAX_RANGE_DAYS - ICS_DEFAULT_PAST_DAYS - 1))
+        try:
+            start, end = parse_range(request.query_params, default=default)
+        except CalendarRangeError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        events = self.filter_queryset(self.get_queryset()).overlapping(start, end).order_by('start_date', 'created_at')
+        response = StreamingHttpResponse(stream_ics(events, request.get_host()), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="campus-events.ics"'
+        return response
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
@@ -257,9 +334,10 @@ class CampusEventViewSet(viewsets.ModelViewSet):
         return Response({'error': 'club_id parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AcademicServiceViewSet(viewsets.ModelViewSet):
+class AcademicServiceViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = AcademicService.objects.all()  # Show all documents, not just active
     serializer_class = AcademicServiceSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active', 'category', 'department']
@@ -267,18 +345,20 @@ class AcademicServiceViewSet(viewsets.ModelViewSet):
     ordering_fields = ['title', 'created_at', 'download_count']
     ordering = ['-created_at']  # Default ordering
 
-class TopperViewSet(viewsets.ModelViewSet):
+class TopperViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Topper.objects.filter(is_active=True)
     serializer_class = TopperSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['department', 'year', 'is_active']
     search_fields = ['name', 'department']
     ordering_fields = ['rank', 'year', 'cgpa']
 
-class CreativeWorkViewSet(viewsets.ModelViewSet):
+class CreativeWorkViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = CreativeWork.objects.filter(is_active=True)
     serializer_class = CreativeWorkSerializer
+    cache_policy = CONTENT
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['category', 'is_featured', 'is_active']
@@ -286,9 +366,10 @@ class CreativeWorkViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'is_featured']
 
 
-class StudentSubmissionViewSet(viewsets.ModelViewSet):
-    queryset = StudentSubmission.objects.all()
+class StudentSubmissionViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = StudentSubmission.objects.select_related('user')
     serializer_class = StudentSubmissionSerializer
+    cache_policy = PRIVATE
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'category', 'department', 'is_featured', 'is_active']
     search_fields = ['title', 'description', 'user__username', 'user__first_name', 'user__last_name']
@@ -320,10 +401,10 @@ class StudentSubmissionViewSet(viewsets.ModelViewSet):
         
         # Check if user is admin
         if user.is_staff or (hasattr(user, 'profile') and user.profile.role == 'admin'):
-            return StudentSubmission.objects.all()
+            return self.queryset.all()
         
         # Regular users can only see their own submissions
-        return StudentSubmission.objects.filter(user=user)
+        return self.queryset.filter(user=user)
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdminOrReadOnly])
     def review(self, request, pk=None):
@@ -370,9 +451,10 @@ class StudentSubmissionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CampusStatsViewSet(viewsets.ModelViewSet):
+class CampusStatsViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = CampusStats.objects.filter(is_active=True)
     serializer_class = CampusStatsSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -380,19 +462,27 @@ class CampusStatsViewSet(viewsets.ModelViewSet):
     ordering_fields = ['display_order', 'created_at']
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = News.objects.filter(is_active=True)
     serializer_class = NewsSerializer
+    cache_policy = CONTENT
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['category', 'priority', 'is_featured', 'is_new', 'is_active']
+    filterset_fields = ['category', 'priority', 'is_featured', 'is_new', 'is_breaking', 'is_active', 'is_expired']
     search_fields = ['title', 'description', 'content']
     ordering_fields = ['published_date', 'created_at']
 
+    def get_queryset(self):
+        """Admins also see scheduled and expired news; the public only what is inside its publish window"""
+        if self.request.user.is_staff or (hasattr(self.request.user, 'profile') and self.request.user.profile.role == 'admin'):
+            return News.objects.filter(is_active=True)
+        return News.objects.published()
 
-class ContactInfoViewSet(viewsets.ModelViewSet):
+
+class ContactInfoViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = ContactInfo.objects.all()  # Show all for admin
     serializer_class = ContactInfoSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -400,9 +490,10 @@ class ContactInfoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['display_order', 'created_at']
 
 
-class OfficeLocationViewSet(viewsets.ModelViewSet):
+class OfficeLocationViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = OfficeLocation.objects.all()  # Show all for admin
     serializer_class = OfficeLocationSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_main_office', 'is_active']
@@ -410,9 +501,10 @@ class OfficeLocationViewSet(viewsets.ModelViewSet):
     ordering_fields = ['is_main_office', 'name', 'created_at']
 
 
-class QuickContactInfoViewSet(viewsets.ModelViewSet):
+class QuickContactInfoViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = QuickContactInfo.objects.all()  # Show all for admin
     serializer_class = QuickContactInfoSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -420,9 +512,10 @@ class QuickContactInfoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at']
 
 
-class TimetableViewSet(viewsets.ModelViewSet):
-    queryset = Timetable.objects.filter(is_active=True)
+class TimetableViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Timetable.objects.filter(is_active=True).select_related('department')
     serializer_class = TimetableSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['department', 'timetable_type', 'semester', 'academic_year', 'is_featured', 'is_active']
@@ -453,9 +546,10 @@ class TimetableViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class FeesStructureViewSet(viewsets.ModelViewSet):
+class FeesStructureViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = FeesStructure.objects.all()  # Show all for admin
     serializer_class = FeesStructureSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['academic_year', 'semester', 'department', 'is_active']
@@ -477,9 +571,10 @@ class FeesStructureViewSet(viewsets.ModelViewSet):
         ])
 
 
-class ScholarshipViewSet(viewsets.ModelViewSet):
+class ScholarshipViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Scholarship.objects.filter(is_active=True)
     serializer_class = ScholarshipSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
@@ -493,9 +588,10 @@ class ScholarshipViewSet(viewsets.ModelViewSet):
         return Scholarship.objects.filter(is_active=True)
 
 
-class TranscriptServiceViewSet(viewsets.ModelViewSet):
+class TranscriptServiceViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = TranscriptService.objects.filter(is_active=True)
     serializer_class = TranscriptServiceSerializer
+    cache_policy = REFERENCE
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active', 'is_online']
@@ -531,14 +627,15 @@ class IsSuperAdmin(permissions.BasePermission):
             return False
 
 
-class AdminRoleViewSet(viewsets.ModelViewSet):
+class AdminRoleViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing admin roles and permissions.
     Accessible by Super Admins and Admins with 'roles' page permission.
     Non-super-admins cannot see or modify super admin roles.
     """
-    queryset = AdminRole.objects.select_related('user', 'granted_by').all()
+    queryset = AdminRole.objects.select_related('user__profile', 'granted_by__profile').all()
     serializer_class = AdminRoleSerializer
+    cache_policy = PRIVATE
     permission_classes = [IsSuperAdmin]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['role_level', 'is_active']
@@ -792,14 +889,15 @@ class AdminRoleViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'No admin role found'}, status=404)
 
 
-class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AdminActivityLogViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing admin activity logs.
     Only accessible by Super Admins.
     Read-only - logs cannot be modified or deleted.
     """
-    queryset = AdminActivityLog.objects.select_related('admin').all()
+    queryset = AdminActivityLog.objects.select_related('admin__profile').all()
     serializer_class = AdminActivityLogSerializer
+    cache_policy = PRIVATE
     permission_classes = [IsSuperAdmin]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['action', 'resource_type', 'admin']
@@ -814,13 +912,14 @@ class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class HostelViewSet(viewsets.ModelViewSet):
+class HostelViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing hostels with image upload support.
     Supports up to 4 images per hostel.
     """
     queryset = Hostel.objects.prefetch_related('images').all()
     serializer_class = HostelSerializer
+    cache_policy = REFERENCE.with_tags('core.hostelimage')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['hostel_type', 'is_active']
@@ -857,19 +956,20 @@ class HostelViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class SportsFacilityViewSet(viewsets.ModelViewSet):
+class SportsFacilityViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing sports facilities with image upload support.
     """
     queryset = SportsFacility.objects.prefetch_related('images').all()
     serializer_class = SportsFacilitySerializer
+    cache_policy = REFERENCE.with_tags('core.sportsfacilityimage')
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['facility_type', 'is_active', 'booking_required']
     search_fields = ['name', 'description', 'contact_person']
     ordering_fields = ['name', 'created_at', 'capacity']
     ordering = ['-created_at']
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -887,3 +987,71 @@ class SportsFacilityViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         except SportsFacilityImage.DoesNotExist:
             return Response({'error': 'Image not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ContentCollectionViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = ContentCollection.objects.all()
+    serializer_class = ContentCollectionSerializer
+    cache_policy = CONTENT.with_tags('core.contentitem')
+    permission_classes = [IsAdminOrReadOnly]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['slug', 'is_active']
+    search_fields = ['slug', 'name', 'description']
+    ordering_fields = ['name', 'created_at']
+
+    def get_queryset(self):
+        if self.request.user.is_staff or (hasattr(self.request.user, 'profile') and self.request.user.profile.role == 'admin'):
+            return ContentCollection.objects.all()
+        return ContentCollection.objects.filter(is_active=True)
+
+
+class ContentItemViewSet(DeltaSyncViewMixin, CompiledListViewMixin, InstrumentedViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """Admin editing of content items; public pages read /api/content/<slug>/ instead"""
+    queryset = ContentItem.objects.select_related('collection').all()
+    serializer_class = ContentItemSerializer
+    cache_policy = CONTENT.with_tags('core.contentcollection')
+    permission_classes = [IsAdminOrReadOnly]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['collection', 'collection__slug', 'is_active']
+    ordering_fields = ['display_order', 'created_at', 'updated_at']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff or (hasattr(self.request.user, 'profile') and self.request.user.profile.role == 'admin'):
+            return queryset
+        return queryset.filter(is_active=True, collection__is_active=True)
+
+
+@cache_policy(CONTENT.with_tags('core.contentitem', 'core.contentcollection'))
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def content_view(request, slug):
+    """Active items of a content collection in display order, served from the cache"""
+    payload = collection_payload(slug)
+    if payload is None:
+        return Response({'error': 'Content collection not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(payload)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def batch_view(request):
+    """Run up to BATCH_MAX_REQUESTS GET sub-requests in-process; each view applies its own permissions"""
+    try:
+        items = parse_batch(request.data)
+    except BatchError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    # Anonymous sub-requests authenticate normally so protected views still answer 401
+    user, auth = (request.user, request.auth) if request.user.is_authenticated else (None, None)
+    return Response({'responses': run_batch(request._request, user, auth, items)})
+
+
+@api_view(['GET'])
+def metrics_view(request):
+    """Rolling per-view query/latency aggregates for this worker process - Admin only"""
+    if not request.user.is_staff and (not hasattr(request.user, 'profile') or request.user.profile.role != 'admin'):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    return Response({
+        'pid': os.getpid(),
+        'endpoints': registry.snapshot(),
+    })
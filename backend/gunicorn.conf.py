@@ -1,4 +1,10 @@
 # Gunicorn Configuration for Production
+import os
+import shutil
+import tempfile
+
+from decouple import config
+
 bind = "127.0.0.1:8000"
 workers = 3
 worker_class = "sync"
@@ -8,4 +14,57 @@ max_requests_jitter = 100
 timeout = 30
 keepalive = 2
 # Note: user/group managed by systemd service, not Gunicorn
-umask = 0o002  # Ensures new files are group-readable (664 for files, 775 for directories)
\ No newline at end of file
+umask = 0o002  # Ensures new files are group-readable (664 for files, 775 for directories)
+
+# Prometheus metrics: workers write mmap-backed files here and the master serves
+# the merged view on METRICS_BIND (keep it private; the public site never proxies it).
+# Both come from the environment or .env, like the Django settings.
+METRICS_BIND = config("METRICS_BIND", default="127.0.0.1:9100")
+PROMETHEUS_MULTIPROC_DIR = config(
+    "PROMETHEUS_MULTIPROC_DIR", default=os.path.join(tempfile.gettempdir(), "nalanda-prometheus")
+)
+# prometheus_client reads it from the environment, which the workers inherit
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = PROMETHEUS_MULTIPROC_DIR
+
+
+def on_starting(server):
+    # Samples from a previous run would be merged into the new one
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def when_ready(server):
+    global workers_gauge
+    try:
+        from prometheus_client import CollectorRegistry, Gauge, multiprocess, start_http_server
+    except ImportError:
+        server.log.warning("prometheus_client is not installed; metrics endpoint disabled")
+        return
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    host, _, port = METRICS_BIND.rpartition(":")
+    start_http_server(int(port), addr=host or "127.0.0.1", registry=registry)
+    server.log.info("Serving Prometheus metrics on http://%s/metrics", METRICS_BIND)
+
+    workers_gauge = Gauge("gunicorn_workers", "Configured gunicorn workers", multiprocess_mode="max")
+    workers_gauge.set(server.num_workers)
+
+
+# Created in when_ready; nworkers_changed also fires earlier, before on_starting
+workers_gauge = None
+
+
+def nworkers_changed(server, new_value, old_value):
+    # TTIN/TTOU signals change the worker count at run time
+    if workers_gauge is not None:
+        workers_gauge.set(new_value)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-progress requests, open connections)
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -23,6 +23,7 @@ import {
     Trash2,
     AlertTriangle
 } from 'lucide-react';
+import { fetchAllPages } from '@/lib/api';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
 
@@ -130,30 +131,13 @@ export default function RoleManagement() {
                 setAvailablePages(pagesData);
             }
 
-            // Fetch users (from authentication app)
-            const usersResponse = await fetch(`${API_BASE_URL}/auth/users/`, { headers });
-            console.log('Users response status:', usersResponse.status);
-
-            if (usersResponse.ok) {
-                const usersData = await usersResponse.json();
-                console.log('Users data received:', usersData);
-
-                // Handle different response formats
-                let usersList = [];
-                if (Array.isArray(usersData)) {
-                    usersList = usersData;
-                } else if (usersData.results) {
-                    usersList = usersData.results;
-                } else if (usersData.data) {
-                    usersList = usersData.data;
-                }
-
-                console.log('Processed users list:', usersList);
+            // Fetch users (from authentication app); the list is paginated
+            try {
+                const usersList = await fetchAllPages(`${API_BASE_URL}/auth/users/?page_size=1000`, { headers });
+                console.log('Processed users list:', usersList.length);
                 setUsers(usersList);
-            } else {
-                console.error('Failed to fetch users:', usersResponse.status, usersResponse.statusText);
-                const errorText = await usersResponse.text();
-                console.error('Error response:', errorText);
+            } catch (error) {
+                console.error('Failed to fetch users:', error);
             }
         } catch (error) {
             console.error('Error fetching data:', error);
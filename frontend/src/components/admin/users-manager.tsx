@@ -11,7 +11,7 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@
 import { Plus, Edit, Trash2, Search, Key } from 'lucide-react';
 import { useToast } from '@/hooks/use-toast';
 import { useAuth } from '@/hooks/use-auth';
-import { api } from '@/lib/api';
+import { api, fetchAllPages } from '@/lib/api';
 
 interface Profile {
   id: string;
@@ -121,37 +121,26 @@ export function UsersManager() {
       console.log('Fetching profiles with token:', token ? 'Token exists' : 'No token');
       
       const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
-      const response = await fetch(`${API_BASE_URL}/auth/users/`, {
+      const data = await fetchAllPages<Profile>(`${API_BASE_URL}/auth/users/?page_size=1000`, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
         },
       });
-
-      console.log('Response status:', response.status);
-      console.log('Response headers:', response.headers);
-
-      if (response.ok) {
-        const data = await response.json();
-        console.log('Received data:', data);
+      console.log('Received users:', data.length);
+
+      // Always filter out superadmin users - they can only be managed through Django admin
+      const filteredData = data.filter((profile: Profile) => {
+        // Check if this user is in the superadmin list
+        const isSuperAdmin = superAdmins.some(admin => 
+          admin.username === profile.username ||
+          admin.email === profile.email ||
+          admin.id === profile.user_id
+        );
         
-        // Always filter out superadmin users - they can only be managed through Django admin
-        const filteredData = data.filter((profile: Profile) => {
-          // Check if this user is in the superadmin list
-          const isSuperAdmin = superAdmins.some(admin => 
-            admin.username === profile.username ||
-            admin.email === profile.email ||
-            admin.id === profile.user_id
-          );
-          
-          return !isSuperAdmin;
-        });
-        setProfiles(filteredData || []);
-      } else {
-        const errorText = await response.text();
-        console.error('API Error:', response.status, errorText);
-        throw new Error(`Failed to fetch users: ${response.status} - ${errorText}`);
-      }
+        return !isSuperAdmin;
+      });
+      setProfiles(filteredData);
     } catch (error) {
       console.error('Error fetching profiles:', error);
       toast({
@@ -1,5 +1,18 @@
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
 
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost);
+// getRandomValues is available everywhere
+const newIdempotencyKey = (): string => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
 // API client with authentication
 class ApiClient {
   private baseURL: string;
@@ -32,6 +45,13 @@ class ApiClient {
       headers['Authorization'] = `Bearer ${this.token}`;
     }
 
+    // One key per logical write: the retry after a token refresh reuses it, so the
+    // server replays the first result instead of processing the body twice
+    const method = (options.method || 'GET').toUpperCase();
+    if (method !== 'GET' && method !== 'HEAD' && !headers['Idempotency-Key']) {
+      headers['Idempotency-Key'] = newIdempotencyKey();
+    }
+
     const response = await fetch(url, {
       ...options,
       headers,
@@ -252,6 +272,25 @@ class ApiClient {
 // Create API client instance
 export const apiClient = new ApiClient(API_BASE_URL);
 
+// Paginated endpoints return {count, next, previous, results}; follow `next` until every row is loaded
+export async function fetchAllPages<T = any>(url: string, init: RequestInit = {}): Promise<T[]> {
+  const rows: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const response = await fetch(next, init);
+    if (!response.ok) {
+      throw new Error(`${response.status} - ${await response.text()}`);
+    }
+    const data = await response.json();
+    if (Array.isArray(data)) {
+      return [...rows, ...data];
+    }
+    rows.push(...(data.results || []));
+    next = data.next;
+  }
+  return rows;
+}
+
 // Specific API methods for different entities
 export const api = {
   // Authentication